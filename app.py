@@ -1,17 +1,30 @@
-from flask import Flask, render_template, request, jsonify
-import cv2
+from flask import Flask, Response, render_template, request, jsonify
 import json
 import sys
 import os
 import base64
 import numpy as np
-import pymysql
-import gc  # 가비지 컬렉션
+import io
+import time
+from werkzeug.datastructures import FileStorage
 
 # 현재 디렉토리를 Python 경로에 추가
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
+from utils.session_store import SessionStore, create_shared_backend
+from utils.frame_decoder import FrameDecoder
+from utils.gaze_stream import GazeFrameStream
+from utils.report_store import ReportWriteQueue, create_report_backend
+from utils.job_queue import JobQueue, JobQueueFull
+from utils.metrics import metrics
+from utils.model_registry import get_model_registry
+from utils.memory_policy import memory_policy
+from utils.frame_profile import FrameProfileController, InFlightCounter, SessionFrameStats
+from utils.frame_filter import FramePrefilter, PrefilterState
+from utils.session_aggregates import SessionAggregates
+from utils.speech_stream import SpeechStreamStore
+
 # 모듈들 import
 try:
     from utils.gaze_tracker import GazeTracker
@@ -21,7 +34,7 @@ except ImportError as e:
     print(f"[ERROR] 모듈 로드 실패: {e}")
     # 더미 클래스들 생성
     class GazeTracker:
-        def __init__(self): 
+        def __init__(self, **kwargs): 
             self.calibrated = False
         def get_gaze_direction(self, frame): 
             return {'gaze_x': 0.1, 'gaze_y': 0.1, 'face_center': (320, 240)}
@@ -38,6 +51,8 @@ except ImportError as e:
             }
     
     class AudioAnalyzer:
+        def __init__(self, **kwargs):
+            pass
         def analyze(self, audio_file):
             return {
                 'transcription': '테스트 음성 인식 결과',
@@ -59,46 +74,180 @@ DB_CONFIG = {
     'charset': 'utf8mb4'
 }
 
-def get_db_connection():
-    """MySQL DB 연결 - 메모리 최적화"""
-    print(f"[DEBUG] DB_CONFIG 내용: {DB_CONFIG}")  # ← 설정 확인
-    try:
-        connection = pymysql.connect(
-            **DB_CONFIG,
-            connect_timeout=10,
-            read_timeout=10,
-            write_timeout=10
-        )
-        print(f"[SUCCESS] DB 연결 성공!")  # ← 성공 로그
-        return connection
-    except Exception as e:
-        print(f"[ERROR] DB 연결 실패: {e}")
-        print(f"[DEBUG] 연결 시도한 주소: {DB_CONFIG['host']}:{DB_CONFIG['port']}")  # ← 실제 연결 정보
-        raise Exception(f"DB연결실패: {e}")
-    
+# pdf_reports 저장: 연결 풀 + 백그라운드 배치 저장 큐
+# (REPORT_DB_URL=sqlite:///경로 로 MySQL 대신 SQLite 사용 가능)
+report_writer = ReportWriteQueue(
+    create_report_backend(os.environ.get('REPORT_DB_URL'), DB_CONFIG),
+    pool_size=int(os.environ.get('REPORT_DB_POOL_SIZE', 2)),
+    batch_size=int(os.environ.get('REPORT_DB_BATCH_SIZE', 16))
+)
+print(f"[INFO] 리포트 저장소: {report_writer.backend.describe()}")
+
 app = Flask(__name__, 
            template_folder=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates'),
            static_folder=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'))
 
+# WebSocket 시선 채널 (flask-sock 선택 설치)
+try:
+    from flask_sock import Sock
+    sock = Sock(app)
+except ImportError:
+    sock = None
+    print("[INFO] flask-sock 없음. WebSocket 시선 채널 비활성화 (HTTP 추적만 사용)")
+
 # 메모리 최적화 설정
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB 제한
 
-# 전역 변수 - 메모리 최적화
-gaze_tracker = None
-audio_analyzer = None
-calibration_data = []
-tracking_results = []
+# 세션별 상태 저장소 (여러 워커/스레드 동시 진단 지원)
+SESSION_HEADER = 'X-Session-Id'
+SESSION_COOKIE = 'session_id'
+
+session_store = SessionStore(
+    max_sessions=int(os.environ.get('SESSION_MAX_ENTRIES', 256)),
+    ttl=int(os.environ.get('SESSION_TTL_SECONDS', 1800)),
+    backend=create_shared_backend(os.environ.get('SESSION_BACKEND_URL')),
+    # 세션당 보관할 시선 샘플 수 (20fps 기준 30분, 넘으면 오래된 것부터 덮어씀)
+    tracking_capacity=int(os.environ.get('TRACKING_BUFFER_CAPACITY', 36000)),
+    # 시선 샘플은 모아서 공유 백엔드 목록에 추가 (프레임마다 세션 전체를 다시 쓰지 않음)
+    flush_batch=int(os.environ.get('SESSION_FLUSH_BATCH', 20)),
+    flush_interval=float(os.environ.get('SESSION_FLUSH_INTERVAL', 1.0))
+)
+
+# GC 정책 - 요청 경로에서 전체 수집을 하지 않고 백그라운드/임계치 기반으로 수집
+memory_policy.configure()
+
+# 모델 레지스트리 - Whisper/FaceMesh/ResNet을 워커당 한 번만 로드 (백그라운드)
+model_registry = get_model_registry()
+model_registry.start_loading(warmup=os.environ.get('MODEL_WARMUP', '0') == '1')
+# 요청이 모델 로드를 기다리는 최대 시간(초) - 넘으면 요청은 오류로 응답
+MODEL_READY_TIMEOUT = float(os.environ.get('MODEL_READY_TIMEOUT_SECONDS', 120))
+
+# 음성 분석 작업 큐 (시선 추적 요청 스레드와 분리)
+# Whisper 모델은 워커 프로세스에 하나뿐이고 인식은 모델 락으로 한 번에 하나씩 실행되며,
+# 한 번의 인식이 torch 스레드를 모두 쓰므로 기본 워커는 1개
+audio_jobs = JobQueue(
+    'audio_jobs',
+    max_workers=int(os.environ.get('AUDIO_WORKERS', 1)),
+    max_queue=int(os.environ.get('AUDIO_MAX_QUEUE', 32))
+)
+# 동기 /analyze_audio가 결과를 기다리는 최대 시간(초) - 넘으면 202 + job_id
+AUDIO_SYNC_WAIT_SECONDS = float(os.environ.get('AUDIO_SYNC_WAIT_SECONDS', 60))
+frame_decoder = FrameDecoder()
+
+# 스트리밍 음성 인식 - 녹음 중 PCM 청크를 VAD 구간별로 미리 인식 (워커 프로세스 메모리)
+speech_streams = SpeechStreamStore(
+    max_streams=int(os.environ.get('SPEECH_STREAM_MAX_STREAMS', 64)),
+    ttl=int(os.environ.get('SPEECH_STREAM_TTL_SECONDS', 600)),
+    max_segment_seconds=float(os.environ.get('SPEECH_STREAM_MAX_SEGMENT_SECONDS', 20)),
+    overlap_seconds=float(os.environ.get('SPEECH_STREAM_OVERLAP_SECONDS', 1.0)),
+    min_silence_ms=float(os.environ.get('SPEECH_STREAM_MIN_SILENCE_MS', 400))
+)
+
+# 얼굴 ROI 추적 - 직전 얼굴 주변만 검출하고 놓치거나 N프레임마다 전체 프레임 검출
+FACE_ROI_OPTIONS = {
+    'roi_tracking': os.environ.get('FACE_ROI_TRACKING', '1') == '1',
+    'roi_padding': float(os.environ.get('FACE_ROI_PADDING', 0.25)),
+    'roi_refresh_frames': int(os.environ.get('FACE_ROI_REFRESH_FRAMES', 30))
+}
+
+# 바이너리 업로드로 받는 프레임 형식
+RAW_FRAME_MIMETYPES = ('image/jpeg', 'application/octet-stream')
+
+# 시선 처리 지연/동시 처리 수 - 클라이언트 프레임 프로파일 조정에 사용
+gaze_process_ms = metrics.histogram('gaze.process_ms')
+gaze_in_flight = InFlightCounter()
+metrics.gauge('gaze.in_flight', gaze_in_flight)
+frame_stats = SessionFrameStats(capacity=int(os.environ.get('SESSION_MAX_ENTRIES', 256)))
+frame_profile = FrameProfileController(
+    gaze_process_ms,
+    gaze_in_flight,
+    default_level=int(os.environ.get('FRAME_PROFILE_LEVEL', 1)),
+    high_latency_ms=float(os.environ.get('FRAME_PROFILE_HIGH_MS', 150)),
+    low_latency_ms=float(os.environ.get('FRAME_PROFILE_LOW_MS', 60)),
+    max_in_flight=int(os.environ.get('FRAME_PROFILE_MAX_IN_FLIGHT', 8))
+)
+
+# 추론 전 사전 필터 - 어둡거나/흐리거나/직전과 같은 프레임은 직전 결과 재사용
+frame_prefilter = FramePrefilter(
+    min_brightness=float(os.environ.get('PREFILTER_MIN_BRIGHTNESS', 30)),
+    max_brightness=float(os.environ.get('PREFILTER_MAX_BRIGHTNESS', 235)),
+    min_sharpness=float(os.environ.get('PREFILTER_MIN_SHARPNESS', 15)),
+    min_change=float(os.environ.get('PREFILTER_MIN_CHANGE', 1.5)),
+    max_reuse=int(os.environ.get('PREFILTER_MAX_REUSE', 10)),
+    cost_estimate=lambda: gaze_process_ms.mean
+)
+
+def read_request_jpeg():
+    """요청에서 JPEG 바이트 읽기 - raw image/jpeg, multipart, 기존 JSON(base64) 순"""
+    if request.mimetype in RAW_FRAME_MIMETYPES:
+        return frame_decoder.encoded_from_stream(request.stream, request.content_length)
+    if 'frame' in request.files:
+        return frame_decoder.encoded_from_stream(request.files['frame'].stream)
+    return frame_decoder.encoded_from_data_url(request.json['frame'])
+
+def decode_frame(session_id, encoded):
+    """프레임 디코딩 + 세션별 수신 바이트/디코딩 시간 기록"""
+    start = time.perf_counter()
+    frame = frame_decoder.decode_encoded(encoded)
+    frame_stats.record(session_id, 0 if encoded is None else encoded.size, (time.perf_counter() - start) * 1000)
+    return frame
+
+def read_request_frame():
+    return decode_frame(get_session_id(), read_request_jpeg())
+
+def get_request_value(name, default=None):
+    """쿼리/폼/JSON 어디서든 값 조회 (바이너리 업로드 시 쿼리 사용)"""
+    if name in request.args:
+        return request.args[name]
+    if request.form and name in request.form:
+        return request.form[name]
+    if request.is_json:
+        return (request.get_json(silent=True) or {}).get(name, default)
+    return default
+
+def get_session_id():
+    """요청에서 세션 ID 추출 (헤더 > 쿼리 > JSON > 쿠키)"""
+    session_id = request.headers.get(SESSION_HEADER) or request.args.get('session_id')
+    if not session_id and request.is_json:
+        session_id = (request.get_json(silent=True) or {}).get('session_id')
+    return session_id or request.cookies.get(SESSION_COOKIE)
+
+def get_session_state():
+    """현재 요청의 세션 상태 조회"""
+    return session_store.get(get_session_id())
+
+def create_gaze_tracker():
+    """세션별 경량 트래커 - 무거운 모델은 레지스트리 것을 공유"""
+    if not model_registry.wait_ready(MODEL_READY_TIMEOUT):
+        raise RuntimeError("모델을 불러오는 중입니다. 잠시 후 다시 시도해 주세요.")
+    return GazeTracker(**model_registry.tracker_kwargs(), **FACE_ROI_OPTIONS)
+
+def get_audio_analyzer():
+    """공유 음성 분석기 (레지스트리 로드 완료 후, 제한 시간 안에 준비되지 않으면 None)"""
+    if not model_registry.wait_ready(MODEL_READY_TIMEOUT):
+        return None
+    return model_registry.audio_analyzer
+
+def get_session_tracker(state):
+    """세션 트래커 조회 - 다른 워커에서 복원된 세션이면 재생성"""
+    if state is None or not state.initialized:
+        return None
+    with state.lock:
+        if state.gaze_tracker is None:
+            state.gaze_tracker = create_gaze_tracker()
+            if state.calibrated:
+                state.gaze_tracker.calibrate(state.calibration_data)
+        return state.gaze_tracker
 
 # 메모리 정리 함수
-def cleanup_memory():
+def cleanup_memory(state=None):
     """메모리 정리"""
-    global calibration_data, tracking_results
-    # 오래된 데이터 제거 (최근 100개만 유지)
-    if len(calibration_data) > 100:
-        calibration_data = calibration_data[-100:]
-    if len(tracking_results) > 1000:
-        tracking_results = tracking_results[-1000:]
-    gc.collect()
+    if state is not None:
+        # 오래된 데이터 제거 (최근 100개만 유지)
+        if len(state.calibration_data) > 100:
+            state.calibration_data = state.calibration_data[-100:]
+    # 바로 수집하지 않고 백그라운드 수집 요청 (요청 지연 방지)
+    memory_policy.request_collection()
 
 @app.route('/')
 def index():
@@ -106,17 +255,22 @@ def index():
 
 @app.route('/init_tracker', methods=['POST'])
 def init_tracker():
-    global gaze_tracker, audio_analyzer
     try:
         print("[INFO] 트래커 초기화 시작...")
-        gaze_tracker = GazeTracker()
-        audio_analyzer = AudioAnalyzer()
+        state = session_store.create(get_session_id())
+        with state.lock:
+            state.gaze_tracker = create_gaze_tracker()
+            state.initialized = True
+            session_store.save(state)
         cleanup_memory()  # 메모리 정리
-        print("[INFO] 트래커 초기화 완료")
-        return jsonify({
+        print(f"[INFO] 트래커 초기화 완료 (세션: {state.session_id})")
+        response = jsonify({
             "status": "success", 
-            "message": "시스템이 성공적으로 초기화되었습니다."
+            "message": "시스템이 성공적으로 초기화되었습니다.",
+            "session_id": state.session_id
         })
+        response.set_cookie(SESSION_COOKIE, state.session_id, httponly=True, samesite='Lax')
+        return response
     except Exception as e:
         print(f"[ERROR] 초기화 오류: {e}")
         return jsonify({
@@ -126,49 +280,44 @@ def init_tracker():
 
 @app.route('/calibrate', methods=['POST'])
 def calibrate():
-    global calibration_data
     try:
-        data = request.json
-        frame_data = data['frame']
-        target_x = data['target_x']
-        target_y = data['target_y']
+        target_x = float(get_request_value('target_x'))
+        target_y = float(get_request_value('target_y'))
         
-        # Base64 디코딩 - 메모리 최적화
+        # 프레임 디코딩 - 메모리 최적화
         try:
-            header, b64_data = frame_data.split(',', 1)
-            frame_bytes = base64.b64decode(b64_data)
-            nparr = np.frombuffer(frame_bytes, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            frame = read_request_frame()
             
             if frame is None:
                 return jsonify({"status": "error", "message": "프레임 처리 실패"})
                 
-            # 메모리 해제
-            del frame_bytes, nparr
-                
         except Exception as decode_error:
             print(f"[ERROR] 디코딩 오류: {decode_error}")
             return jsonify({"status": "error", "message": "이미지 디코딩 실패"})
         
+        state = get_session_state()
+        gaze_tracker = get_session_tracker(state)
         if gaze_tracker:
-            gaze_point = gaze_tracker.get_gaze_direction(frame)
-            
-            if gaze_point:
-                calibration_data.append({
-                    'target': (target_x, target_y),
-                    'gaze': gaze_point
-                })
-                print(f"[INFO] 보정 포인트 추가됨. 총 {len(calibration_data)}개")
-                
-                # 메모리 정리
-                cleanup_memory()
+            with state.lock:
+                gaze_point = gaze_tracker.get_gaze_direction(frame)
                 
-                return jsonify({
-                    "status": "success", 
-                    "calibration_points": len(calibration_data)
-                })
-            else:
-                return jsonify({"status": "error", "message": "시선을 감지할 수 없습니다."})
+                if gaze_point:
+                    state.calibration_data.append({
+                        'target': (target_x, target_y),
+                        'gaze': gaze_point
+                    })
+                    print(f"[INFO] 보정 포인트 추가됨. 총 {len(state.calibration_data)}개")
+                    
+                    # 메모리 정리
+                    cleanup_memory(state)
+                    session_store.save(state)
+                    
+                    return jsonify({
+                        "status": "success", 
+                        "calibration_points": len(state.calibration_data)
+                    })
+                else:
+                    return jsonify({"status": "error", "message": "시선을 감지할 수 없습니다."})
         
         return jsonify({"status": "error", "message": "트래커가 초기화되지 않았습니다."})
         
@@ -179,29 +328,37 @@ def calibrate():
         # 메모리 정리
         if 'frame' in locals():
             del frame
-        gc.collect()
+        memory_policy.request_collection()
 
 @app.route('/start_tracking', methods=['POST'])
 def start_tracking():
-    global tracking_results
     try:
-        tracking_results = []  # 초기화로 메모리 절약
-        
-        if len(calibration_data) >= 4:
-            success = gaze_tracker.calibrate(calibration_data)
-            if success:
-                print("[INFO] 추적 시작됨")
+        state = get_session_state()
+        gaze_tracker = get_session_tracker(state)
+        if not gaze_tracker:
+            return jsonify({"status": "error", "message": "트래커가 초기화되지 않았습니다."})
+        
+        with state.lock:
+            session_store.reset_samples(state)
+            calibration_data = state.calibration_data
+            
+            if len(calibration_data) >= 4:
+                success = gaze_tracker.calibrate(calibration_data)
+                state.calibrated = bool(success)
+                session_store.save(state)
+                if success:
+                    print("[INFO] 추적 시작됨")
+                    return jsonify({
+                        "status": "success", 
+                        "message": f"{len(calibration_data)}개 보정 포인트로 추적 시작"
+                    })
+                else:
+                    return jsonify({"status": "error", "message": "보정 실패"})
+            else:
                 return jsonify({
-                    "status": "success", 
-                    "message": f"{len(calibration_data)}개 보정 포인트로 추적 시작"
+                    "status": "error", 
+                    "message": f"최소 4개의 보정 포인트가 필요합니다. (현재: {len(calibration_data)}개)"
                 })
-            else:
-                return jsonify({"status": "error", "message": "보정 실패"})
-        else:
-            return jsonify({
-                "status": "error", 
-                "message": f"최소 4개의 보정 포인트가 필요합니다. (현재: {len(calibration_data)}개)"
-            })
             
     except Exception as e:
         print(f"[ERROR] 추적 시작 오류: {e}")
@@ -209,70 +366,86 @@ def start_tracking():
 
 @app.route('/stop_tracking', methods=['POST'])
 def stop_tracking():
-    cleanup_memory()  # 추적 중지 시 메모리 정리
+    state = get_session_state()
+    if state is not None:
+        with state.lock:
+            cleanup_memory(state)  # 추적 중지 시 메모리 정리
+            session_store.save(state)
+    else:
+        cleanup_memory()
     print("[INFO] 추적 중지됨")
     return jsonify({"status": "success", "message": "추적이 중지되었습니다."})
 
+# 추적 실패 시 기본 응답
+DEFAULT_TRACKING_RESPONSE = {
+    "status": "success",
+    "direction": "center",
+    "confidence": 0.3,
+    "error_offset": 50
+}
+
+def record_tracking_result(state, result):
+    """추적 결과를 세션에 기록 (state.lock 안에서 호출)"""
+    # 세션 링 버퍼/집계에 기록, 공유 백엔드에는 샘플만 모아서 추가
+    x, y = result['position']
+    session_store.record_sample(state, time.time(), result['direction'], result['confidence'], x, y)
+
+def process_tracking_frame(state, gaze_tracker, encoded):
+    """JPEG 프레임 하나를 추적하고 세션에 기록 - HTTP/WebSocket 공용"""
+    if encoded is None:
+        return dict(DEFAULT_TRACKING_RESPONSE)
+    
+    with gaze_in_flight, state.lock:
+        if state.prefilter is None:
+            state.prefilter = PrefilterState()
+        
+        # 썸네일 검사에서 걸러진 프레임은 디코딩/추론 없이 직전 결과를 응답 (변화 검사는 얼굴 눈 구간)
+        face_detector = getattr(gaze_tracker, 'face_detector', None)
+        skip_reason = frame_prefilter.check(
+            state.prefilter, encoded, getattr(face_detector, 'last_face_bbox', None)
+        )
+        if skip_reason:
+            frame_stats.record(state.session_id, encoded.size)
+            result = state.prefilter.last_result
+        else:
+            start = time.perf_counter()
+            frame = decode_frame(state.session_id, encoded)
+            result = gaze_tracker.track_reading(frame) if frame is not None else None
+            gaze_process_ms.observe((time.perf_counter() - start) * 1000)
+            state.prefilter.last_result = result
+        
+        # 건너뛴 프레임은 새 측정이 아니므로 세션 타임라인/집계에 기록하지 않음
+        if result and not skip_reason:
+            record_tracking_result(state, result)
+    
+    if not result:
+        return dict(DEFAULT_TRACKING_RESPONSE)
+    
+    response = {
+        "status": "success", 
+        "direction": result['direction'],
+        "confidence": float(result['confidence']),
+        "error_offset": float(result.get('error_offset', 0)),
+        "position": result['position']
+    }
+    if skip_reason:
+        response['skipped'] = skip_reason
+    return response
+
 @app.route('/track_gaze', methods=['POST'])
 def track_gaze():
-    global tracking_results
     try:
-        data = request.json
-        frame_data = data['frame']
-        
-        # Base64 디코딩 - 메모리 최적화
+        # JPEG 수신 (디코딩은 사전 필터 통과 후)
         try:
-            header, b64_data = frame_data.split(',', 1)
-            frame_bytes = base64.b64decode(b64_data)
-            nparr = np.frombuffer(frame_bytes, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            # 메모리 해제
-            del frame_bytes, nparr
-            
-            if frame is None:
-                return jsonify({
-                    "status": "success",
-                    "direction": "center",
-                    "confidence": 0.3,
-                    "error_offset": 50
-                })
-                
+            encoded = read_request_jpeg()
         except Exception as decode_error:
-            return jsonify({
-                "status": "success",
-                "direction": "center", 
-                "confidence": 0.3,
-                "error_offset": 50
-            })
+            return jsonify(DEFAULT_TRACKING_RESPONSE)
         
         # 시선 추적 실행
+        state = get_session_state()
+        gaze_tracker = get_session_tracker(state)
         if gaze_tracker:
-            result = gaze_tracker.track_reading(frame)
-            
-            if result:
-                # 결과 저장 - 메모리 최적화
-                tracking_results.append({
-                    'timestamp': datetime.now().isoformat(),
-                    'gaze_direction': result['direction'],
-                    'confidence': result['confidence'],
-                    'position': result['position']
-                })
-                
-                return jsonify({
-                    "status": "success", 
-                    "direction": result['direction'],
-                    "confidence": float(result['confidence']),
-                    "error_offset": float(result.get('error_offset', 0)),
-                    "position": result['position']
-                })
-            else:
-                return jsonify({
-                    "status": "success",
-                    "direction": "center",
-                    "confidence": 0.3,
-                    "error_offset": 50
-                })
+            return jsonify(process_tracking_frame(state, gaze_tracker, encoded))
         else:
             return jsonify({
                 "status": "error",
@@ -281,68 +454,252 @@ def track_gaze():
         
     except Exception as e:
         print(f"[ERROR] track_gaze 오류: {e}")
-        return jsonify({
-            "status": "success",
-            "direction": "center",
-            "confidence": 0.3,
-            "error_offset": 50
-        })
+        return jsonify(DEFAULT_TRACKING_RESPONSE)
     finally:
         # 메모리 정리
-        if 'frame' in locals():
-            del frame
-        if len(tracking_results) % 50 == 0:  # 50회마다 정리
-            cleanup_memory()
+        if 'encoded' in locals():
+            del encoded
+
+if sock is not None:
+    @sock.route('/ws/track_gaze')
+    def track_gaze_stream(ws):
+        """WebSocket 시선 채널 - 바이너리 JPEG 프레임 스트림"""
+        state = get_session_state()
+        gaze_tracker = get_session_tracker(state)
+        if not gaze_tracker:
+            ws.send(json.dumps({
+                "status": "error",
+                "message": "트래커가 초기화되지 않았습니다."
+            }, ensure_ascii=False))
+            return
+        
+        def process_frame(frame_bytes):
+            try:
+                encoded = np.frombuffer(frame_bytes, np.uint8)
+                return process_tracking_frame(state, gaze_tracker, encoded)
+            except Exception as e:
+                print(f"[ERROR] track_gaze_stream 오류: {e}")
+                return dict(DEFAULT_TRACKING_RESPONSE)
+        
+        print(f"[INFO] 시선 스트림 시작 (세션: {state.session_id})")
+        GazeFrameStream(ws, process_frame).run()
+
+@app.route('/frame_profile', methods=['GET'])
+def get_frame_profile():
+    """클라이언트가 보낼 프레임 해상도/JPEG 품질 + 현재 세션 수신 통계"""
+    return jsonify({
+        "status": "success",
+        "profile": frame_profile.current(),
+        "session": frame_stats.get(get_session_id())
+    })
+
+def read_audio_upload():
+    """업로드 오디오를 메모리로 복사 - 요청이 끝난 뒤 작업 스레드에서 분석"""
+    audio_file = request.files['audio']
+    data = audio_file.read()
+    print(f"[INFO] 오디오 파일 받음: {audio_file.filename} ({len(data)} bytes)")
+    return FileStorage(
+        stream=io.BytesIO(data),
+        filename=audio_file.filename,
+        content_type=audio_file.content_type,
+        content_length=len(data)
+    )
+
+def run_audio_analysis(audio_file):
+    """음성 분석 작업 (작업 큐 워커에서 실행)"""
+    result = get_audio_analyzer().analyze(audio_file)
+    print(f"[INFO] 음성 분석 완료")
+    return result
 
 @app.route('/analyze_audio', methods=['POST'])
 def analyze_audio():
+    """동기 음성 분석 - 작업 큐를 거치되 결과를 기다려 반환"""
     try:
         if 'audio' not in request.files:
             return jsonify({"status": "error", "message": "오디오 파일이 없습니다."})
         
-        audio_file = request.files['audio']
-        print(f"[INFO] 오디오 파일 받음: {audio_file.filename}")
-        
-        if audio_analyzer:
-            result = audio_analyzer.analyze(audio_file)
-            print(f"[INFO] 음성 분석 완료")
-            return jsonify({"status": "success", "result": result})
+        if get_audio_analyzer():
+            job = audio_jobs.submit(run_audio_analysis, read_audio_upload())
+            if not job.done.wait(AUDIO_SYNC_WAIT_SECONDS):
+                # 대기열이 밀렸거나 인식이 길어짐 - 요청 스레드를 붙잡지 않고 작업 ID로 이어서 조회
+                return jsonify({
+                    "status": "success",
+                    "message": "분석이 진행 중입니다. job_id로 결과를 조회하세요.",
+                    "job_id": job.id,
+                    "job_status": job.status
+                }), 202
+            if job.status == 'failed':
+                raise Exception(job.error)
+            return jsonify({"status": "success", "result": job.result})
         
         return jsonify({"status": "error", "message": "음성 분석기가 초기화되지 않았습니다."})
         
+    except JobQueueFull as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
     except Exception as e:
         print(f"[ERROR] 음성 분석 오류: {e}")
         return jsonify({"status": "error", "message": f"음성 분석 실패: {str(e)}"})
     finally:
-        gc.collect()  # 음성 분석 후 메모리 정리
+        memory_policy.request_collection()  # 음성 분석 후 백그라운드 정리 요청
+
+@app.route('/analyze_audio/jobs', methods=['POST'])
+def submit_audio_job():
+    """음성 분석 작업 등록 - 작업 ID를 바로 반환"""
+    try:
+        if 'audio' not in request.files:
+            return jsonify({"status": "error", "message": "오디오 파일이 없습니다."})
+        if not get_audio_analyzer():
+            return jsonify({"status": "error", "message": "음성 분석기가 초기화되지 않았습니다."})
+        
+        job = audio_jobs.submit(run_audio_analysis, read_audio_upload())
+        return jsonify({"status": "success", "job_id": job.id, "job_status": job.status}), 202
+        
+    except JobQueueFull as e:
+        return jsonify({"status": "error", "message": str(e)}), 503
+    except Exception as e:
+        print(f"[ERROR] 음성 분석 작업 등록 오류: {e}")
+        return jsonify({"status": "error", "message": f"음성 분석 실패: {str(e)}"})
+
+@app.route('/analyze_audio/jobs/<job_id>', methods=['GET'])
+def get_audio_job(job_id):
+    """음성 분석 작업 상태/결과 조회 (wait=초 로 완료까지 대기 가능)"""
+    job = audio_jobs.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "알 수 없는 작업 ID입니다."}), 404
+    
+    wait = min(float(request.args.get('wait', 0)), 30.0)
+    if wait > 0:
+        job.done.wait(wait)
+    return jsonify({"status": "success", **job.to_dict()})
+
+@app.route('/analyze_audio/jobs/<job_id>/stream', methods=['GET'])
+def stream_audio_job(job_id):
+    """음성 분석 작업 상태를 Server-Sent Events로 전송"""
+    job = audio_jobs.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "알 수 없는 작업 ID입니다."}), 404
+    
+    def events():
+        last_status = None
+        while True:
+            finished = job.done.wait(1.0)
+            if job.status != last_status or finished:
+                last_status = job.status
+                yield f"data: {json.dumps(job.to_dict(), ensure_ascii=False)}\n\n"
+            if finished:
+                return
+    
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def get_speech_stream(stream_id):
+    """현재 세션의 음성 스트림 조회 (없으면 None)"""
+    return speech_streams.get(stream_id, get_session_id())
+
+@app.route('/speech_stream/start', methods=['POST'])
+def start_speech_stream():
+    """스트리밍 음성 분석 시작 - 이후 16kHz 모노 PCM16 청크를 /chunk로 전송"""
+    analyzer = get_audio_analyzer()
+    if not analyzer:
+        return jsonify({"status": "error", "message": "음성 분석기가 초기화되지 않았습니다."})
+    
+    stream = speech_streams.create(analyzer, get_session_id())
+    print(f"[INFO] 음성 스트림 시작: {stream.id}")
+    return jsonify({"status": "success", "stream_id": stream.id, "sample_rate": stream.sample_rate})
+
+@app.route('/speech_stream/<stream_id>/chunk', methods=['POST'])
+def append_speech_chunk(stream_id):
+    """PCM16 청크 추가 - 구간이 완성되면 작업 큐에서 바로 인식, 중간 결과 반환"""
+    stream = get_speech_stream(stream_id)
+    if stream is None:
+        return jsonify({"status": "error", "message": "알 수 없는 음성 스트림입니다."}), 404
+    
+    body = request.get_data()
+    if len(body) % 2:
+        return jsonify({"status": "error", "message": "PCM16 청크 길이는 2바이트의 배수여야 합니다."}), 400
+    
+    try:
+        if stream.append_pcm16(body):
+            stream.schedule(audio_jobs)
+    except JobQueueFull:
+        # 구간은 남겨 두고 다음 청크나 종료 시 다시 등록
+        pass
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 409
+    return jsonify({"status": "success", "partial": stream.snapshot()})
+
+@app.route('/speech_stream/<stream_id>', methods=['GET'])
+def get_speech_stream_status(stream_id):
+    """녹음 중 부분 인식 결과와 말하기 속도/유창성"""
+    stream = get_speech_stream(stream_id)
+    if stream is None:
+        return jsonify({"status": "error", "message": "알 수 없는 음성 스트림입니다."}), 404
+    return jsonify({"status": "success", "partial": stream.snapshot()})
+
+@app.route('/speech_stream/<stream_id>/finish', methods=['POST'])
+def finish_speech_stream(stream_id):
+    """녹음 종료 - 남은 구간만 인식하고 /analyze_audio와 같은 형식의 결과 반환"""
+    stream = get_speech_stream(stream_id)
+    if stream is None:
+        return jsonify({"status": "error", "message": "알 수 없는 음성 스트림입니다."}), 404
+    
+    try:
+        result = stream.finish(audio_jobs)
+        speech_streams.remove(stream_id)
+        print(f"[INFO] 음성 스트림 완료: {stream_id} ({stream.segment_count}개 구간)")
+        return jsonify({"status": "success", "result": result, "partial": stream.snapshot()})
+    except TimeoutError as e:
+        return jsonify({"status": "error", "message": str(e)}), 504
+    except Exception as e:
+        print(f"[ERROR] 음성 스트림 종료 오류: {e}")
+        return jsonify({"status": "error", "message": f"음성 분석 실패: {str(e)}"})
+    finally:
+        memory_policy.request_collection()
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """프로세스 내 성능 지표 (대기열 길이, 지연 시간 등)"""
+    return jsonify(metrics.snapshot())
+
+@app.route('/session_stats', methods=['GET'])
+def session_stats():
+    """진행 중인 세션의 실시간 시선 지표 (누적 집계 + 히트맵)"""
+    state = get_session_state()
+    if state is None:
+        return jsonify({"status": "error", "message": "세션을 찾을 수 없습니다."}), 404
+    with state.lock:
+        session_store.sync_samples(state)
+        stats = state.aggregates.snapshot(include_heatmap=True)
+        stats['buffered_samples'] = len(state.tracking_results)
+    return jsonify({"status": "success", "session_id": state.session_id, "stats": stats})
 
 @app.route('/generate_report', methods=['POST'])
 def generate_report():
-    global tracking_results
+    state = None
     try:
         data = request.json
         child_name = data.get('child_name', 'Unknown')
         user_id = data.get('user_id', 1)
         audio_result = data.get('audio_result', {})
         
-        print(f"[INFO] 리포트 생성 시작. 추적 결과: {len(tracking_results)}개")
-        
-        # 시선추적 분석
-        if tracking_results:
-            total_tracking_time = len(tracking_results) * 0.5
-            left_count = sum(1 for r in tracking_results if r['gaze_direction'] == 'left')
-            right_count = sum(1 for r in tracking_results if r['gaze_direction'] == 'right')
-            center_count = sum(1 for r in tracking_results if r['gaze_direction'] == 'center')
-            
-            concentration_score = (center_count / len(tracking_results) * 100)
-            direction_changes = sum(1 for i in range(1, len(tracking_results)) 
-                                  if tracking_results[i]['gaze_direction'] != tracking_results[i-1]['gaze_direction'])
-            reading_speed = direction_changes / (total_tracking_time / 60) if total_tracking_time > 0 else 0
+        state = get_session_state()
+        # 추적 중 누적된 집계 사용 - 세션 길이와 무관하게 상수 시간
+        if state is not None:
+            with state.lock:
+                session_store.sync_samples(state)
+                gaze_metrics = state.aggregates.snapshot()
         else:
-            total_tracking_time = 0
-            concentration_score = 0
-            reading_speed = 0
-            left_count = right_count = center_count = 0
+            gaze_metrics = SessionAggregates().snapshot()
+        
+        print(f"[INFO] 리포트 생성 시작. 추적 결과: {gaze_metrics['samples']}개")
+        
+        # 시선추적 분석 (실제 타임스탬프 기반)
+        total_tracking_time = gaze_metrics['total_time']
+        left_count = gaze_metrics['counts']['left']
+        right_count = gaze_metrics['counts']['right']
+        concentration_score = gaze_metrics['concentration']
+        reading_speed = gaze_metrics['reading_speed']
+        focus_time = gaze_metrics['dwell_time']['center']
         
         # 이슈 분석
         issues = []
@@ -413,7 +770,9 @@ def generate_report():
                 },
                 "eye_tracking": {
                     "issues": issues_text,
-                    "focus_time": f"{center_count * 0.5:.1f}초"
+                    "focus_time": f"{focus_time:.1f}초",
+                    "direction_changes": gaze_metrics['direction_changes'],
+                    "longest_fixation": f"{gaze_metrics['longest_fixation']:.1f}초"
                 },
                 "speech_analysis": {
                     "transcription": audio_result.get('transcription', 'N/A'),
@@ -424,7 +783,7 @@ def generate_report():
                     "word_count": audio_result.get('word_count', 0)
                 },
                 "feedback": {
-                    "summary": f"총 {len(tracking_results)}회 측정, 집중도 {concentration_score:.1f}%",
+                    "summary": f"총 {gaze_metrics['samples']}회 측정, 집중도 {concentration_score:.1f}%",
                     "recommended_activities": recommended_activities,
                     "next_diagnosis_date": (datetime.now() + timedelta(days=30)) .strftime("%Y-%m-%d")
                 }
@@ -438,7 +797,7 @@ def generate_report():
         print(f"[ERROR] 리포트 생성 오류: {e}")
         return jsonify({"status": "error", "message": f"리포트 생성 실패: {str(e)}"})
     finally:
-        cleanup_memory()  # 리포트 생성 후 메모리 정리
+        cleanup_memory(state)  # 리포트 생성 후 메모리 정리
 
 # ===== 유틸리티 함수들 =====
 
@@ -497,53 +856,22 @@ def create_report_text(report_data):
         return f"리포트 생성 오류: {str(e)}"
 
 def save_report_to_db(member_id, child_name, pdf_data, filename):
-    """DB에 PDF 리포트 저장 - 메모리 최적화"""
-    connection = None
+    """DB에 PDF 리포트 저장 요청 - 백그라운드 큐에 넣고 대기 ID 반환"""
     try:
-        print(f"[DEBUG] DB 연결 시도...")
-        connection = get_db_connection()
-        if not connection:
-            print(f"[ERROR] DB 연결 실패!")
-            return None
-        
-        print(f"[DEBUG] SQL 실행 중...")  
-        with connection.cursor() as cursor:
-            sql = """
-            INSERT INTO pdf_reports (member_id, child_name, pdf_data, filename, created_at) 
-            VALUES (%s, %s, %s, %s, NOW())
-            """
-                     
-            cursor.execute(sql, (member_id, child_name, pdf_data, filename))
-            connection.commit()
-                     
-            result = cursor.lastrowid
-            print(f"[DEBUG] 저장 결과: {result}")
-            return result
-                 
+        pending_id = report_writer.submit(member_id, child_name, pdf_data, filename)
+        print(f"[DEBUG] 저장 대기열 등록: {pending_id} (대기 {report_writer.pending_count()}건)")
+        return pending_id
     except Exception as e:
-        print(f"[ERROR] PDF 저장 오류: {e}")
+        print(f"[ERROR] PDF 저장 요청 오류: {e}")
         raise Exception(f"DB저장실패: {e}")
-    finally:
-        if connection:
-            connection.close()
-
-import urllib.request
-import tempfile
-import ssl
-
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import mm
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-import tempfile
-import os
+
 from datetime import datetime, timedelta
-import urllib.request
-import ssl
+from urllib.parse import quote
+
+from utils.report_renderer import get_report_renderer
+
+# 리포트 렌더러 - 시작 시 폰트 등록 및 스타일 준비 (실패했으면 요청 때 주기적으로 재시도)
+get_report_renderer()
 
 
 @app.route('/download_pdf_report', methods=['POST'])
@@ -558,217 +886,17 @@ def download_pdf_report():
         
         eye_tracking_result = data.get('eye_tracking_result', {})
         
-        # 나눔고딕 웹폰트 다운로드
-        try:
-            print("[INFO] 나눔고딕 폰트 다운로드 중...")
-            
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            font_url = "https://fonts.gstatic.com/ea/nanumgothic/v5/NanumGothic-Regular.ttf"
-            
-            font_request = urllib.request.Request(
-                font_url,
-                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            )
-            
-            with urllib.request.urlopen(font_request, timeout=15, context=ssl_context) as response:
-                font_data = response.read()
-            
-            temp_font = tempfile.NamedTemporaryFile(delete=False, suffix='.ttf')
-            temp_font.write(font_data)
-            temp_font.close()
-            
-            pdfmetrics.registerFont(TTFont('NanumGothic', temp_font.name))
-            font_name = 'NanumGothic'
-            print("[SUCCESS] 나눔고딕 폰트 등록 완료!")
-            
-        except Exception as font_error:
-            print(f"[WARNING] 폰트 다운로드 실패: {font_error}")
-            font_name = 'Helvetica'
-        
-        # 임시 PDF 파일 생성
-        temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-        
-        # PDF 문서 생성
-        doc = SimpleDocTemplate(
-            temp_pdf.name,
-            pagesize=A4,
-            topMargin=25*mm,
-            bottomMargin=20*mm,
-            leftMargin=20*mm,
-            rightMargin=20*mm
-        )
-        
-        # 스타일 정의
-        title_style = ParagraphStyle(
-            'Title',
-            fontName=font_name,
-            fontSize=20,
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor('#2c3e50'),
-            leading=24
-        )
-        
-        header_style = ParagraphStyle(
-            'Header',
-            fontName=font_name,
-            fontSize=14,
-            spaceAfter=10,
-            textColor=colors.HexColor('#34495e'),
-            leading=18
-        )
+        # 응답 형식: application/pdf 스트림 또는 기존 JSON(base64)
+        response_format = request.args.get('format') or data.get('format')
+        if not response_format:
+            response_format = 'pdf' if request.accept_mimetypes.best == 'application/pdf' else 'json'
         
-        normal_style = ParagraphStyle(
-            'Normal',
-            fontName=font_name,
-            fontSize=11,
-            leading=16,
-            spaceAfter=8
-        )
-        
-        # PDF 내용 구성
-        content = []
-        
-        # 제목
-        content.append(Paragraph("📚 읽기 능력 진단 리포트", title_style))
-        content.append(Spacer(1, 10))
-        content.append(Paragraph(f"👦 아동명: {child_name}", header_style))
-        content.append(Spacer(1, 20))
-        
-        # 기본 정보
-        content.append(Paragraph("📋 기본 정보", header_style))
-        
-        basic_data = [
-            ['아동 이름', child_name],
-            ['진단 날짜', datetime.now().strftime('%Y년 %m월 %d일')],
-            ['사용자 ID', str(user_id)],
-            ['리포트 생성 시간', datetime.now().strftime('%H시 %M분')]
-        ]
-        
-        basic_table = Table(basic_data, colWidths=[50*mm, 100*mm])
-        basic_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), font_name),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        
-        content.append(basic_table)
-        content.append(Spacer(1, 20))
-
-        # ===== 시선추적 분석 결과 =====
-        content.append(Paragraph("👁️ 시선추적 분석 결과", header_style))
-        
-        eye_data = [
-            ['집중 시간', eye_tracking_result.get('focus_time', '측정되지 않음')],
-            ['시선 상태', eye_tracking_result.get('issues', '정상')],
-            ['집중도', eye_tracking_result.get('concentration', '측정되지 않음')],
-            ['추적 상태', '완료']
-        ]
-        
-        eye_table = Table(eye_data, colWidths=[50*mm, 100*mm])
-        eye_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), font_name),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e3f2fd')),  # 연한 파란색
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        
-        content.append(eye_table)
-        content.append(Spacer(1, 20))
-        # ===== 시선추적 섹션 끝 =====
-        
-        # 음성 분석 결과
-        content.append(Paragraph("🎤 음성 분석 결과", header_style))
-        
-        transcription = audio_result.get('transcription', '음성 녹음이 없습니다')
-        fluency = audio_result.get('fluency', '측정되지 않음')
-        clarity = audio_result.get('pronunciation_clarity', '측정되지 않음')
-        
-        speech_data = [
-            ['인식된 내용', transcription[:60] + '...' if len(transcription) > 60 else transcription],
-            ['말하기 유창성', fluency],
-            ['발음 명확도', clarity],
-            ['전체 분석 상태', '완료']
-        ]
-        
-        speech_table = Table(speech_data, colWidths=[50*mm, 100*mm])
-        speech_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), font_name),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f5e8')),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        
-        content.append(speech_table)
-        content.append(Spacer(1, 20))
-        
-        # 종합 평가
-        content.append(Paragraph("📊 종합 평가", header_style))
-        content.append(Paragraph("이번 진단을 통해 아동의 읽기 능력과 음성 분석이 완료되었습니다.", normal_style))
-        content.append(Paragraph("지속적인 읽기 연습과 발음 교정을 통해 더욱 향상된 결과를 기대할 수 있습니다.", normal_style))
-        content.append(Spacer(1, 15))
-        
-        # 추천사항
-        content.append(Paragraph("💡 맞춤형 추천사항", header_style))
-        
-        recommendations = [
-            "1. 매일 20분씩 소리내어 읽기 연습하기",
-            "2. 다양한 장르의 책으로 독서 범위 넓히기",
-            "3. 읽은 내용을 요약하여 말해보기",
-            "4. 발음이 어려운 단어는 반복 연습하기",
-            "5. 시선 집중력 향상을 위한 집중 훈련",  # 시선추적 관련 추가
-            "6. 3개월 후 재진단 받기"
-        ]
-        
-        for rec in recommendations:
-            content.append(Paragraph(rec, normal_style))
-            content.append(Spacer(1, 4))
-        
-        # 푸터
-        content.append(Spacer(1, 30))
-        footer = f"📅 생성일시: {datetime.now().strftime('%Y년 %m월 %d일 %H시 %M분')} | AI 읽기 진단 시스템"
-        footer_style = ParagraphStyle(
-            'Footer',
-            fontName=font_name,
-            fontSize=9,
-            alignment=TA_CENTER,
-            textColor=colors.grey
-        )
-        content.append(Paragraph(footer, footer_style))
-        
-        # PDF 생성
-        doc.build(content)
-        temp_pdf.close()
+        # 1. 메모리 버퍼에 PDF 생성 (폰트/스타일은 시작 시 한 번만 준비)
+        pdf_binary_data = get_report_renderer().render_bytes(child_name, user_id, audio_result, eye_tracking_result)
         print("[SUCCESS] 한글 PDF 생성 완료!")
 
-        # 1. PDF 파일을 바이너리로 읽기
-        with open(temp_pdf.name, 'rb') as f:
-            pdf_binary_data = f.read()
-
-        # 2. Base64 인코딩
-        import base64
-        pdf_base64 = base64.b64encode(pdf_binary_data).decode('utf-8')
-
-        # 3. DB 저장 시도
+        # 2. DB 저장 요청 (백그라운드 큐 - 응답은 기다리지 않음)
+        filename = f"{child_name}_읽기진단리포트.pdf"
         error_msg = None
         try:
             print("[INFO] DB에 리포트 저장 중...")
@@ -790,36 +918,33 @@ def download_pdf_report():
                 }
             }
             
-            filename = f"{child_name}_읽기진단리포트.pdf"
             report_id = save_report_to_db(user_id, child_name, pdf_binary_data, filename)
-            
-            if report_id:
-                print(f"[SUCCESS] 백엔드용 DB 저장 완료! Report ID: {report_id}")
-            else:
-                print("[WARNING] DB 저장 실패")
+            print(f"[INFO] 대기 Report ID {report_id}로 DB 저장 요청 완료!")
                 
         except Exception as db_error:
             print(f"[ERROR] DB 저장 오류: {db_error}")
             report_id = None
             error_msg = str(db_error)
+        
+        report_status = 'pending' if report_id is not None else 'failed'
 
-        # 4. 임시 파일 정리
-        os.unlink(temp_pdf.name)
-        if 'temp_font' in locals():
-            try:
-                os.unlink(temp_font.name)
-            except:
-                pass
-
-        print(f"[INFO] Report ID {report_id}로 DB 저장 완료!")
-
-        # 5. 응답 반환
+        # 4. 응답 반환 - DB 저장과 같은 PDF 바이트를 그대로 사용
+        if response_format == 'pdf':
+            response = Response(pdf_binary_data, mimetype='application/pdf')
+            response.headers['Content-Disposition'] = (
+                f"attachment; filename*=UTF-8''{quote(filename)}"
+            )
+            response.headers['X-Report-Id'] = report_id or ''
+            response.headers['X-Report-Status'] = report_status
+            return response
+        
         return jsonify({
             "status": "success",
-            "pdf_data": pdf_base64,
-            "filename": f"{child_name}_읽기진단리포트.pdf",
+            "pdf_data": base64.b64encode(pdf_binary_data).decode('ascii'),
+            "filename": filename,
             "report_id": report_id,
-            "db_saved": report_id is not None,
+            "report_status": report_status,
+            "db_saved": False,
             "error": error_msg
         })
         
@@ -829,14 +954,33 @@ def download_pdf_report():
         traceback.print_exc()
         return jsonify({"status": "error", "message": f"PDF 생성 오류: {str(e)}"})
 
+@app.route('/report_status/<report_id>', methods=['GET'])
+def report_status(report_id):
+    """대기 Report ID의 DB 저장 결과 조회"""
+    status = report_writer.status(report_id)
+    if status is None:
+        return jsonify({"status": "error", "message": "알 수 없는 리포트 ID입니다."}), 404
+    return jsonify({
+        "status": "success",
+        "report_status": status['status'],
+        "db_report_id": status['report_id'],
+        "db_saved": status['status'] == 'saved',
+        "error": status['error']
+    })
+
 # health_check 함수도 수정 (psutil 의존성 제거)
 @app.route('/health', methods=['GET'])
 def health_check():
     """헬스체크 (psutil 없이)"""
+    state = get_session_state()
     return jsonify({
-        "status": "healthy",
-        "calibration_points": len(calibration_data),
-        "tracking_results": len(tracking_results)
+        "status": "healthy" if model_registry.ready else "loading",
+        "ready": model_registry.ready,
+        "models": model_registry.status(),
+        "sessions": len(session_store),
+        "calibration_points": len(state.calibration_data) if state else 0,
+        "tracking_results": len(state.tracking_results) if state else 0,
+        "tracking_overwritten": state.tracking_results.overwritten if state else 0
     })
 
 if __name__ == '__main__':
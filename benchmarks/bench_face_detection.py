@@ -0,0 +1,82 @@
+"""utils/face_detection.py 프레임당 지연 시간 벤치마크 - 기존 디버그 경로 vs 운영 모드
+
+사용법: python benchmarks/bench_face_detection.py [얼굴 이미지 경로] [반복 횟수]
+이미지를 주지 않으면 합성 프레임을 사용 (얼굴이 없어 Haar 검출 단계에서 끝남)
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_frame_upload import make_test_frame
+from utils.face_detection import FaceDetector
+
+
+def legacy_extract_eyes(detector, frame, debug_path):
+    """변경 전 extract_eyes의 프레임당 비용 재현"""
+    print(f"[DEBUG] 프레임 타입: {frame.dtype}, 최대값: {frame.max()}, 최소값: {frame.min()}")
+    cv2.imwrite(debug_path, frame)
+
+    if frame.shape[0] < 480 or frame.shape[1] < 640:
+        frame = cv2.resize(frame, (640, 480))
+
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+    if len(faces) == 0:
+        return None, None, None
+
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    results = detector.face_mesh.process(rgb_frame)
+    if not results.multi_face_landmarks:
+        face_mesh_lenient = detector.mp_face_mesh.FaceMesh(
+            static_image_mode=True,
+            max_num_faces=1,
+            refine_landmarks=False,
+            min_detection_confidence=0.05,
+            min_tracking_confidence=0.05
+        )
+        results = face_mesh_lenient.process(rgb_frame)
+        if not results.multi_face_landmarks:
+            return None, None, None
+    return detector.extract_eyes(frame)
+
+
+def bench(fn, iterations):
+    fn()  # 워밍업
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return sum(timings) / len(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    image_path = sys.argv[1] if len(sys.argv) > 1 else None
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    frame = cv2.imread(image_path) if image_path else make_test_frame()
+    if frame is None:
+        sys.exit(f"이미지를 읽을 수 없습니다: {image_path}")
+
+    detector = FaceDetector(debug=False, capture_sink=None)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        debug_path = os.path.join(tmpdir, 'debug_frame.jpg')
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy = bench(lambda: legacy_extract_eyes(detector, frame, debug_path), iterations)
+        production = bench(lambda: detector.extract_eyes(frame), iterations)
+
+    print(f"frame={frame.shape[1]}x{frame.shape[0]}, {iterations}회")
+    print(f"{'legacy (debug)':<16} mean {legacy[0]:7.2f} ms  p95 {legacy[1]:7.2f} ms")
+    print(f"{'production':<16} mean {production[0]:7.2f} ms  p95 {production[1]:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
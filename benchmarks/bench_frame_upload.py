@@ -0,0 +1,80 @@
+"""프레임 업로드 경로 벤치마크 - JSON/base64 vs raw image/jpeg
+
+사용법: python benchmarks/bench_frame_upload.py [반복 횟수]
+"""
+import base64
+import io
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.frame_decoder import FrameDecoder
+
+
+def make_test_frame(width=640, height=480):
+    """웹캠과 비슷한 질감의 테스트 프레임"""
+    y, x = np.mgrid[0:height, 0:width]
+    frame = np.dstack([
+        (x * 255 // width),
+        (y * 255 // height),
+        ((x + y) * 127 // (width + height))
+    ]).astype(np.uint8)
+    cv2.circle(frame, (width // 2, height // 2), min(width, height) // 4, (200, 180, 160), -1)
+    cv2.circle(frame, (width // 2 - 60, height // 2 - 30), 18, (40, 40, 40), -1)
+    cv2.circle(frame, (width // 2 + 60, height // 2 - 30), 18, (40, 40, 40), -1)
+    noise = np.random.default_rng(0).integers(0, 12, frame.shape, dtype=np.uint8)
+    return cv2.add(frame, noise)
+
+
+def decode_json_base64(body):
+    """기존 /track_gaze 경로"""
+    frame_data = json.loads(body)['frame']
+    header, b64_data = frame_data.split(',', 1)
+    frame_bytes = base64.b64decode(b64_data)
+    nparr = np.frombuffer(frame_bytes, np.uint8)
+    return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+
+def bench(fn, iterations):
+    fn()  # 워밍업
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    frame = make_test_frame()
+    ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+    jpeg_bytes = jpeg.tobytes()
+
+    json_body = json.dumps({
+        'frame': 'data:image/jpeg;base64,' + base64.b64encode(jpeg_bytes).decode('ascii')
+    }).encode('utf-8')
+
+    decoder = FrameDecoder()
+
+    def decode_raw():
+        stream = io.BytesIO(jpeg_bytes)
+        return decoder.decode_stream(stream, len(jpeg_bytes))
+
+    json_ms = bench(lambda: decode_json_base64(json_body), iterations)
+    raw_ms = bench(decode_raw, iterations)
+
+    print(f"프레임: {frame.shape[1]}x{frame.shape[0]}, JPEG 품질 80, 반복 {iterations}회")
+    print(f"{'경로':<24}{'전송 바이트':>12}{'디코딩(ms)':>12}")
+    print(f"{'JSON + base64':<24}{len(json_body):>12}{json_ms:>12.3f}")
+    print(f"{'raw image/jpeg':<24}{len(jpeg_bytes):>12}{raw_ms:>12.3f}")
+    print(f"전송량 절감: {(1 - len(jpeg_bytes) / len(json_body)) * 100:.1f}%, "
+          f"디코딩 시간 절감: {(1 - raw_ms / json_ms) * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    main()
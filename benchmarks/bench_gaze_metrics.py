@@ -0,0 +1,98 @@
+"""리포트 시선 지표 계산 벤치마크 - 기존 dict 목록 순회 vs 배열 벡터 연산
+
+사용법: python benchmarks/bench_gaze_metrics.py
+1천 ~ 1백만 샘플 세션에서 지표 계산 시간을 비교하고, 운영 경로의 누적 집계(SessionAggregates)가
+기준 구현(compute_gaze_metrics)과 같은 지표를 내는지 확인한다.
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.gaze_metrics import compute_gaze_metrics
+from utils.session_aggregates import SessionAggregates
+from utils.tracking_buffer import DIRECTIONS, TrackingBuffer
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+# 기존 방식은 1백만 샘플에서 dict 생성만으로도 오래 걸리므로 이 크기까지만 측정
+LEGACY_MAX_SIZE = 100_000
+
+
+def make_buffer(size, seed=0):
+    """20fps 전후 간격으로 방향이 가끔 바뀌는 세션 - (버퍼, 같은 샘플의 누적 집계)"""
+    rng = np.random.default_rng(seed)
+    buffer = TrackingBuffer(capacity=size, initial_size=size)
+    aggregates = SessionAggregates()
+    # 버퍼와 같은 밀리초 단위 시각으로 기록
+    timestamps = np.floor((1_700_000_000 + np.cumsum(rng.uniform(0.03, 0.07, size))) * 1000) / 1000
+    directions = np.repeat(rng.integers(0, 3, size // 10 + 1), 10)[:size]
+    for ts, code in zip(timestamps.tolist(), directions.tolist()):
+        buffer.append(ts, DIRECTIONS[code], 0.8, 960.0, 540.0)
+        aggregates.add(ts, DIRECTIONS[code], 0.8, 960.0, 540.0)
+    return buffer, aggregates
+
+
+def same_metrics(reference, aggregated, tolerance=1e-3):
+    """기준 구현과 누적 집계의 공통 지표 비교 (시간 값은 밀리초 반올림 오차 허용)"""
+    for key, expected in reference.items():
+        actual = aggregated[key]
+        if isinstance(expected, dict):
+            if any(not np.isclose(expected[k], actual[k], rtol=tolerance, atol=tolerance) for k in expected):
+                return False
+        elif not np.isclose(expected, actual, rtol=tolerance, atol=tolerance):
+            return False
+    return True
+
+
+def to_legacy_records(buffer):
+    """기존 tracking_results 형식 (dict 목록)"""
+    return [
+        {'timestamp': datetime.fromtimestamp(ts / 1000).isoformat(), 'gaze_direction': DIRECTIONS[code]}
+        for ts, code in zip(buffer.column('timestamps').tolist(), buffer.column('directions').tolist())
+    ]
+
+
+def legacy_metrics(tracking_results):
+    """기존 generate_report 계산 (0.5초/샘플 가정)"""
+    total_tracking_time = len(tracking_results) * 0.5
+    left_count = sum(1 for r in tracking_results if r['gaze_direction'] == 'left')
+    right_count = sum(1 for r in tracking_results if r['gaze_direction'] == 'right')
+    center_count = sum(1 for r in tracking_results if r['gaze_direction'] == 'center')
+    concentration_score = center_count / len(tracking_results) * 100
+    direction_changes = sum(1 for i in range(1, len(tracking_results))
+                            if tracking_results[i]['gaze_direction'] != tracking_results[i-1]['gaze_direction'])
+    reading_speed = direction_changes / (total_tracking_time / 60)
+    return left_count, right_count, concentration_score, reading_speed
+
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    print(f"{'samples':>10} {'legacy ms':>12} {'vectorized ms':>14} {'aggregates':>11}")
+    for size in SIZES:
+        buffer, aggregates = make_buffer(size)
+        columns = (buffer.column('timestamps'), buffer.column('directions'))
+        vectorized = timed(lambda: compute_gaze_metrics(*columns))
+        matches = 'match' if same_metrics(compute_gaze_metrics(*columns), aggregates.snapshot()) else 'MISMATCH'
+
+        if size <= LEGACY_MAX_SIZE:
+            records = to_legacy_records(buffer)
+            legacy = f"{timed(lambda: legacy_metrics(records)):12.2f}"
+        else:
+            legacy = f"{'-':>12}"
+        print(f"{size:>10} {legacy} {vectorized:14.2f} {matches:>11}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""ResNet 시선 모델 추론 벤치마크 - 눈별 forward 2회 vs 배치 forward
+
+사용법: python benchmarks/bench_gaze_model.py [측정 시간(초)]
+배치 크기는 한 번의 forward에 들어가는 눈 이미지 수 (프레임 하나 = 눈 2개)
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.gaze_model import GazeModel
+
+BATCH_SIZES = (1, 2, 16, 64)
+
+
+def make_eye_images(count, seed=0):
+    """웹캠 눈 영역 크롭과 비슷한 크기의 BGR 이미지"""
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, (28 + i % 8, 52 + i % 12, 3), dtype=np.uint8) for i in range(count)]
+
+
+def measure(fn, eyes_per_call, duration):
+    fn()  # 워밍업
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        fn()
+        calls += 1
+    elapsed = time.perf_counter() - start
+    eyes_per_sec = calls * eyes_per_call / elapsed
+    return eyes_per_sec / 2, elapsed / calls * 1000
+
+
+def legacy_predict(model, left_eye, right_eye):
+    """기존 predict_gaze 방식 - 눈마다 전처리 + batch 1 forward"""
+    with torch.no_grad():
+        left_pred = model.model(model.preprocess_eye_image(left_eye))
+        right_pred = model.model(model.preprocess_eye_image(right_eye))
+        return (left_pred + right_pred) / 2
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    model = GazeModel()
+    eyes = make_eye_images(max(BATCH_SIZES))
+    print(f"device={model.device}, torch threads={torch.get_num_threads()}, 측정 {duration:.0f}초/항목")
+
+    fps, ms = measure(lambda: legacy_predict(model, eyes[0], eyes[1]), 2, duration)
+    print(f"{'legacy (2 x batch 1)':<22} {fps:9.1f} frames/s  {ms:8.2f} ms/call")
+
+    for batch_size in BATCH_SIZES:
+        batch = eyes[:batch_size]
+        fps, ms = measure(lambda: model.predict_batch(batch), batch_size, duration)
+        print(f"{'batch ' + str(batch_size):<22} {fps:9.1f} frames/s  {ms:8.2f} ms/call")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""요청 지연 p99 벤치마크 - 요청 경로 gc.collect() vs 메모리 정책(임계값 조정 + freeze + 백그라운드 수집)
+
+사용법: python benchmarks/bench_gc_latency.py [모델 대용 객체 수(백만)] [요청 수]
+Whisper/torch가 로드된 프로세스처럼 오래 사는 객체가 많은 힙을 만든 뒤,
+시선 추적 요청과 비슷한 작은 할당 작업의 지연 분포를 비교한다.
+"""
+import gc
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.memory_policy import MemoryPolicy
+from utils.metrics import MetricsRegistry
+
+
+def build_long_lived_heap(millions):
+    """모델 객체 대용 - GC가 추적하는 컨테이너 객체 다수"""
+    return [{'weight': [i, i + 1], 'name': str(i)} for i in range(int(millions * 1_000_000))]
+
+
+def handle_request(i):
+    """요청 하나 - 결과 dict, 임시 리스트 등 짧게 사는 객체 생성"""
+    samples = [{'timestamp': i + k, 'direction': 'center', 'position': (k, k)} for k in range(200)]
+    return sum(len(s) for s in samples)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+def run(label, requests, on_request):
+    timings = []
+    for i in range(requests):
+        start = time.perf_counter()
+        handle_request(i)
+        on_request(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"{label:<28} p50 {percentile(timings, 50):8.3f} ms  p99 {percentile(timings, 99):8.3f} ms  "
+          f"max {max(timings):8.2f} ms")
+
+
+def legacy_cleanup(i):
+    """기존 경로 - 추적 50회마다, 그리고 보정/음성/리포트 요청(약 5%)마다 gc.collect()"""
+    if i % 50 == 0 or i % 20 == 7:
+        gc.collect()
+
+
+def main():
+    millions = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    heap = build_long_lived_heap(millions)
+    print(f"오래 사는 객체 {len(heap):,}개, 요청 {requests}회")
+
+    run('legacy (gc.collect in path)', requests, legacy_cleanup)
+
+    policy = MemoryPolicy(collect_interval=60, metrics=MetricsRegistry()).configure()
+    policy.freeze('benchmark heap')
+    run('memory policy', requests, lambda i: policy.request_collection() if i % 20 == 7 else None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""PDF 리포트 파이프라인 벤치마크 - 임시 파일 + base64 vs 메모리 버퍼
+
+각 방식을 별도 프로세스에서 실행해 리포트당 지연 시간과 최대 RSS를 비교한다.
+사용법: python benchmarks/bench_pdf_report.py [리포트 수]
+"""
+import base64
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODES = ('tempfile_json', 'memory_json', 'memory_pdf')
+
+AUDIO_RESULT = {
+    'transcription': '아기돼지삼형제가 집을 지었어요. 첫째는 짚으로 둘째는 나무로 지었어요.' * 3,
+    'fluency': '78.0%',
+    'pronunciation_clarity': '83.6%'
+}
+EYE_RESULT = {'focus_time': '52.1초', 'issues': '정상', 'concentration': '78.3%'}
+
+
+def run_once(renderer, mode):
+    """리포트 1개 생성 → (DB 저장용 바이트, 응답 페이로드)"""
+    args = ('테스트 아동', 1, AUDIO_RESULT, EYE_RESULT)
+    if mode == 'tempfile_json':
+        # 기존 방식: 임시 파일에 쓰고 다시 읽은 뒤 base64 인코딩
+        temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
+        renderer.render(temp_pdf.name, *args)
+        temp_pdf.close()
+        with open(temp_pdf.name, 'rb') as f:
+            pdf_bytes = f.read()
+        payload = base64.b64encode(pdf_bytes).decode('utf-8')
+        os.unlink(temp_pdf.name)
+        return pdf_bytes, payload
+
+    pdf_bytes = renderer.render_bytes(*args)
+    if mode == 'memory_json':
+        return pdf_bytes, base64.b64encode(pdf_bytes).decode('ascii')
+    return pdf_bytes, pdf_bytes
+
+
+def child(mode, count):
+    from utils.report_renderer import get_report_renderer
+
+    renderer = get_report_renderer()
+    run_once(renderer, mode)  # 워밍업
+
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        run_once(renderer, mode)
+        latencies.append((time.perf_counter() - start) * 1000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    latencies.sort()
+    print(f"{mode:<16}{sum(latencies) / count:>10.2f}{latencies[int(count * 0.95) - 1]:>10.2f}"
+          f"{max_rss / 1024:>12.1f}{(max_rss - base_rss) / 1024:>10.1f}{peak / 1024:>14.1f}")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--child':
+        child(sys.argv[2], int(sys.argv[3]))
+        return
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"리포트 {count}개 (RSS 단위 MB, tracemalloc 최대 할당 단위 KB)")
+    print(f"{'방식':<14}{'평균ms':>10}{'p95ms':>10}{'최대RSS':>10}{'RSS증가':>9}{'Python최대할당':>10}")
+    for mode in MODES:
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, str(count)],
+                       check=True, stderr=subprocess.DEVNULL)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""음성 채점 벤치마크 - 기존 키워드별 `in` 검색/문자 순회 vs Aho–Corasick 채점 엔진
+
+사용법: python benchmarks/bench_speech_scoring.py
+긴 낭독 전사문(수백 ~ 수만 자)에서 어휘 20개 / 5천 개일 때 채점 시간을 비교하고,
+기본 어휘에서 두 방식의 점수가 같은지 확인한다.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.speech_scoring import DEFAULT_CONNECTIVES, DEFAULT_KEYWORDS, SpeechScorer
+
+TEXT_LENGTHS = (200, 2_000, 20_000)
+LEXICON_SIZES = (len(DEFAULT_KEYWORDS), 5_000)
+REPEAT = 20
+
+SENTENCES = (
+    "토끼와 거북이가 달리기를 했어요.", "토끼는 빨리 뛰어갔지만 중간에 잠을 잤어요.",
+    "거북이는 천천히 걸어갔어요!", "그래서 결국 거북이가 먼저 도착했어요.",
+    "주인공이 왜 그랬을까요?", "이 책은 정말 재밌어요 하지만 조금 어려웠어요.",
+    "개미는 여름에 열심히 일했어요.", "베짱이는 노래만 불렀어요."
+)
+
+
+def make_transcript(length, seed=0):
+    """예시 문장 + 문장마다 무작위 단어 하나 (길어질수록 어휘도 늘어나도록)"""
+    rng = random.Random(seed)
+    parts, size = [], 0
+    while size < length:
+        word = ''.join(chr(rng.randint(0xAC00, 0xD7A3)) for _ in range(rng.randint(2, 3)))
+        sentence = f"{word} {rng.choice(SENTENCES)}"
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return ' '.join(parts)[:length]
+
+
+def make_lexicon(size, seed=0):
+    """기본 어휘 + 무작위 한글 2~4음절 단어"""
+    rng = random.Random(seed)
+    words = list(DEFAULT_KEYWORDS)
+    while len(words) < size:
+        words.append(''.join(chr(rng.randint(0xAC00, 0xD7A3)) for _ in range(rng.randint(2, 4))))
+    return words
+
+
+def legacy_score(text, keywords, clarity=80.0, fluency=80.0):
+    """기존 _analyze_korean_speech/_calculate_comprehension 계산"""
+    word_count = len([w for w in text.split() if w.strip()])
+    korean_chars = len([c for c in text if '가' <= c <= '힣'])
+    total_chars = len(text.replace(' ', ''))
+    korean_ratio = korean_chars / total_chars if total_chars > 0 else 0
+
+    base_score = (clarity + fluency) / 2
+    keyword_count = sum(1 for keyword in keywords if keyword in text)
+    content_bonus = min(20, keyword_count * 3)
+    structure_bonus = 0
+    if len(text) > 20:
+        structure_bonus += 5
+    if any(punct in text for punct in '.!?'):
+        structure_bonus += 5
+    if any(word in text for word in DEFAULT_CONNECTIVES):
+        structure_bonus += 5
+    comprehension = max(30, min(95, base_score + content_bonus + structure_bonus))
+    return word_count, korean_ratio, comprehension
+
+
+def engine_score(scorer, text, clarity=80.0, fluency=80.0):
+    stats = scorer.text_stats(text)
+    korean_ratio = stats['hangul'] / stats['non_space'] if stats['non_space'] else 0
+    return stats['words'], korean_ratio, scorer.comprehension(text, stats, clarity, fluency)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = fn()
+    return (time.perf_counter() - start) / REPEAT * 1000, result
+
+
+def main():
+    print(f"{'어휘':>6} {'글자 수':>8} {'기존(ms)':>10} {'엔진(ms)':>10} {'배속':>7}  점수 일치")
+    for lexicon_size in LEXICON_SIZES:
+        keywords = make_lexicon(lexicon_size)
+        build_start = time.perf_counter()
+        scorer = SpeechScorer(keywords=keywords)
+        build_ms = (time.perf_counter() - build_start) * 1000
+        for length in TEXT_LENGTHS:
+            text = make_transcript(length)
+            legacy_ms, legacy = timed(lambda: legacy_score(text, keywords))
+            engine_ms, engine = timed(lambda: engine_score(scorer, text))
+            same = legacy[0] == engine[0] and abs(legacy[1] - engine[1]) < 1e-9 and legacy[2] == engine[2]
+            print(f"{lexicon_size:>6} {length:>8} {legacy_ms:>10.3f} {engine_ms:>10.3f} "
+                  f"{legacy_ms / engine_ms:>6.1f}x  {'예' if same else '아니오'}")
+        print(f"       (어휘 {lexicon_size}개 자동자 생성 {build_ms:.1f}ms, 시작 시 한 번)")
+
+
+if __name__ == '__main__':
+    main()
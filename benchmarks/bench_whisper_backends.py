@@ -0,0 +1,137 @@
+"""Whisper 백엔드 벤치마크 - 실시간 배수(RTF)와 메모리, (정답이 있으면) 글자 오류율
+
+사용법: python benchmarks/bench_whisper_backends.py <클립 디렉터리> [백엔드 ...] [--threads N]
+  백엔드 형식: 종류:모델:양자화 (예: openai:base, openai:base:int8, faster:small:int8, faster:base:fp32)
+  양자화를 생략하면 백엔드 기본값 (openai는 fp32, faster는 int8)
+  클립 디렉터리: 한국어 낭독 클립(.wav/.webm/.ogg/.mp3)과 같은 이름의 정답 전사(.txt, 선택)
+
+백엔드마다 별도 프로세스에서 로드해 RSS/최대 RSS가 서로 섞이지 않게 한다.
+RTF = 인식 시간 / 오디오 길이 (1보다 작을수록 실시간보다 빠름).
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.audio_analyzer import DEFAULT_PROMPT
+from utils.audio_decoding import decode_audio, duration_seconds
+from utils.memory_policy import current_rss_mb
+from utils.whisper_backends import create_whisper_backend, parse_backend_spec
+
+DEFAULT_BACKENDS = ('openai:base', 'openai:base:int8', 'faster:base:fp32', 'faster:base:int8', 'faster:small:int8')
+CLIP_EXTENSIONS = ('.wav', '.webm', '.ogg', '.mp3', '.m4a', '.flac')
+
+
+def load_clips(directory):
+    """(이름, 16kHz 샘플, 정답 텍스트 또는 None) 목록 - 이름순으로 고정"""
+    clips = []
+    for name in sorted(os.listdir(directory)):
+        base, ext = os.path.splitext(name)
+        if ext.lower() not in CLIP_EXTENSIONS:
+            continue
+        with open(os.path.join(directory, name), 'rb') as f:
+            samples = decode_audio(f.read())
+        reference_path = os.path.join(directory, base + '.txt')
+        reference = None
+        if os.path.exists(reference_path):
+            with open(reference_path, encoding='utf-8') as f:
+                reference = f.read().strip()
+        clips.append((name, samples, reference))
+    return clips
+
+
+def character_error_rate(reference, hypothesis):
+    """공백을 뺀 글자 단위 편집 거리 / 정답 길이"""
+    ref = ''.join(reference.split())
+    hyp = ''.join(hypothesis.split())
+    if not ref:
+        return 0.0
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def run_backend(spec, directory, threads):
+    """한 백엔드 측정 (자식 프로세스에서 실행) - 결과 dict"""
+    clips = load_clips(directory)
+    kind, model_size, quantize = parse_backend_spec(spec)
+    rss_before = current_rss_mb()
+
+    start = time.perf_counter()
+    backend = create_whisper_backend(kind, model_size, quantize, threads)
+    load_seconds = time.perf_counter() - start
+    rss_loaded = current_rss_mb()
+
+    # 첫 호출 초기화 비용은 제외
+    backend.transcribe(clips[0][1][:16000], language='ko')
+
+    audio_seconds = 0.0
+    transcribe_seconds = 0.0
+    errors = []
+    for name, samples, reference in clips:
+        start = time.perf_counter()
+        result = backend.transcribe(samples, language='ko', task='transcribe', initial_prompt=DEFAULT_PROMPT,
+                                    temperature=0.0, word_timestamps=True)
+        transcribe_seconds += time.perf_counter() - start
+        audio_seconds += duration_seconds(samples)
+        if reference is not None:
+            errors.append(character_error_rate(reference, result.get('text', '')))
+
+    return {
+        'backend': backend.name,
+        'threads': getattr(backend, 'threads', None),
+        'clips': len(clips),
+        'audio_seconds': round(audio_seconds, 1),
+        'load_seconds': round(load_seconds, 2),
+        'rtf': round(transcribe_seconds / audio_seconds, 3) if audio_seconds else None,
+        'model_rss_mb': round(rss_loaded - rss_before, 1) if rss_loaded and rss_before else None,
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'cer': round(sum(errors) / len(errors), 3) if errors else None
+    }
+
+
+def main():
+    args = sys.argv[1:]
+    if '--worker' in args:
+        index = args.index('--worker')
+        spec, directory, threads = args[index + 1], args[index + 2], int(args[index + 3]) or None
+        print(json.dumps(run_backend(spec, directory, threads)))
+        return
+
+    threads = 0
+    if '--threads' in args:
+        index = args.index('--threads')
+        threads = int(args[index + 1])
+        del args[index:index + 2]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+    directory, specs = args[0], args[1:] or list(DEFAULT_BACKENDS)
+
+    print(f"{'백엔드':<22} {'스레드':>6} {'RTF':>7} {'로드(s)':>8} {'모델 RSS(MB)':>12} {'최대 RSS(MB)':>12} {'CER':>6}")
+    for spec in specs:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--worker', spec, directory, str(threads)],
+            capture_output=True, text=True
+        )
+        lines = completed.stdout.strip().splitlines()
+        if completed.returncode != 0 or not lines:
+            reason = (completed.stderr.strip().splitlines() or ['알 수 없는 오류'])[-1]
+            print(f"{spec:<22} 실행 실패: {reason}")
+            continue
+        r = json.loads(lines[-1])
+        cer = f"{r['cer']:.3f}" if r['cer'] is not None else '-'
+        print(f"{r['backend']:<22} {r['threads'] or '-':>6} {r['rtf']:>7.3f} {r['load_seconds']:>8.2f} "
+              f"{r['model_rss_mb'] or 0:>12.1f} {r['peak_rss_mb']:>12.1f} {cer:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,12 @@ import torch.nn as nn
 import torchvision.models as models
 import cv2
 import numpy as np
+import threading
+
+# MPIIGaze 눈 이미지 크기
+EYE_WIDTH = 60
+EYE_HEIGHT = 36
+INV_255 = np.float32(1.0 / 255.0)
 
 class GazeResNet(nn.Module):
     def __init__(self, num_classes=2):  # x, y 좌표
@@ -22,6 +28,7 @@ class GazeModel:
     def __init__(self, model_path='models/best_resnet_model.pth'):
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         self.model = GazeResNet()
+        self._local = threading.local()
         
         try:
             # 모델 로드 (PyTorch 2.6 호환성 수정)
@@ -37,59 +44,67 @@ class GazeModel:
             self.model.eval()
             print("Using randomly initialized model")
     
+    def _input_buffer(self, size):
+        """스레드별로 재사용하는 (N, 1, 36, 60) 입력 버퍼 - 부족할 때만 두 배로 늘림"""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None or buffer.shape[0] < size:
+            capacity = max(size, 2 * buffer.shape[0] if buffer is not None else 2)
+            buffer = np.empty((capacity, 1, EYE_HEIGHT, EYE_WIDTH), dtype=np.float32)
+            self._local.buffer = buffer
+            self._local.tensor = torch.from_numpy(buffer)  # 같은 메모리를 공유하는 텐서
+        return self._local.buffer, self._local.tensor
+
+    def _fill_eye(self, eye_image, out):
+        """눈 이미지 하나를 그레이스케일/60x36/0~1 로 변환해 out(36, 60)에 기록"""
+        # 그레이스케일 변환
+        if len(eye_image.shape) == 3:
+            eye_image = cv2.cvtColor(eye_image, cv2.COLOR_BGR2GRAY)
+
+        # 크기 조정 (60x36 - MPIIGaze 표준)
+        if eye_image.shape != (EYE_HEIGHT, EYE_WIDTH):
+            eye_image = cv2.resize(eye_image, (EYE_WIDTH, EYE_HEIGHT))
+
+        # 정규화 (중간 배열 없이 버퍼에 바로 기록)
+        np.multiply(eye_image, INV_255, out=out)
+
     def preprocess_eye_image(self, eye_image):
-        """눈 이미지 전처리"""
+        """눈 이미지 전처리 - (1, 1, 36, 60) 텐서"""
         try:
-            # 그레이스케일 변환
-            if len(eye_image.shape) == 3:
-                eye_image = cv2.cvtColor(eye_image, cv2.COLOR_BGR2GRAY)
-            
-            # 크기 조정 (60x36 - MPIIGaze 표준)
-            eye_image = cv2.resize(eye_image, (60, 36))
-            
-            # 정규화
-            eye_image = eye_image.astype(np.float32) / 255.0
-            
-            # 텐서 변환
-            eye_tensor = torch.from_numpy(eye_image).unsqueeze(0).unsqueeze(0)  # (1, 1, 36, 60)
-            eye_tensor = eye_tensor.to(self.device)
-            
-            return eye_tensor
+            eye_array = np.empty((1, 1, EYE_HEIGHT, EYE_WIDTH), dtype=np.float32)
+            self._fill_eye(eye_image, eye_array[0, 0])
+            return torch.from_numpy(eye_array).to(self.device)
         except Exception as e:
             print(f"Error in preprocessing: {e}")
             return None
-    
-    def predict_gaze(self, left_eye, right_eye):
-        """시선 방향 예측"""
+
+    def predict_batch(self, eye_images):
+        """눈 이미지 N개를 한 번의 forward로 예측 - (N, 2) float32 배열"""
+        count = len(eye_images)
+        if count == 0:
+            return np.empty((0, 2), dtype=np.float32)
+
+        buffer, tensor = self._input_buffer(count)
+        for i, eye_image in enumerate(eye_images):
+            self._fill_eye(eye_image, buffer[i, 0])
+
+        with torch.inference_mode():
+            batch = tensor[:count]
+            if self.device.type != 'cpu':
+                batch = batch.to(self.device, non_blocking=True)
+            return self.model(batch).float().cpu().numpy()
+
+    def predict_gaze_batch(self, eye_pairs):
+        """(왼쪽 눈, 오른쪽 눈) 쌍 목록을 한 배치로 예측 - 쌍마다 두 눈 평균 (x, y)"""
+        if not eye_pairs:
+            return []
         try:
-            print(f"[DEBUG] 눈 이미지 입력 - 왼쪽: {left_eye.shape}, 오른쪽: {right_eye.shape}")
-            
-            with torch.no_grad():
-                # 왼쪽 눈 처리
-                left_tensor = self.preprocess_eye_image(left_eye)
-                if left_tensor is None:
-                    print("[DEBUG] 왼쪽 눈 전처리 실패")
-                    return None
-                print(f"[DEBUG] 왼쪽 눈 텐서 크기: {left_tensor.shape}")
-                
-                # 오른쪽 눈 처리
-                right_tensor = self.preprocess_eye_image(right_eye)
-                if right_tensor is None:
-                    print("[DEBUG] 오른쪽 눈 전처리 실패")
-                    return None
-                print(f"[DEBUG] 오른쪽 눈 텐서 크기: {right_tensor.shape}")
-                
-                # 예측
-                left_pred = self.model(left_tensor)
-                right_pred = self.model(right_tensor)
-                print(f"[DEBUG] 모델 예측 - 왼쪽: {left_pred}, 오른쪽: {right_pred}")
-                
-                # 평균 계산
-                avg_pred = (left_pred + right_pred) / 2
-                gaze_x, gaze_y = avg_pred[0].cpu().numpy()
-                
-                print(f"[DEBUG] 최종 시선 좌표: ({gaze_x}, {gaze_y})")
-                return (float(gaze_x), float(gaze_y))
+            eye_images = [eye for pair in eye_pairs for eye in pair]
+            preds = self.predict_batch(eye_images).reshape(len(eye_pairs), 2, 2).mean(axis=1)
+            return [(float(x), float(y)) for x, y in preds]
         except Exception as e:
             print(f"Error in prediction: {e}")
-            return None
\ No newline at end of file
+            return [None] * len(eye_pairs)
+
+    def predict_gaze(self, left_eye, right_eye):
+        """시선 방향 예측 - 두 눈을 (2, 1, 36, 60) 배치 하나로 처리"""
+        return self.predict_gaze_batch([(left_eye, right_eye)])[0]
@@ -7,6 +7,22 @@ let startTime;
 let mediaRecorder;
 let audioChunks = [];
 let audioResult = null;
+let sessionId = null;
+
+// WebSocket 시선 스트림
+const STREAM_FPS = 20;
+const STREAM_MAX_IN_FLIGHT = 2;
+let gazeSocket = null;
+
+// 서버가 알려주는 프레임 해상도/JPEG 품질 (/frame_profile, 서버 부하에 따라 변경)
+const FRAME_PROFILE_REFRESH_MS = 5000;
+let frameProfile = { max_width: 480, max_height: 360, jpeg_quality: 0.7 };
+let frameProfileTimer = null;
+
+// 스트리밍 음성 인식 (녹음 중 16kHz PCM16 청크 업로드, 실패 시 녹음 후 일괄 업로드)
+const SPEECH_SAMPLE_RATE = 16000;
+const SPEECH_CHUNK_SAMPLES = SPEECH_SAMPLE_RATE;  // 1초마다 전송
+let speechStream = null;
 
 // 다중 이야기 시스템
 let currentStory = 0;
@@ -92,6 +108,12 @@ function setupEventListeners() {
     console.log('[INFO] 이벤트 리스너 설정 완료');
 }
 
+// 세션 헤더 (동시 진단 세션 구분)
+function sessionHeaders(headers = {}) {
+    if (sessionId) headers['X-Session-Id'] = sessionId;
+    return headers;
+}
+
 // 상태 업데이트
 function updateStatus(message, type = 'info') {
     el.status.textContent = message;
@@ -129,12 +151,14 @@ async function initializeSystem() {
         
         const response = await fetch('/init_tracker', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' }
+            headers: sessionHeaders({ 'Content-Type': 'application/json' })
         });
         
         const result = await response.json();
         
         if (result.status === 'success') {
+            sessionId = result.session_id;
+            refreshFrameProfile();
             updateStatus('초기화 완료! 보정을 시작하세요.', 'success');
             el.calibrateBtn.disabled = false;
         } else {
@@ -203,15 +227,12 @@ function showCalibrationPoint() {
 // 보정 실행
 async function performCalibration(targetX, targetY) {
     try {
-        const frameData = captureFrame();
-        const response = await fetch('/calibrate', {
+        const frameBlob = await captureFrame();
+        const params = new URLSearchParams({ target_x: targetX, target_y: targetY });
+        const response = await fetch(`/calibrate?${params}`, {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                frame: frameData,
-                target_x: targetX,
-                target_y: targetY
-            })
+            headers: sessionHeaders({ 'Content-Type': 'image/jpeg' }),
+            body: frameBlob
         });
         
         const result = await response.json();
@@ -221,10 +242,31 @@ async function performCalibration(targetX, targetY) {
     }
 }
 
-// 프레임 캡처
+// 서버 권장 프레임 프로파일 조회
+async function refreshFrameProfile() {
+    try {
+        const response = await fetch('/frame_profile', { headers: sessionHeaders() });
+        const result = await response.json();
+        if (result.status === 'success') {
+            frameProfile = result.profile;
+        }
+    } catch (error) {
+        console.error('프레임 프로파일 조회 오류:', error);
+    }
+}
+
+// 프레임 캡처 (base64 대신 JPEG Blob 그대로 전송)
 function captureFrame() {
-    ctx.drawImage(video, 0, 0, canvas.width, canvas.height);
-    return canvas.toDataURL('image/jpeg', 0.8);
+    // 서버 프로파일 크기 안으로 축소 (키우지는 않음)
+    const scale = Math.min(1, frameProfile.max_width / video.videoWidth, frameProfile.max_height / video.videoHeight);
+    const width = Math.round(video.videoWidth * scale);
+    const height = Math.round(video.videoHeight * scale);
+    if (canvas.width !== width || canvas.height !== height) {
+        canvas.width = width;
+        canvas.height = height;
+    }
+    ctx.drawImage(video, 0, 0, width, height);
+    return new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', frameProfile.jpeg_quality));
 }
 
 // 추적 시작
@@ -232,7 +274,7 @@ async function startTracking() {
     try {
         const response = await fetch('/start_tracking', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' }
+            headers: sessionHeaders({ 'Content-Type': 'application/json' })
         });
         
         const result = await response.json();
@@ -253,6 +295,8 @@ async function startTracking() {
             el.audioSection.style.display = 'block';  // 음성 섹션 바로 표시
             
             showCurrentStory();
+            refreshFrameProfile();
+            frameProfileTimer = setInterval(refreshFrameProfile, FRAME_PROFILE_REFRESH_MS);
             startGazeTracking();
             
             // 20초 후 다음 버튼 표시
@@ -302,31 +346,78 @@ function nextStory() {
     }
 }
 
-// 시선 추적 루프
+// 시선 추적 결과 처리
+function handleTrackingResult(result) {
+    if (result.status === 'success') {
+        // 현재 이야기 정보 추가
+        result.story = currentStory + 1;
+        result.timestamp = Date.now();
+        
+        // 전체 데이터에 추가
+        allTrackingData.push(result);
+        
+        updateTrackingInfo(result);
+    }
+}
+
+// 시선 추적 루프 (WebSocket 우선, 실패 시 HTTP 폴링)
 function startGazeTracking() {
+    if (!('WebSocket' in window)) {
+        startHttpGazeTracking();
+        return;
+    }
+    
+    const protocol = location.protocol === 'https:' ? 'wss:' : 'ws:';
+    const socket = new WebSocket(`${protocol}//${location.host}/ws/track_gaze?session_id=${sessionId}`);
+    let opened = false;
+    let sent = 0;
+    let answered = 0;
+    let dropped = 0;
+    
+    socket.onopen = () => {
+        opened = true;
+        gazeSocket = socket;
+        // 응답을 기다리는 프레임이 많으면 새 프레임을 보내지 않음 (백프레셔)
+        trackingInterval = setInterval(async () => {
+            if (!isTracking || sent - answered - dropped >= STREAM_MAX_IN_FLIGHT) return;
+            sent++;
+            const frameBlob = await captureFrame();
+            if (socket.readyState === WebSocket.OPEN) {
+                socket.send(frameBlob);
+            }
+        }, 1000 / STREAM_FPS);
+    };
+    
+    socket.onmessage = (event) => {
+        const result = JSON.parse(event.data);
+        // 서버가 버린 프레임은 응답이 오지 않으므로 대기 수에서 제외
+        answered++;
+        dropped = result.dropped || 0;
+        handleTrackingResult(result);
+    };
+    
+    socket.onclose = () => {
+        gazeSocket = null;
+        if (!opened && isTracking) {
+            console.log('[INFO] WebSocket 사용 불가, HTTP 추적으로 전환');
+            startHttpGazeTracking();
+        }
+    };
+}
+
+function startHttpGazeTracking() {
     trackingInterval = setInterval(async () => {
         if (!isTracking) return;
         
         try {
-            const frameData = captureFrame();
+            const frameBlob = await captureFrame();
             const response = await fetch('/track_gaze', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ frame: frameData })
+                headers: sessionHeaders({ 'Content-Type': 'image/jpeg' }),
+                body: frameBlob
             });
             
-            const result = await response.json();
-            
-            if (result.status === 'success') {
-                // 현재 이야기 정보 추가
-                result.story = currentStory + 1;
-                result.timestamp = Date.now();
-                
-                // 전체 데이터에 추가
-                allTrackingData.push(result);
-                
-                updateTrackingInfo(result);
-            }
+            handleTrackingResult(await response.json());
         } catch (error) {
             console.error('추적 오류:', error);
         }
@@ -358,8 +449,16 @@ async function stopTracking() {
     if (trackingInterval) {
         clearInterval(trackingInterval);
     }
+    if (frameProfileTimer) {
+        clearInterval(frameProfileTimer);
+        frameProfileTimer = null;
+    }
+    if (gazeSocket) {
+        gazeSocket.close();
+        gazeSocket = null;
+    }
     
-    await fetch('/stop_tracking', { method: 'POST' });
+    await fetch('/stop_tracking', { method: 'POST', headers: sessionHeaders() });
     
     updateStatus('추적 중지. 음성 녹음을 진행하세요.', 'info');
     el.startTrackingBtn.disabled = false;
@@ -371,19 +470,23 @@ async function stopTracking() {
 async function startRecording() {
     try {
         const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
-        mediaRecorder = new MediaRecorder(stream);
-        audioChunks = [];
-        
-        mediaRecorder.ondataavailable = (event) => {
-            audioChunks.push(event.data);
-        };
         
-        mediaRecorder.onstop = async () => {
-            const audioBlob = new Blob(audioChunks, { type: 'audio/wav' });
-            await analyzeAudio(audioBlob);
-        };
-        
-        mediaRecorder.start();
+        if (!(await startSpeechStream(stream))) {
+            // 스트리밍을 쓸 수 없으면 기존 방식: 녹음 후 파일 업로드
+            mediaRecorder = new MediaRecorder(stream);
+            audioChunks = [];
+            
+            mediaRecorder.ondataavailable = (event) => {
+                audioChunks.push(event.data);
+            };
+            
+            mediaRecorder.onstop = async () => {
+                const audioBlob = new Blob(audioChunks, { type: 'audio/wav' });
+                await analyzeAudio(audioBlob);
+            };
+            
+            mediaRecorder.start();
+        }
         
         el.startRecordBtn.disabled = true;
         el.stopRecordBtn.disabled = false;
@@ -397,13 +500,138 @@ async function startRecording() {
 
 // 녹음 중지
 function stopRecording() {
-    if (mediaRecorder && mediaRecorder.state === 'recording') {
+    if (speechStream) {
+        finishSpeechStream();
+    } else if (mediaRecorder && mediaRecorder.state === 'recording') {
         mediaRecorder.stop();
+    } else {
+        return;
+    }
+    
+    el.startRecordBtn.disabled = false;
+    el.stopRecordBtn.disabled = true;
+    el.recordingStatus.textContent = '🔄 분석 중...';
+    updateStatus('음성 분석 중...', 'info');
+}
+
+// 스트리밍 음성 인식 시작 - 마이크 입력을 16kHz PCM16으로 변환해 1초씩 전송
+// 리샘플은 16kHz AudioContext가 (저역 통과 필터를 거쳐) 처리하므로 여기서는 형 변환만 한다
+async function startSpeechStream(mediaStream) {
+    const AudioContextClass = window.AudioContext || window.webkitAudioContext;
+    if (!AudioContextClass) return false;
+    
+    let audioContext = null;
+    try {
+        audioContext = new AudioContextClass({ sampleRate: SPEECH_SAMPLE_RATE });
+        if (audioContext.sampleRate !== SPEECH_SAMPLE_RATE) {
+            // 16kHz 컨텍스트를 지원하지 않는 브라우저 - 녹음 후 일괄 업로드 사용
+            audioContext.close();
+            return false;
+        }
         
-        el.startRecordBtn.disabled = false;
-        el.stopRecordBtn.disabled = true;
-        el.recordingStatus.textContent = '🔄 분석 중...';
-        updateStatus('음성 분석 중...', 'info');
+        const response = await fetch('/speech_stream/start', { method: 'POST', headers: sessionHeaders() });
+        const result = await response.json();
+        if (result.status !== 'success') {
+            audioContext.close();
+            return false;
+        }
+        
+        const source = audioContext.createMediaStreamSource(mediaStream);
+        const state = {
+            id: result.stream_id,
+            mediaStream, audioContext, source,
+            processor: null,
+            buffer: new Int16Array(SPEECH_CHUNK_SAMPLES),
+            length: 0,
+            sending: Promise.resolve()
+        };
+        
+        if (audioContext.audioWorklet) {
+            await audioContext.audioWorklet.addModule('/static/js/pcm_capture_worklet.js');
+            state.processor = new AudioWorkletNode(audioContext, 'pcm-capture', { numberOfOutputs: 0 });
+            state.processor.port.onmessage = (event) => pushSpeechSamples(state, event.data);
+            source.connect(state.processor);
+        } else {
+            // AudioWorklet이 없는 구형 브라우저
+            state.processor = audioContext.createScriptProcessor(4096, 1, 1);
+            state.processor.onaudioprocess = (event) => pushSpeechSamples(state, event.inputBuffer.getChannelData(0));
+            source.connect(state.processor);
+            state.processor.connect(audioContext.destination);
+        }
+        
+        speechStream = state;
+        return true;
+    } catch (error) {
+        console.error('스트리밍 음성 인식 시작 실패:', error);
+        if (audioContext) audioContext.close();
+        speechStream = null;
+        return false;
+    }
+}
+
+// 16kHz float 샘플을 PCM16 버퍼에 모으고 1초가 차면 전송
+function pushSpeechSamples(state, input) {
+    if (speechStream !== state) return;
+    for (let i = 0; i < input.length; i++) {
+        const sample = Math.max(-1, Math.min(1, input[i]));
+        state.buffer[state.length++] = sample < 0 ? sample * 0x8000 : sample * 0x7fff;
+        if (state.length === state.buffer.length) sendSpeechChunk(state);
+    }
+}
+
+// 모인 PCM 청크 전송 (순서 보장을 위해 이전 전송 뒤에 연결)
+function sendSpeechChunk(state) {
+    if (state.length === 0) return state.sending;
+    const chunk = state.buffer.slice(0, state.length);
+    state.length = 0;
+    
+    state.sending = state.sending.then(async () => {
+        try {
+            const response = await fetch(`/speech_stream/${state.id}/chunk`, {
+                method: 'POST',
+                headers: sessionHeaders({ 'Content-Type': 'application/octet-stream' }),
+                body: chunk.buffer
+            });
+            const result = await response.json();
+            if (result.status === 'success' && result.partial.transcript && speechStream === state) {
+                el.recordingStatus.textContent = `🔴 녹음 중... ${result.partial.transcript}`;
+            }
+        } catch (error) {
+            console.error('음성 청크 전송 오류:', error);
+        }
+    });
+    return state.sending;
+}
+
+// 녹음 종료 - 남은 청크 전송 후 최종 결과 (대부분 이미 인식되어 있음)
+async function finishSpeechStream() {
+    const state = speechStream;
+    speechStream = null;
+    
+    state.processor.disconnect();
+    state.source.disconnect();
+    state.mediaStream.getTracks().forEach(track => track.stop());
+    state.audioContext.close();
+    
+    try {
+        await sendSpeechChunk(state);
+        const response = await fetch(`/speech_stream/${state.id}/finish`, {
+            method: 'POST',
+            headers: sessionHeaders()
+        });
+        const result = await response.json();
+        
+        if (result.status === 'success') {
+            audioResult = result.result;
+            el.recordingStatus.textContent = '✅ 분석 완료';
+            updateStatus('음성 분석 완료!', 'success');
+        } else {
+            el.recordingStatus.textContent = '❌ 분석 실패';
+            updateStatus('음성 분석 실패', 'error');
+        }
+    } catch (error) {
+        el.recordingStatus.textContent = '❌ 오류';
+        updateStatus('음성 분석 오류', 'error');
     }
 }
 
@@ -413,14 +641,22 @@ async function analyzeAudio(audioBlob) {
         const formData = new FormData();
         formData.append('audio', audioBlob, 'recording.wav');
         
-        const response = await fetch('/analyze_audio', {
+        // 작업 등록 후 결과를 롱폴링으로 조회 (분석 중에도 시선 추적 응답 유지)
+        const submitResponse = await fetch('/analyze_audio/jobs', {
             method: 'POST',
+            headers: sessionHeaders(),
             body: formData
         });
         
-        const result = await response.json();
+        let result = await submitResponse.json();
+        while (result.status === 'success' && ['queued', 'running'].includes(result.job_status)) {
+            const pollResponse = await fetch(`/analyze_audio/jobs/${result.job_id}?wait=10`, {
+                headers: sessionHeaders()
+            });
+            result = await pollResponse.json();
+        }
         
-        if (result.status === 'success') {
+        if (result.status === 'success' && result.job_status === 'done') {
             audioResult = result.result;
             el.recordingStatus.textContent = '✅ 분석 완료';
             updateStatus('음성 분석 완료!', 'success');
@@ -450,7 +686,7 @@ async function generateReport() {
         
         const response = await fetch('/generate_report', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: sessionHeaders({ 'Content-Type': 'application/json' }),
             body: JSON.stringify({
                 child_name: childName,
                 user_id: userId,
@@ -486,7 +722,8 @@ function analyzeCombinedData() {
     });
     
     const avgConfidence = totalConfidence / allTrackingData.length;
-    const totalTime = allTrackingData.length * 0.5; // 0.5초 간격
+    // 전송 주기가 가변(WebSocket/HTTP)이므로 실제 타임스탬프 사용
+    const totalTime = (allTrackingData[allTrackingData.length - 1].timestamp - allTrackingData[0].timestamp) / 1000;
     
     return {
         directions,
@@ -611,11 +848,13 @@ async function downloadPDFReport() {
             audio_result: audioData
         });
         
+        // PDF를 base64(JSON) 대신 application/pdf 스트림으로 직접 받음
         const response = await fetch('/download_pdf_report', {
             method: 'POST',
-            headers: {
+            headers: sessionHeaders({
                 'Content-Type': 'application/json',
-            },
+                'Accept': 'application/pdf'
+            }),
             body: JSON.stringify({
                 child_name: childName,
                 user_id: userId,
@@ -624,49 +863,28 @@ async function downloadPDFReport() {
         });
         
         console.log('[DEBUG] 응답 상태:', response.status);
-        console.log('[DEBUG] 응답 헤더:', response.headers);
-        
-        // 🔥 응답을 텍스트로 먼저 받아서 확인
-        const responseText = await response.text();
-        console.log('[DEBUG] 응답 내용:', responseText);
         
-        // JSON 파싱 시도
-        let result;
-        try {
-            result = JSON.parse(responseText);
-            console.log('[DEBUG] 파싱된 JSON:', result);
-        } catch (parseError) {
-            console.error('[ERROR] JSON 파싱 실패:', parseError);
-            console.error('[ERROR] 응답 텍스트:', responseText);
-            throw new Error('서버 응답이 JSON 형식이 아닙니다');
-        }
-        
-        if (result.status === 'success') {
-            console.log('[DEBUG] PDF 데이터 길이:', result.pdf_data ? result.pdf_data.length : 'undefined');
-            
-            // Base64를 Blob으로 변환
-            const pdfData = atob(result.pdf_data);
-            const pdfArray = new Uint8Array(pdfData.length);
-            for (let i = 0; i < pdfData.length; i++) {
-                pdfArray[i] = pdfData.charCodeAt(i);
-            }
-            const pdfBlob = new Blob([pdfArray], { type: 'application/pdf' });
-            
-            // 다운로드
-            const downloadUrl = URL.createObjectURL(pdfBlob);
-            const downloadLink = document.createElement('a');
-            downloadLink.href = downloadUrl;
-            downloadLink.download = result.filename || 'report.pdf';
-            downloadLink.click();
-            
-            URL.revokeObjectURL(downloadUrl);
-            updateStatus('✅ PDF 다운로드 완료!', 'success');
-            
-        } else {
+        const contentType = response.headers.get('Content-Type') || '';
+        if (!contentType.startsWith('application/pdf')) {
+            // 오류는 JSON으로 반환됨
+            const result = await response.json();
             console.error('[ERROR] 서버 오류:', result.message);
             throw new Error(result.message || 'PDF 생성 실패');
         }
         
+        const pdfBlob = await response.blob();
+        console.log('[DEBUG] PDF 크기:', pdfBlob.size, 'Report ID:', response.headers.get('X-Report-Id'));
+        
+        // 다운로드
+        const downloadUrl = URL.createObjectURL(pdfBlob);
+        const downloadLink = document.createElement('a');
+        downloadLink.href = downloadUrl;
+        downloadLink.download = `${childName}_읽기진단리포트.pdf`;
+        downloadLink.click();
+        
+        URL.revokeObjectURL(downloadUrl);
+        updateStatus('✅ PDF 다운로드 완료!', 'success');
+        
     } catch (error) {
         console.error('[ERROR] PDF 다운로드 상세 오류:', error);
         updateStatus(`❌ PDF 생성 실패: ${error.message}`, 'error');
@@ -0,0 +1,27 @@
+// 마이크 입력 수집 AudioWorklet - AudioContext가 이미 16kHz이므로 리샘플 없이 모아서 전달
+// (128샘플 렌더 단위마다 메시지를 보내지 않고 100ms씩 묶어서 보냄)
+const BATCH_SAMPLES = 1600;
+
+class PcmCaptureProcessor extends AudioWorkletProcessor {
+    constructor() {
+        super();
+        this.batch = new Float32Array(BATCH_SAMPLES);
+        this.length = 0;
+    }
+
+    process(inputs) {
+        const input = inputs[0] && inputs[0][0];
+        if (!input) return true;
+        for (let i = 0; i < input.length; i++) {
+            this.batch[this.length++] = input[i];
+            if (this.length === BATCH_SAMPLES) {
+                this.port.postMessage(this.batch);
+                this.batch = new Float32Array(BATCH_SAMPLES);
+                this.length = 0;
+            }
+        }
+        return true;
+    }
+}
+
+registerProcessor('pcm-capture', PcmCaptureProcessor);
@@ -1,89 +1,129 @@
-import os
-import tempfile
-import time
-import uuid
 import random
 
+import numpy as np
+
+from utils.audio_decoding import AudioDecodeError, decode_audio, duration_seconds
+from utils.speech_features import SignalFeatures, timing_features
+from utils.speech_scoring import get_speech_scorer
+from utils.transcription_cache import compact_result, transcription_key
+
+# 이보다 짧은 녹음은 인식하지 않음 (디코딩된 샘플 길이 기준)
+MIN_AUDIO_SECONDS = 1.0
+DEFAULT_PROMPT = "다음은 한국어 음성입니다:"
+
 class AudioAnalyzer:
-    def __init__(self):
+    def __init__(self, model=None, load_model=True, min_duration=MIN_AUDIO_SECONDS, model_name='base',
+                 cache=None, scorer=None):
         self.use_dummy = True
+        self.scorer = scorer or get_speech_scorer()  # 어휘 자동자는 한 번만 생성
+        self.min_duration = min_duration
+        self.model_name = model_name
+        self.cache = cache  # TranscriptionCache (같은 녹음 재업로드 시 Whisper 생략)
+        
+        # 모델 레지스트리가 이미 로드한 Whisper 모델 공유
+        if model is not None:
+            self.model = model
+            self.use_dummy = False
+            return
+        if not load_model:
+            print("[INFO] Whisper 없음, 더미 모드")
+            return
         
         try:
-            import whisper
+            from utils.whisper_backends import create_whisper_backend
             print("[INFO] Whisper 모델 로딩...")
-            self.model = whisper.load_model("base", device="cpu")
+            self.model = create_whisper_backend('openai', model_name)
+            self.model_name = self.model.name
             self.use_dummy = False
             print("[INFO] Whisper 로드 성공")
         except Exception as e:
             print(f"[INFO] Whisper 없음, 더미 모드: {e}")
     
     def analyze(self, audio_file):
-        print(f"[DEBUG] 음성 파일 수신: {audio_file.filename}, 크기: {audio_file.content_length}")
+        """업로드 파일(FileStorage 등 read() 가능 객체) 또는 바이트를 메모리에서 디코딩해 분석"""
+        if isinstance(audio_file, (bytes, bytearray)):
+            data = bytes(audio_file)
+            print(f"[DEBUG] 음성 데이터 수신: {len(data)} bytes")
+        else:
+            data = audio_file.read()
+            print(f"[DEBUG] 음성 파일 수신: {audio_file.filename}, 크기: {len(data)} bytes")
         
         if self.use_dummy:
             print("[INFO] 더미 모드로 분석")
             return self._get_realistic_dummy()
         
-        temp_path = None
         try:
-            # 안전한 임시 파일 생성
-            temp_dir = tempfile.gettempdir()
-            safe_name = f"audio_{uuid.uuid4().hex[:8]}_{int(time.time())}.wav"
-            temp_path = os.path.join(temp_dir, safe_name)
-            
-            print(f"[DEBUG] 임시 파일 경로: {temp_path}")
-            
-            # 파일 저장
-            audio_file.save(temp_path)
-            time.sleep(0.5)  # 더 긴 대기
+            # 16kHz float32 배열로 디코딩 (임시 파일 없이 ffmpeg 파이프 / WAV 직접 파싱)
+            samples = decode_audio(data)
+            audio_duration = duration_seconds(samples)
+            print(f"[DEBUG] 디코딩된 오디오 길이: {audio_duration:.2f}초 ({len(samples)} 샘플)")
             
-            # 파일 크기 확인
-            file_size = os.path.getsize(temp_path)
-            print(f"[DEBUG] 저장된 파일 크기: {file_size} bytes")
-            
-            if file_size < 2000:  # 2KB 미만
-                print("[WARN] 파일이 너무 작음")
+            if audio_duration < self.min_duration:
+                print("[WARN] 오디오가 너무 짧음")
                 return self._get_short_audio_result()
             
             # Whisper 음성 인식 (더 관대한 설정)
             print("[DEBUG] Whisper 시작...")
-            result = self.model.transcribe(
-                temp_path,
-                language='ko',
-                task='transcribe',
-                fp16=False,
-                verbose=True,  # 디버그 정보 출력
-                initial_prompt="다음은 한국어 음성입니다:",  # 힌트 제공
-                temperature=0.0  # 더 확실한 결과
-            )
+            result = self.transcribe(samples)
             
             text = result.get('text', '').strip()
             print(f"[DEBUG] Whisper 결과: '{text}'")
             
-            if not text or len(text) < 3:
-                print("[WARN] 인식된 텍스트가 너무 짧음")
-                return self._get_short_audio_result()
-            
-            # 분석 수행
-            analysis = self._analyze_korean_speech(text, result)
+            # 음량/피치는 디코딩된 파형에서 한 번에 계산
+            signal = SignalFeatures().add(samples).summary()
+            analysis = self.build_result(text, result, audio_duration, signal)
             print(f"[SUCCESS] 실제 음성 분석 완료")
             return analysis
             
+        except AudioDecodeError as e:
+            print(f"[ERROR] 오디오 디코딩 실패: {e}")
+            return self._get_error_result(str(e))
         except Exception as e:
             print(f"[ERROR] 음성 분석 실패: {e}")
             import traceback
             traceback.print_exc()
             return self._get_error_result(str(e))
-            
-        finally:
-            # 안전한 파일 삭제
-            if temp_path and os.path.exists(temp_path):
-                try:
-                    time.sleep(0.2)
-                    os.remove(temp_path)
-                    print(f"[DEBUG] 임시 파일 삭제됨")
-                except Exception as del_error:
-                    print(f"[WARN] 파일 삭제 실패: {del_error}")
+    
+    def transcribe(self, samples, initial_prompt=None, verbose=False):
+        """16kHz float32 배열 음성 인식 - Whisper transcribe 결과(dict) 반환
+
+        initial_prompt: 스트리밍에서는 직전 구간 문장 (없으면 기본 한국어 힌트)
+        """
+        if self.use_dummy:
+            return {'text': '', 'segments': []}
+        options = {
+            'language': 'ko',
+            'task': 'transcribe',
+            'fp16': False,
+            'initial_prompt': initial_prompt or DEFAULT_PROMPT,  # 힌트 제공
+            'temperature': 0.0,  # 더 확실한 결과
+            'word_timestamps': True  # 쉼/반복 분석용 단어 시각
+        }
+        
+        key = None
+        if self.cache is not None:
+            samples = np.ascontiguousarray(samples, dtype=np.float32)
+            key = transcription_key(samples, self.model_name, options)
+            cached = self.cache.get(key)
+            if cached is not None:
+                print(f"[DEBUG] 인식 캐시 적중: {key[:12]}")
+                return cached
+        
+        result = self.model.transcribe(samples, verbose=verbose or None, **options)  # verbose: 세그먼트별 출력
+        if key is not None:
+            result = compact_result(result)
+            self.cache.put(key, result)
+        return result
+    
+    def build_result(self, text, whisper_result, audio_duration=None, signal_features=None):
+        """인식 텍스트로 분석 결과 생성 - 너무 짧으면 짧은 음성 결과
+
+        signal_features: SignalFeatures.summary() (없으면 speech_features는 기본값)
+        """
+        if not text or len(text) < 3:
+            print("[WARN] 인식된 텍스트가 너무 짧음")
+            return self._get_short_audio_result()
+        return self._analyze_korean_speech(text, whisper_result, audio_duration, signal_features)
     
     def _get_error_result(self, error_msg):
         """실제 오류 결과"""
@@ -104,19 +144,20 @@ class AudioAnalyzer:
             }
         }
     
-    def _analyze_korean_speech(self, text, whisper_result):
+    def _analyze_korean_speech(self, text, whisper_result, audio_duration=None, signal_features=None):
         """한국어 음성 분석"""
-        # 기본 정보
-        word_count = len([w for w in text.split() if w.strip()])
+        # 기본 정보 (문자 분류는 한 번에)
+        stats = self.scorer.text_stats(text)
+        word_count = stats['words']
         duration = whisper_result.get('segments', [{}])
-        total_duration = duration[-1].get('end', 5.0) if duration else 5.0
+        fallback_duration = audio_duration or 5.0
+        total_duration = duration[-1].get('end', fallback_duration) if duration else fallback_duration
         
         speaking_rate = (word_count / total_duration * 60) if total_duration > 0 else 60
         
         # 발음 명확도 (한국어 문자 비율 + Whisper 품질)
-        korean_chars = len([c for c in text if '\uac00' <= c <= '\ud7a3'])
-        total_chars = len(text.replace(' ', ''))
-        korean_ratio = korean_chars / total_chars if total_chars > 0 else 0
+        total_chars = stats['non_space']
+        korean_ratio = stats['hangul'] / total_chars if total_chars > 0 else 0
         
         base_clarity = 40 + (korean_ratio * 40)  # 40-80%
         
@@ -129,20 +170,22 @@ class AudioAnalyzer:
         
         pronunciation_clarity = max(50, min(95, base_clarity))
         
-        # 유창성 (말하기 속도 + 텍스트 완성도)
+        # 유창성 (말하기 속도 + 텍스트 완성도 - 긴 쉼/반복/간투사 감점)
+        timing = timing_features(segments)
         speed_score = 70 if 80 <= speaking_rate <= 180 else 50
         
         # 문장 완성도 보너스
         sentence_bonus = 0
-        if '.' in text or '!' in text or '?' in text:
+        if stats['sentence_marks']:
             sentence_bonus += 10
-        if len(text) > 15:
+        if stats['length'] > 15:
             sentence_bonus += 10
         
-        fluency = min(95, speed_score + sentence_bonus)
+        disfluency_penalty = min(30, 3 * timing['long_pauses'] + 2 * timing['repetitions'] + 2 * timing['fillers'])
+        fluency = max(30, min(95, speed_score + sentence_bonus - disfluency_penalty))
         
         # 이해도 (내용 분석)
-        comprehension = self._calculate_comprehension(text, pronunciation_clarity, fluency)
+        comprehension = self.scorer.comprehension(text, stats, pronunciation_clarity, fluency)
         
         return {
             'transcription': text,
@@ -152,7 +195,8 @@ class AudioAnalyzer:
             'pronunciation_clarity': f"{pronunciation_clarity:.1f}%",
             'fluency': f"{fluency:.1f}%",
             'comprehension': f"{comprehension:.1f}%",
-            'speech_features': {
+            'timing': timing,
+            'speech_features': signal_features or {
                 'avg_pitch': 150.0,
                 'pitch_variation': 25.0,
                 'avg_volume': 0.1,
@@ -161,32 +205,6 @@ class AudioAnalyzer:
             }
         }
     
-    def _calculate_comprehension(self, text, clarity, fluency):
-        """이해도 계산 - 내용 기반"""
-        base_score = (clarity + fluency) / 2
-        
-        # 독서 관련 키워드 분석
-        reading_keywords = [
-            '독서', '책', '읽', '이야기', '내용', '생각', '느낌',
-            '재미', '흥미', '배우', '알', '좋', '재밌', '신기',
-            '등장인물', '주인공', '줄거리', '문장', '단어', '의미'
-        ]
-        
-        keyword_count = sum(1 for keyword in reading_keywords if keyword in text)
-        content_bonus = min(20, keyword_count * 3)
-        
-        # 문장 구조 분석
-        structure_bonus = 0
-        if len(text) > 20:
-            structure_bonus += 5
-        if any(punct in text for punct in '.!?'):
-            structure_bonus += 5
-        if '그래서' in text or '왜냐하면' in text or '하지만' in text:
-            structure_bonus += 5  # 연결어 사용
-        
-        comprehension = base_score + content_bonus + structure_bonus
-        return max(30, min(95, comprehension))
-    
     def _get_realistic_dummy(self):
         """현실적인 더미 결과"""
         dummy_responses = [
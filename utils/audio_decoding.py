@@ -0,0 +1,80 @@
+import io
+import subprocess
+import wave
+
+import numpy as np
+
+# Whisper 입력 형식: 16kHz 모노 float32 [-1, 1]
+SAMPLE_RATE = 16000
+FFMPEG_TIMEOUT_SECONDS = 30
+
+
+class AudioDecodeError(ValueError):
+    """업로드 오디오를 디코딩할 수 없음"""
+
+
+def _pcm16_to_float32(data):
+    return np.frombuffer(data, np.int16).astype(np.float32) * (1.0 / 32768.0)
+
+
+def _resample(samples, source_rate, target_rate=SAMPLE_RATE):
+    """선형 보간 리샘플 (WAV 빠른 경로 전용 - 음성 인식에는 충분)"""
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    count = int(round(len(samples) * target_rate / source_rate))
+    positions = np.arange(count, dtype=np.float64) * (source_rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def decode_wav(data, sample_rate=SAMPLE_RATE):
+    """16비트 PCM WAV는 ffmpeg 없이 메모리에서 바로 디코딩 - 형식이 다르면 None"""
+    if data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        return None
+    try:
+        with wave.open(io.BytesIO(data)) as wav:
+            if wav.getsampwidth() != 2:
+                return None
+            channels = wav.getnchannels()
+            rate = wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+
+    samples = _pcm16_to_float32(frames)
+    if channels > 1:
+        samples = samples[:len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+    return _resample(samples, rate, sample_rate)
+
+
+def decode_with_ffmpeg(data, sample_rate=SAMPLE_RATE, timeout=FFMPEG_TIMEOUT_SECONDS):
+    """ffmpeg 파이프로 디코딩 - stdin으로 업로드 바이트, stdout으로 16비트 PCM (임시 파일 없음)"""
+    command = [
+        'ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error', '-threads', '0',
+        '-i', 'pipe:0',
+        '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(sample_rate),
+        'pipe:1'
+    ]
+    try:
+        completed = subprocess.run(command, input=data, capture_output=True, timeout=timeout, check=False)
+    except FileNotFoundError:
+        raise AudioDecodeError("ffmpeg를 찾을 수 없습니다")
+    except subprocess.TimeoutExpired:
+        raise AudioDecodeError("오디오 디코딩 시간 초과")
+    if completed.returncode != 0:
+        message = completed.stderr.decode('utf-8', 'replace').strip()
+        raise AudioDecodeError(f"오디오 디코딩 실패: {message[-200:]}")
+    return _pcm16_to_float32(completed.stdout)
+
+
+def decode_audio(data, sample_rate=SAMPLE_RATE):
+    """업로드 바이트(wav/webm/ogg 등)를 16kHz 모노 float32 배열로 디코딩"""
+    if not data:
+        return np.zeros(0, dtype=np.float32)
+    samples = decode_wav(data, sample_rate)
+    if samples is None:
+        samples = decode_with_ffmpeg(data, sample_rate)
+    return samples
+
+
+def duration_seconds(samples, sample_rate=SAMPLE_RATE):
+    return len(samples) / sample_rate
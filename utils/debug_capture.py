@@ -0,0 +1,69 @@
+import os
+import random
+import threading
+import time
+
+import cv2
+
+
+class DebugCaptureSink:
+    """디버그용 프레임 저장소 - 샘플링 + 저장 간격 제한 + 파일 개수 제한
+
+    운영 중에도 켜 둘 수 있도록 프레임마다 디스크에 쓰지 않고,
+    sample_rate 확률로 고른 프레임을 min_interval초에 한 번까지만 저장한다.
+    """
+
+    def __init__(self, directory, sample_rate=0.01, min_interval=5.0, max_files=100, jpeg_quality=80):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.min_interval = min_interval
+        self.max_files = max_files
+        self.jpeg_quality = jpeg_quality
+        self.saved = 0
+        self.skipped = 0
+        self._last_saved = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _next_slot(self):
+        """저장할 차례면 파일 슬롯 번호, 아니면 None"""
+        if random.random() >= self.sample_rate:
+            return None
+        with self._lock:
+            now = time.time()
+            if now - self._last_saved < self.min_interval:
+                return None
+            self._last_saved = now
+            # 파일 이름을 순환시켜 디스크 사용량을 max_files개로 제한
+            slot = self.saved % self.max_files
+            self.saved += 1
+            return slot
+
+    def capture(self, frame, tag='frame'):
+        """조건을 만족하면 프레임을 JPEG로 저장 - 저장한 경로 또는 None"""
+        slot = self._next_slot()
+        if slot is None:
+            self.skipped += 1
+            return None
+
+        path = os.path.join(self.directory, f"{tag}_{slot:04d}.jpg")
+        try:
+            cv2.imwrite(path, frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            print(f"[DEBUG] 디버그 프레임 저장: {path}")
+            return path
+        except Exception as e:
+            print(f"[WARN] 디버그 프레임 저장 실패: {e}")
+            return None
+
+
+def create_debug_capture_sink():
+    """DEBUG_CAPTURE_DIR이 설정된 경우에만 캡처 사용 (기본 꺼짐)"""
+    directory = os.environ.get('DEBUG_CAPTURE_DIR')
+    if not directory:
+        return None
+    return DebugCaptureSink(
+        directory,
+        sample_rate=float(os.environ.get('DEBUG_CAPTURE_SAMPLE_RATE', 0.01)),
+        min_interval=float(os.environ.get('DEBUG_CAPTURE_MIN_INTERVAL', 5)),
+        max_files=int(os.environ.get('DEBUG_CAPTURE_MAX_FILES', 100))
+    )
@@ -1,9 +1,36 @@
 import cv2
 import mediapipe as mp
 import numpy as np
+import threading
+
+from utils.debug_capture import create_debug_capture_sink
+from utils.landmarks import (
+    LEFT_EYE_INDICES, RIGHT_EYE_INDICES, landmarks_to_array, eye_bbox, crop_view, face_center
+)
+
+HAAR_CASCADE_PATH = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+
+_face_cascade = None
+_face_cascade_lock = threading.Lock()
+
+
+def get_face_cascade():
+    """Haar 얼굴 검출기 (프로세스당 1회 로드)"""
+    global _face_cascade
+    if _face_cascade is None:
+        with _face_cascade_lock:
+            if _face_cascade is None:
+                _face_cascade = cv2.CascadeClassifier(HAAR_CASCADE_PATH)
+    return _face_cascade
+
 
 class FaceDetector:
-    def __init__(self):
+    def __init__(self, debug=False, capture_sink=None):
+        # debug=False(운영 모드): 프레임별 로그/디스크 저장 없음
+        self.debug = debug
+        # 디버그 프레임은 샘플링/간격 제한이 있는 캡처 저장소로만 기록 (기본 꺼짐)
+        self.capture_sink = capture_sink if capture_sink is not None else create_debug_capture_sink()
+
         self.mp_face_mesh = mp.solutions.face_mesh
         # MediaPipe 설정 - 매우 민감하게
         self.face_mesh = self.mp_face_mesh.FaceMesh(
@@ -13,128 +40,97 @@ class FaceDetector:
             min_detection_confidence=0.1,  # 매우 낮춤 - 더 민감
             min_tracking_confidence=0.1    # 매우 낮춤 - 더 민감
         )
+        self._lenient_face_mesh = None
+        self.face_cascade = get_face_cascade()
         
         # 눈 영역 랜드마크 인덱스 (MediaPipe FaceMesh)
-        self.left_eye_indices = [33, 7, 163, 144, 145, 153, 154, 155, 133, 173, 157, 158, 159, 160, 161, 246]
-        self.right_eye_indices = [362, 382, 381, 380, 374, 373, 390, 249, 263, 466, 388, 387, 386, 385, 384, 398]
+        self.left_eye_indices = LEFT_EYE_INDICES
+        self.right_eye_indices = RIGHT_EYE_INDICES
+
+    def _log(self, message):
+        if self.debug:
+            print(f"[DEBUG] {message}")
+
+    def _capture(self, frame, tag):
+        if self.capture_sink is not None:
+            self.capture_sink.capture(frame, tag)
+
+    @property
+    def lenient_face_mesh(self):
+        """관대한 설정의 대체 FaceMesh - 처음 필요할 때 한 번만 생성"""
+        if self._lenient_face_mesh is None:
+            self._lenient_face_mesh = self.mp_face_mesh.FaceMesh(
+                static_image_mode=True,  # static 모드로 변경
+                max_num_faces=1,
+                refine_landmarks=False,  # refine 끄기
+                min_detection_confidence=0.05,  # 더 낮춤
+                min_tracking_confidence=0.05
+            )
+        return self._lenient_face_mesh
     
     def extract_eyes(self, frame):
         """프레임에서 눈 영역 추출"""
         try:
-            print(f"[DEBUG] 입력 프레임 크기: {frame.shape}")
-            print(f"[DEBUG] 프레임 타입: {frame.dtype}, 최대값: {frame.max()}, 최소값: {frame.min()}")
-            
-            # 이미지 저장해서 확인 (디버깅용)
-            cv2.imwrite('debug_frame.jpg', frame)
-            print("[DEBUG] 이미지를 debug_frame.jpg로 저장했습니다")
+            self._log(f"입력 프레임 크기: {frame.shape}, 타입: {frame.dtype}")
+            self._capture(frame, 'input')
             
-            # 이미지 전처리 개선
-            if frame.shape[0] < 480 or frame.shape[1] < 640:
-                # 너무 작으면 크기 조정
-                frame = cv2.resize(frame, (640, 480))
-                print(f"[DEBUG] 프레임 크기 조정됨: {frame.shape}")
+            # 작은 프레임도 키우지 않음 - 클라이언트가 /frame_profile 해상도에 맞춰 보내고,
+            # 눈 크롭은 어차피 60x36으로 줄어듦
             
-            # OpenCV 얼굴 검출로 먼저 테스트
+            # OpenCV 얼굴 검출로 먼저 확인 (프로세스 공용 검출기)
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-            faces = face_cascade.detectMultiScale(gray, 1.1, 4)
-            print(f"[DEBUG] OpenCV로 검출된 얼굴 개수: {len(faces)}")
+            with _face_cascade_lock:
+                faces = self.face_cascade.detectMultiScale(gray, 1.1, 4)
+            self._log(f"OpenCV로 검출된 얼굴 개수: {len(faces)}")
             
             if len(faces) == 0:
-                print("[DEBUG] OpenCV도 얼굴을 찾지 못했습니다 - 이미지 품질 문제일 수 있습니다")
+                self._log("OpenCV도 얼굴을 찾지 못했습니다 - 이미지 품질 문제일 수 있습니다")
+                self._capture(frame, 'no_face')
                 return None, None, None
-            else:
-                print(f"[DEBUG] OpenCV는 얼굴을 찾았습니다: {faces}")
             
             # MediaPipe 시도
             # RGB 변환 (MediaPipe는 RGB 필요)
             rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            print(f"[DEBUG] RGB 변환 완료: {rgb_frame.shape}")
-            
             results = self.face_mesh.process(rgb_frame)
             
             if not results.multi_face_landmarks:
-                print("[DEBUG] MediaPipe에서 얼굴을 찾지 못했습니다")
-                
-                # MediaPipe 설정을 더 관대하게 변경
-                print("[DEBUG] MediaPipe 설정을 더 관대하게 변경...")
-                face_mesh_lenient = self.mp_face_mesh.FaceMesh(
-                    static_image_mode=True,  # static 모드로 변경
-                    max_num_faces=1,
-                    refine_landmarks=False,  # refine 끄기
-                    min_detection_confidence=0.05,  # 더 낮춤
-                    min_tracking_confidence=0.05
-                )
-                
-                results = face_mesh_lenient.process(rgb_frame)
+                # 관대한 설정의 대체 FaceMesh로 재시도
+                self._log("MediaPipe에서 얼굴을 찾지 못했습니다 - 관대한 설정으로 재시도")
+                results = self.lenient_face_mesh.process(rgb_frame)
                 
                 if not results.multi_face_landmarks:
-                    print("[DEBUG] 관대한 설정으로도 실패")
+                    self._log("관대한 설정으로도 실패")
+                    self._capture(frame, 'no_landmarks')
                     return None, None, None
-                else:
-                    print("[DEBUG] 관대한 설정으로 성공!")
-            
-            print(f"[DEBUG] 얼굴 {len(results.multi_face_landmarks)}개 검출됨")
             
             face_landmarks = results.multi_face_landmarks[0]
             h, w, _ = frame.shape
             
-            # 랜드마크를 픽셀 좌표로 변환
-            landmarks = []
-            for landmark in face_landmarks.landmark:
-                x = int(landmark.x * w)
-                y = int(landmark.y * h)
-                landmarks.append((x, y))
+            # 랜드마크를 (N, 2) 픽셀 좌표 배열로 변환
+            landmarks = landmarks_to_array(face_landmarks, w, h)
             
-            # 왼쪽 눈 영역 추출
+            # 왼쪽/오른쪽 눈 영역 추출 (프레임을 복사하지 않는 뷰)
             left_eye = self._extract_eye_region(frame, landmarks, self.left_eye_indices)
-            print(f"[DEBUG] 왼쪽 눈 크기: {left_eye.shape if left_eye is not None else 'None'}")
-            
-            # 오른쪽 눈 영역 추출
             right_eye = self._extract_eye_region(frame, landmarks, self.right_eye_indices)
-            print(f"[DEBUG] 오른쪽 눈 크기: {right_eye.shape if right_eye is not None else 'None'}")
             
             # 얼굴 중심점 계산
             face_center = self._get_face_center(landmarks)
-            print(f"[DEBUG] 얼굴 중심: {face_center}")
+            self._log(f"눈 크기: {None if left_eye is None else left_eye.shape}, "
+                      f"{None if right_eye is None else right_eye.shape}, 얼굴 중심: {face_center}")
             
             return left_eye, right_eye, face_center
             
         except Exception as e:
             print(f"Error extracting eyes: {e}")
-            import traceback
-            traceback.print_exc()
+            if self.debug:
+                import traceback
+                traceback.print_exc()
             return None, None, None
     
     def _extract_eye_region(self, frame, landmarks, eye_indices):
-        """특정 눈 영역 추출"""
+        """특정 눈 영역 추출 - 16개 눈 랜드마크의 바운딩 박스 뷰"""
         try:
-            # 눈 영역 좌표 추출
-            eye_points = [landmarks[i] for i in eye_indices]
-            
-            # 바운딩 박스 계산
-            x_coords = [p[0] for p in eye_points]
-            y_coords = [p[1] for p in eye_points]
-            
-            min_x, max_x = min(x_coords), max(x_coords)
-            min_y, max_y = min(y_coords), max(y_coords)
-            
-            # 여백 추가
-            margin = 10
-            min_x = max(0, min_x - margin)
-            min_y = max(0, min_y - margin)
-            max_x = min(frame.shape[1], max_x + margin)
-            max_y = min(frame.shape[0], max_y + margin)
-            
-            # 눈 영역 크롭
-            eye_region = frame[min_y:max_y, min_x:max_x]
-            
-            # 최소 크기 확인
-            if eye_region.shape[0] < 20 or eye_region.shape[1] < 20:
-                return None
-            
-            return eye_region
-            
+            return crop_view(frame, eye_bbox(landmarks, eye_indices, frame.shape))
         except Exception as e:
             print(f"Error extracting eye region: {e}")
             return None
@@ -142,12 +138,8 @@ class FaceDetector:
     def _get_face_center(self, landmarks):
         """얼굴 중심점 계산"""
         try:
-            # 얼굴 주요 점들의 평균으로 중심점 계산
-            key_points = [landmarks[i] for i in [10, 152, 234, 454]]  # 이마, 턱, 양 볼
-            center_x = sum(p[0] for p in key_points) // len(key_points)
-            center_y = sum(p[1] for p in key_points) // len(key_points)
-            return (center_x, center_y)
-        except:
+            return face_center(landmarks)
+        except Exception:
             return (0, 0)
     
     def draw_landmarks(self, frame, show_eyes=True):
@@ -162,10 +154,9 @@ class FaceDetector:
                 
                 if show_eyes:
                     # 눈 영역 표시
-                    for idx in self.left_eye_indices + self.right_eye_indices:
-                        landmark = face_landmarks.landmark[idx]
-                        x = int(landmark.x * w)
-                        y = int(landmark.y * h)
+                    landmarks = landmarks_to_array(face_landmarks, w, h)
+                    eye_indices = np.concatenate([self.left_eye_indices, self.right_eye_indices])
+                    for x, y in landmarks[eye_indices].tolist():
                         cv2.circle(frame, (x, y), 2, (0, 255, 0), -1)
             
             return frame
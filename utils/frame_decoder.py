@@ -0,0 +1,86 @@
+import base64
+import threading
+
+import cv2
+import numpy as np
+
+
+class FrameDecoder:
+    """요청 스트림에서 JPEG 프레임을 바로 디코딩 - 스레드별 버퍼 재사용"""
+
+    def __init__(self, initial_size=256 * 1024, max_size=16 * 1024 * 1024):
+        self.initial_size = initial_size
+        self.max_size = max_size
+        self._local = threading.local()
+
+    def _get_buffer(self, size):
+        """스레드별 재사용 버퍼 (부족할 때만 확장)"""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None or len(buffer) < size:
+            capacity = max(size, self.initial_size, len(buffer) * 2 if buffer else 0)
+            buffer = bytearray(min(capacity, self.max_size))
+            self._local.buffer = buffer
+        return buffer
+
+    def read_stream(self, stream, content_length=None):
+        """스트림을 재사용 버퍼로 읽기 - (버퍼, 읽은 바이트 수) 반환"""
+        buffer = self._get_buffer(content_length or self.initial_size)
+        readinto = getattr(stream, 'readinto', None)
+        size = 0
+
+        while True:
+            if size == len(buffer):
+                if size >= self.max_size:
+                    raise ValueError("프레임 크기 제한 초과")
+                # 길이를 모르는 스트림(chunked)이면 버퍼 확장
+                grown = self._get_buffer(size * 2)
+                grown[:size] = buffer[:size]
+                buffer = grown
+
+            view = memoryview(buffer)[size:]
+            if readinto is not None:
+                n = readinto(view)
+            else:
+                chunk = stream.read(len(view))
+                n = len(chunk)
+                view[:n] = chunk
+            view.release()
+
+            if not n:
+                break
+            size += n
+            if content_length is not None and size >= content_length:
+                break
+
+        return buffer, size
+
+    def encoded_from_stream(self, stream, content_length=None):
+        """업로드 스트림을 JPEG 바이트 배열로 읽기 (재사용 버퍼의 뷰, 비었으면 None)
+
+        같은 스레드에서 다음 프레임을 읽기 전까지만 유효하다.
+        """
+        buffer, size = self.read_stream(stream, content_length)
+        if size == 0:
+            return None
+        return np.frombuffer(buffer, np.uint8, count=size)
+
+    def encoded_from_data_url(self, frame_data):
+        """기존 JSON 경로용 data URL(base64)을 JPEG 바이트 배열로 변환"""
+        header, b64_data = frame_data.split(',', 1)
+        return np.frombuffer(base64.b64decode(b64_data), np.uint8)
+
+    def decode_encoded(self, encoded, flags=cv2.IMREAD_COLOR):
+        if encoded is None:
+            return None
+        return cv2.imdecode(encoded, flags)
+
+    def decode_stream(self, stream, content_length=None, flags=cv2.IMREAD_COLOR):
+        """업로드 스트림(raw image/jpeg, multipart 파일)에서 프레임 디코딩"""
+        return self.decode_encoded(self.encoded_from_stream(stream, content_length), flags)
+
+    def decode_bytes(self, data, flags=cv2.IMREAD_COLOR):
+        return cv2.imdecode(np.frombuffer(data, np.uint8), flags)
+
+    def decode_data_url(self, frame_data, flags=cv2.IMREAD_COLOR):
+        """기존 JSON 경로용 data URL(base64) 디코딩"""
+        return self.decode_encoded(self.encoded_from_data_url(frame_data), flags)
@@ -0,0 +1,118 @@
+import math
+import time
+
+import cv2
+
+from utils.metrics import metrics as default_metrics
+
+SKIP_REASONS = ('dark', 'bright', 'blurry', 'unchanged')
+# 썸네일 축소 배율 (IMREAD_REDUCED_GRAYSCALE_4)
+THUMBNAIL_SCALE = 4
+# 얼굴 바운딩 박스 중 눈이 있는 세로 구간 (위에서부터 비율)
+EYE_BAND = (0.2, 0.6)
+
+
+class PrefilterState:
+    """세션별 사전 필터 상태 - 직전 썸네일/결과"""
+
+    def __init__(self):
+        self.last_thumbnail = None
+        self.last_result = None
+        self.reused = 0
+
+
+class FramePrefilter:
+    """ML 파이프라인 전에 쓸모없는 프레임을 걸러내는 저비용 검사
+
+    JPEG를 1/4 크기 그레이스케일로만 디코딩(IMREAD_REDUCED_GRAYSCALE_4)해
+    밝기, 라플라시안 분산(흐림), 직전 프레임과의 차이를 본다.
+    너무 어둡거나 밝거나 흐린 프레임, 직전과 거의 같은 프레임은 추론을 건너뛰고
+    직전 결과를 재사용한다. 같은 결과는 max_reuse번까지만 연속 재사용한다.
+    변화 검사는 추적 중인 얼굴이 있으면 그 눈 구간만 비교한다 (머리는 그대로이고
+    눈동자만 움직일 때 전체 평균 차이에 묻히지 않도록).
+    """
+
+    def __init__(self, min_brightness=30, max_brightness=235, min_sharpness=15.0, min_change=1.5,
+                 max_reuse=10, cost_estimate=None, metrics=None):
+        self.min_brightness = min_brightness
+        self.max_brightness = max_brightness
+        self.min_sharpness = min_sharpness
+        self.min_change = min_change
+        self.max_reuse = max_reuse
+        # 건너뛴 프레임 하나가 아낀 시간(ms) 추정 함수
+        self.cost_estimate = cost_estimate or (lambda: 0.0)
+
+        registry = metrics or default_metrics
+        self._frames = registry.counter('prefilter.frames')
+        self._skipped = {reason: registry.counter(f"prefilter.skipped.{reason}") for reason in SKIP_REASONS}
+        self._skipped_total = registry.counter('prefilter.skipped')
+        self._time_saved_ms = registry.counter('prefilter.time_saved_ms')
+        self._check_ms = registry.histogram('prefilter.check_ms')
+        registry.gauge('prefilter.skip_ratio', self.skip_ratio)
+
+    def skip_ratio(self):
+        frames = self._frames.value
+        return round(self._skipped_total.value / frames, 4) if frames else 0.0
+
+    def thumbnail(self, encoded):
+        """JPEG 바이트에서 1/4 크기 그레이스케일 썸네일만 디코딩"""
+        return cv2.imdecode(encoded, cv2.IMREAD_REDUCED_GRAYSCALE_4)
+
+    @staticmethod
+    def _change_region(thumbnail, roi):
+        """변화 비교 영역 - roi(프레임 좌표 얼굴 박스)의 눈 구간, 없거나 비면 썸네일 전체"""
+        if roi is None:
+            return thumbnail
+        x0, y0, x1, y1 = roi
+        top = y0 + (y1 - y0) * EYE_BAND[0]
+        bottom = y0 + (y1 - y0) * EYE_BAND[1]
+        region = thumbnail[
+            int(top // THUMBNAIL_SCALE):math.ceil(bottom / THUMBNAIL_SCALE),
+            int(x0 // THUMBNAIL_SCALE):math.ceil(x1 / THUMBNAIL_SCALE)
+        ]
+        return region if region.size else thumbnail
+
+    def _classify(self, thumbnail, last_thumbnail, roi=None):
+        brightness = float(thumbnail.mean())
+        if brightness < self.min_brightness:
+            return 'dark'
+        if brightness > self.max_brightness:
+            return 'bright'
+        if cv2.Laplacian(thumbnail, cv2.CV_32F).var() < self.min_sharpness:
+            return 'blurry'
+        if last_thumbnail is not None and last_thumbnail.shape == thumbnail.shape:
+            current = self._change_region(thumbnail, roi)
+            previous = self._change_region(last_thumbnail, roi)
+            if current.shape == previous.shape and float(cv2.absdiff(current, previous).mean()) < self.min_change:
+                return 'unchanged'
+        return None
+
+    def check(self, state, encoded, roi=None):
+        """건너뛸 이유('dark', 'bright', 'blurry', 'unchanged') 또는 None(추론 필요)
+
+        roi: 추적 중인 얼굴 박스 (x0, y0, x1, y1, 원본 프레임 좌표) - 변화 검사 영역
+        재사용할 직전 결과가 없거나 연속 재사용 한도를 넘으면 None을 돌려준다.
+        """
+        start = time.perf_counter()
+        self._frames.inc()
+        thumbnail = self.thumbnail(encoded)
+        if thumbnail is None:
+            reason = None
+        else:
+            reason = self._classify(thumbnail, state.last_thumbnail, roi)
+            if reason != 'unchanged':
+                # 변화 비교 기준은 마지막으로 '달라졌던' 프레임 (서서히 바뀌는 경우 대비)
+                state.last_thumbnail = thumbnail
+
+        if reason is not None and (state.last_result is None or state.reused >= self.max_reuse):
+            reason = None
+        self._check_ms.observe((time.perf_counter() - start) * 1000)
+
+        if reason is None:
+            state.reused = 0
+            return None
+        state.reused += 1
+        self._skipped[reason].inc()
+        self._skipped_total.inc()
+        self._time_saved_ms.inc(self.cost_estimate())
+        return reason
@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+
+from utils.metrics import metrics as default_metrics
+
+# 검출기가 실제로 필요로 하는 입력 단계 (눈 크롭은 어차피 60x36으로 줄어듦)
+# 0: 여유 있을 때, 1: 기본, 2: 과부하 시
+DEFAULT_FRAME_LEVELS = (
+    {'max_width': 640, 'max_height': 480, 'jpeg_quality': 0.8},
+    {'max_width': 480, 'max_height': 360, 'jpeg_quality': 0.7},
+    {'max_width': 320, 'max_height': 240, 'jpeg_quality': 0.6},
+)
+
+
+class InFlightCounter:
+    """동시에 처리 중인 요청 수 (with 블록으로 증감)"""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        return self.value
+
+    def __enter__(self):
+        with self._lock:
+            self.value += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self.value -= 1
+        return False
+
+
+class FrameProfileController:
+    """클라이언트에 알려줄 프레임 해상도/JPEG 품질 결정
+
+    최근 시선 처리 p95 지연과 동시 처리 수를 보고 단계를 조정한다.
+    과부하면 한 단계 낮추고, 충분히 여유가 생기면 한 단계 올린다 (히스테리시스).
+    """
+
+    def __init__(self, latency_histogram, in_flight, levels=DEFAULT_FRAME_LEVELS, default_level=1,
+                 high_latency_ms=150, low_latency_ms=60, max_in_flight=8, eval_interval=2.0):
+        self.latency_histogram = latency_histogram
+        self.in_flight = in_flight
+        self.levels = levels
+        self.default_level = default_level
+        self.high_latency_ms = high_latency_ms
+        self.low_latency_ms = low_latency_ms
+        self.max_in_flight = max_in_flight
+        self.eval_interval = eval_interval
+        self.level = default_level
+        self.reason = 'default'
+        self._evaluated_at = 0.0
+        self._lock = threading.Lock()
+
+    def _evaluate_locked(self):
+        if not self.latency_histogram.count:
+            return  # 아직 처리한 프레임이 없으면 기본 단계 유지
+        p95 = self.latency_histogram.percentile(95)
+        in_flight = self.in_flight()
+        if p95 > self.high_latency_ms or in_flight > self.max_in_flight:
+            if self.level < len(self.levels) - 1:
+                self.level += 1
+            self.reason = f"overloaded (p95 {p95:.0f}ms, in_flight {in_flight})"
+        elif p95 < self.low_latency_ms and in_flight <= self.max_in_flight // 2:
+            if self.level > 0:
+                self.level -= 1
+            self.reason = f"idle (p95 {p95:.0f}ms, in_flight {in_flight})"
+        else:
+            self.reason = f"steady (p95 {p95:.0f}ms, in_flight {in_flight})"
+
+    def current(self):
+        """현재 권장 프로파일 (eval_interval마다 재평가)"""
+        with self._lock:
+            now = time.time()
+            if now - self._evaluated_at >= self.eval_interval:
+                self._evaluated_at = now
+                self._evaluate_locked()
+            profile = dict(self.levels[self.level])
+            profile.update({'level': self.level, 'reason': self.reason, 'refresh_seconds': self.eval_interval})
+            return profile
+
+
+class SessionFrameStats:
+    """세션별 수신 대역폭/디코딩 시간 (프로세스 내, 최근 세션만 보관)"""
+
+    def __init__(self, capacity=256, metrics=None):
+        self.capacity = capacity
+        self._stats = OrderedDict()
+        self._lock = threading.Lock()
+
+        registry = metrics or default_metrics
+        self._bytes = registry.counter('frames.bytes')
+        self._frames = registry.counter('frames.received')
+        self._decode_ms = registry.histogram('frames.decode_ms')
+        self._frame_bytes = registry.histogram(
+            'frames.size_bytes', buckets=(5000, 10000, 20000, 40000, 80000, 160000, 320000)
+        )
+
+    def record(self, session_id, nbytes, decode_ms=None):
+        """수신 프레임 기록 - 사전 필터로 디코딩을 건너뛴 프레임은 decode_ms=None"""
+        nbytes = nbytes or 0
+        self._bytes.inc(nbytes)
+        self._frames.inc()
+        self._frame_bytes.observe(nbytes)
+        if decode_ms is not None:
+            self._decode_ms.observe(decode_ms)
+        if not session_id:
+            return
+        with self._lock:
+            stats = self._stats.get(session_id)
+            if stats is None:
+                stats = {'frames': 0, 'bytes': 0, 'decoded': 0, 'decode_ms': 0.0, 'started_at': time.time()}
+                self._stats[session_id] = stats
+                while len(self._stats) > self.capacity:
+                    self._stats.popitem(last=False)
+            self._stats.move_to_end(session_id)
+            stats['frames'] += 1
+            stats['bytes'] += nbytes
+            if decode_ms is not None:
+                stats['decoded'] += 1
+                stats['decode_ms'] += decode_ms
+
+    def get(self, session_id):
+        with self._lock:
+            stats = self._stats.get(session_id)
+            if stats is None:
+                return None
+            stats = dict(stats)
+        elapsed = max(time.time() - stats['started_at'], 1e-3)
+        frames, decoded = stats['frames'], stats['decoded']
+        return {
+            'frames': frames,
+            'decoded_frames': decoded,
+            'bytes': stats['bytes'],
+            'bytes_per_second': round(stats['bytes'] / elapsed, 1),
+            'avg_frame_bytes': round(stats['bytes'] / frames, 1) if frames else 0,
+            'avg_decode_ms': round(stats['decode_ms'] / decoded, 3) if decoded else 0
+        }
@@ -0,0 +1,79 @@
+import numpy as np
+
+from utils.tracking_buffer import DIRECTIONS
+
+# 샘플 간격이 이보다 길면 (추적 중단 등) 이 값까지만 시간으로 인정
+MAX_SAMPLE_GAP_SECONDS = 2.0
+# 간격을 알 수 없는 샘플(샘플 1개뿐일 때)의 기본 시간 - 기존 0.5초/샘플 가정
+NOMINAL_SAMPLE_SECONDS = 0.5
+
+
+def sample_durations(timestamps_ms, max_gap=MAX_SAMPLE_GAP_SECONDS, nominal=NOMINAL_SAMPLE_SECONDS):
+    """샘플별 지속 시간(초) - 다음 샘플까지의 실제 간격, 마지막 샘플은 간격의 중앙값"""
+    count = len(timestamps_ms)
+    if count == 0:
+        return np.zeros(0, dtype=np.float64)
+    durations = np.empty(count, dtype=np.float64)
+    if count == 1:
+        durations[0] = nominal
+        return durations
+    gaps = np.diff(timestamps_ms).astype(np.float64) / 1000
+    np.clip(gaps, 0, max_gap, out=durations[:-1])
+    durations[-1] = np.median(durations[:-1])
+    return durations
+
+
+def compute_gaze_metrics(timestamps_ms, directions, max_gap=MAX_SAMPLE_GAP_SECONDS):
+    """시선 샘플 배열에서 리포트 지표를 한 번에 계산 (기준 구현)
+
+    운영 경로(/generate_report, /session_stats)는 샘플마다 갱신하는 SessionAggregates를 쓰고,
+    이 함수는 전체 샘플로 같은 지표를 다시 계산해 집계 결과를 검증하는 데 쓴다
+    (benchmarks/bench_gaze_metrics.py).
+
+    timestamps_ms: int64 epoch 밀리초, directions: uint8 방향 코드 (TrackingBuffer 열)
+    반환: 방향별 샘플 수/머문 시간, 방향 전환 수, 연속 응시 구간 통계, 분당 전환 수(읽기 속도)
+    """
+    count = len(directions)
+    empty = {name: 0 for name in DIRECTIONS}
+    if count == 0:
+        return {
+            'samples': 0,
+            'total_time': 0.0,
+            'counts': dict(empty),
+            'dwell_time': {name: 0.0 for name in DIRECTIONS},
+            'direction_changes': 0,
+            'mean_fixation': {name: 0.0 for name in DIRECTIONS},
+            'longest_fixation': 0.0,
+            'reading_speed': 0.0,
+            'concentration': 0.0
+        }
+
+    durations = sample_durations(timestamps_ms, max_gap)
+    total_time = float(durations.sum())
+
+    # 방향별 샘플 수 / 머문 시간 (알 수 없는 코드는 256칸 중 앞 3칸 밖으로)
+    counts = np.bincount(directions, minlength=256)[:len(DIRECTIONS)]
+    dwell = np.bincount(directions, weights=durations, minlength=256)[:len(DIRECTIONS)]
+
+    # 같은 방향이 이어지는 구간(응시) 경계와 구간별 시간
+    changed = directions[1:] != directions[:-1]
+    direction_changes = int(np.count_nonzero(changed))
+    run_starts = np.concatenate(([0], np.flatnonzero(changed) + 1))
+    run_times = np.add.reduceat(durations, run_starts)
+    run_directions = directions[run_starts]
+    run_counts = np.bincount(run_directions, minlength=256)[:len(DIRECTIONS)]
+    run_totals = np.bincount(run_directions, weights=run_times, minlength=256)[:len(DIRECTIONS)]
+    mean_fixation = np.divide(run_totals, run_counts, out=np.zeros(len(DIRECTIONS)), where=run_counts > 0)
+
+    center = DIRECTIONS.index('center')
+    return {
+        'samples': count,
+        'total_time': total_time,
+        'counts': {name: int(n) for name, n in zip(DIRECTIONS, counts)},
+        'dwell_time': {name: float(t) for name, t in zip(DIRECTIONS, dwell)},
+        'direction_changes': direction_changes,
+        'mean_fixation': {name: float(t) for name, t in zip(DIRECTIONS, mean_fixation)},
+        'longest_fixation': float(run_times.max()),
+        'reading_speed': direction_changes / (total_time / 60) if total_time > 0 else 0.0,
+        'concentration': float(counts[center] / count * 100)
+    }
@@ -0,0 +1,102 @@
+import json
+import threading
+import time
+
+
+class LatestFrameSlot:
+    """최신 프레임 1개만 보관 - 추론이 밀리면 오래된 프레임은 버림"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._closed = False
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, item):
+        """프레임 저장 - 처리 전 프레임을 덮어쓰면 True"""
+        with self._cond:
+            replaced = self._item is not None
+            if replaced:
+                self.dropped += 1
+            self._item = item
+            self.received += 1
+            self._cond.notify()
+            return replaced
+
+    def get(self, timeout=None):
+        """다음 프레임 대기 - 닫혔거나 시간 초과면 None"""
+        with self._cond:
+            if self._item is None and not self._closed:
+                self._cond.wait(timeout)
+            item, self._item = self._item, None
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+class GazeFrameStream:
+    """WebSocket 시선 채널 - 바이너리 프레임 수신, 결과(JSON) 전송
+
+    수신 스레드는 프레임을 슬롯에 넣기만 하고, 처리 루프는 항상 가장
+    최근 프레임만 디코딩/추론하므로 추론이 느려도 지연이 쌓이지 않는다.
+    """
+
+    def __init__(self, ws, process_frame, poll_timeout=1.0):
+        self.ws = ws
+        self.process_frame = process_frame
+        self.poll_timeout = poll_timeout
+        self.slot = LatestFrameSlot()
+        self.processed = 0
+
+    def _receive_loop(self):
+        try:
+            while not self.slot.closed:
+                message = self.ws.receive()
+                if message is None:
+                    continue
+                if isinstance(message, str):
+                    # 텍스트 메시지는 제어용 ('close')
+                    if message == 'close':
+                        break
+                    continue
+                self.slot.put((message, time.time()))
+        except Exception:
+            pass  # 연결 종료
+        finally:
+            self.slot.close()
+
+    def run(self):
+        receiver = threading.Thread(target=self._receive_loop, daemon=True)
+        receiver.start()
+
+        while True:
+            item = self.slot.get(self.poll_timeout)
+            if item is None:
+                if self.slot.closed:
+                    break
+                continue
+
+            frame_bytes, received_at = item
+            result = self.process_frame(frame_bytes)
+            self.processed += 1
+            result.update({
+                "seq": self.slot.received,
+                "dropped": self.slot.dropped,
+                "latency_ms": round((time.time() - received_at) * 1000, 1)
+            })
+            try:
+                self.ws.send(json.dumps(result, ensure_ascii=False))
+            except Exception:
+                break
+
+        self.slot.close()
+        print(f"[INFO] 시선 스트림 종료: 수신 {self.slot.received}, "
+              f"처리 {self.processed}, 버림 {self.slot.dropped}")
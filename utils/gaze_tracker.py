@@ -1,12 +1,45 @@
 import numpy as np
 import cv2
 import random
+import threading
 import time
 
+from utils.landmarks import (
+    LEFT_EYE_INDICES, RIGHT_EYE_INDICES, landmarks_to_array, eye_bbox, crop_view, face_bbox,
+    face_center as landmark_face_center
+)
+from utils.metrics import metrics
+
 class FaceDetector:
-    def __init__(self):
+    """얼굴/눈 영역 검출 - 직전 얼굴 주변만 잘라 FaceMesh를 돌리는 ROI 추적 지원
+
+    ROI에서 얼굴을 놓치거나 roi_refresh_frames 프레임마다 전체 프레임으로 다시 검출한다.
+    """
+
+    def __init__(self, face_mesh=None, face_mesh_lock=None, roi_tracking=True, roi_padding=0.25,
+                 roi_refresh_frames=30):
         print("[INFO] FaceDetector 초기화")
         self.use_dummy = True
+        self.face_mesh_lock = face_mesh_lock or threading.Lock()
+        self.roi_tracking = roi_tracking
+        self.roi_padding = roi_padding
+        self.roi_refresh_frames = roi_refresh_frames
+
+        # ROI 추적 상태 및 통계
+        self.last_face_bbox = None
+        self.frames_since_full = 0
+        self.roi_hits = 0
+        self.roi_fallbacks = 0
+        self.full_frame_detections = 0
+        self._roi_hits = metrics.counter('face_roi.hits')
+        self._roi_fallbacks = metrics.counter('face_roi.fallbacks')
+        self._full_frame = metrics.counter('face_roi.full_frame')
+        
+        # 모델 레지스트리의 공유 FaceMesh 사용 (세션마다 새로 만들지 않음)
+        if face_mesh is not None:
+            self.face_mesh = face_mesh
+            self.use_dummy = False
+            return
         
         try:
             import mediapipe as mp
@@ -22,6 +55,77 @@ class FaceDetector:
         except:
             print("[INFO] MediaPipe 없음. 시뮬레이션 모드")
     
+    def _detect_landmarks(self, frame, bbox=None):
+        """bbox 영역(없으면 전체 프레임)에서 랜드마크 검출 - 프레임 좌표 (N, 2) 배열"""
+        if bbox is None:
+            x0, y0, region = 0, 0, frame
+        else:
+            x0, y0, x1, y1 = bbox
+            region = frame[y0:y1, x0:x1]
+        
+        rgb_region = cv2.cvtColor(region, cv2.COLOR_BGR2RGB)
+        with self.face_mesh_lock:
+            results = self.face_mesh.process(rgb_region)
+        
+        if not results.multi_face_landmarks:
+            return None
+        h, w = region.shape[:2]
+        landmarks = landmarks_to_array(results.multi_face_landmarks[0], w, h)
+        landmarks += (x0, y0)
+        return landmarks
+    
+    def _roi_bbox(self, frame_shape):
+        """직전 얼굴 바운딩 박스에 여백을 더한 검출 영역 - 현재 프레임 밖이거나 비면 None
+
+        프레임 해상도가 바뀌면 직전 박스가 현재 프레임을 벗어날 수 있으므로 네 좌표 모두 잘라낸다.
+        """
+        x0, y0, x1, y1 = self.last_face_bbox
+        pad_x = int((x1 - x0) * self.roi_padding)
+        pad_y = int((y1 - y0) * self.roi_padding)
+        h, w = frame_shape[:2]
+        x0, x1 = min(max(0, x0 - pad_x), w), min(max(0, x1 + pad_x), w)
+        y0, y1 = min(max(0, y0 - pad_y), h), min(max(0, y1 + pad_y), h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return x0, y0, x1, y1
+    
+    def _find_landmarks(self, frame):
+        """ROI 우선 검출 - 놓치거나 갱신 주기가 되면 전체 프레임 검출"""
+        use_roi = (
+            self.roi_tracking
+            and self.last_face_bbox is not None
+            and self.frames_since_full < self.roi_refresh_frames
+        )
+        if use_roi:
+            landmarks = None
+            bbox = self._roi_bbox(frame.shape)
+            if bbox is not None:
+                try:
+                    landmarks = self._detect_landmarks(frame, bbox)
+                except Exception as e:
+                    print(f"[WARN] ROI 얼굴 검출 오류, 전체 프레임으로 재시도: {e}")
+            if landmarks is not None:
+                self.roi_hits += 1
+                self._roi_hits.inc()
+                self.frames_since_full += 1
+                return landmarks
+            # 빈 ROI/검출 실패/오류 - 직전 박스를 버리고 전체 프레임 검출
+            self.last_face_bbox = None
+            self.roi_fallbacks += 1
+            self._roi_fallbacks.inc()
+        
+        self.full_frame_detections += 1
+        self._full_frame.inc()
+        self.frames_since_full = 0
+        return self._detect_landmarks(frame)
+    
+    def roi_stats(self):
+        return {
+            'roi_hits': self.roi_hits,
+            'roi_fallbacks': self.roi_fallbacks,
+            'full_frame_detections': self.full_frame_detections
+        }
+    
     def extract_eyes(self, frame):
         if self.use_dummy:
             h, w = frame.shape[:2]
@@ -32,18 +136,20 @@ class FaceDetector:
         
         # 실제 MediaPipe 처리
         try:
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.face_mesh.process(rgb_frame)
-            
-            if not results.multi_face_landmarks:
+            landmarks = self._find_landmarks(frame)
+            if landmarks is None:
+                self.last_face_bbox = None
                 return None, None, None
             
-            h, w = frame.shape[:2]
-            left_eye = frame[h//3:2*h//3, w//4:w//2]
-            right_eye = frame[h//3:2*h//3, w//2:3*w//4]
-            face_center = (w//2, h//2)
-            return left_eye, right_eye, face_center
-        except:
+            self.last_face_bbox = face_bbox(landmarks, frame.shape)
+            left_eye = crop_view(frame, eye_bbox(landmarks, LEFT_EYE_INDICES, frame.shape))
+            right_eye = crop_view(frame, eye_bbox(landmarks, RIGHT_EYE_INDICES, frame.shape))
+            if left_eye is None or right_eye is None:
+                return None, None, None
+            return left_eye, right_eye, landmark_face_center(landmarks)
+        except Exception as e:
+            print(f"[ERROR] 얼굴 검출 오류: {e}")
+            self.last_face_bbox = None
             return None, None, None
 
 class GazeModel:
@@ -106,10 +212,11 @@ class GazeModel:
         return [gaze_x, gaze_y]
 
 class GazeTracker:
-    def __init__(self):
+    def __init__(self, face_mesh=None, face_mesh_lock=None, gaze_model=None, **roi_options):
         print("[INFO] GazeTracker 초기화")
-        self.face_detector = FaceDetector()
-        self.gaze_model = GazeModel()
+        self.face_detector = FaceDetector(face_mesh, face_mesh_lock, **roi_options)
+        # 공유 ResNet 모델이 없으면 세션별 읽기 패턴 시뮬레이션 사용
+        self.gaze_model = gaze_model or GazeModel()
         self.calibration_data = []
         self.calibrated = False
         self.screen_width = 1920
@@ -123,6 +230,8 @@ class GazeTracker:
                 return None
             
             gaze_pred = self.gaze_model.predict_gaze(left_eye, right_eye)
+            if gaze_pred is None:
+                return None
             
             return {
                 'gaze_x': float(gaze_pred[0]),
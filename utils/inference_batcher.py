@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import deque
+
+from utils.metrics import metrics as default_metrics
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class _PendingRequest:
+    """배치에 합쳐질 요청 하나 (항목 목록 + 결과 대기)"""
+
+    __slots__ = ('items', 'submitted_at', 'result', 'error', 'done')
+
+    def __init__(self, items):
+        self.items = items
+        self.submitted_at = time.perf_counter()
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class InferenceBatcher:
+    """여러 요청(세션)의 입력을 모아 한 번에 추론하는 동적 배처
+
+    첫 요청이 들어온 뒤 max_wait_ms 동안, 또는 항목이 max_batch_size개 찰 때까지
+    모아서 predict_batch(items)를 한 번 호출하고 결과를 요청별로 나눠 돌려준다.
+    요청 하나의 항목은 나뉘지 않고 항상 같은 배치에 들어간다.
+    """
+
+    def __init__(self, predict_batch, name='batcher', max_batch_size=64, max_wait_ms=2.0, metrics=None):
+        self.predict_batch = predict_batch
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending = deque()
+        self._pending_items = 0
+        self._cond = threading.Condition()
+        self._worker = None
+
+        registry = metrics or default_metrics
+        registry.gauge(f"{name}.pending", lambda: self._pending_items)
+        self._batches = registry.counter(f"{name}.batches")
+        self._items = registry.counter(f"{name}.items")
+        self._failed = registry.counter(f"{name}.failed")
+        self._batch_size = registry.histogram(f"{name}.batch_size", buckets=BATCH_SIZE_BUCKETS)
+        self._batch_ms = registry.histogram(f"{name}.batch_ms")
+        self._wait_ms = registry.histogram(f"{name}.wait_ms")
+        self._total_ms = registry.histogram(f"{name}.total_ms")
+
+    def _ensure_worker(self):
+        # gunicorn preload 이후 fork된 워커에서 스레드를 띄우도록 지연 시작
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name=f"{self.name}-worker", daemon=True)
+            self._worker.start()
+
+    def submit(self, items):
+        """항목 목록을 배치에 넣고 결과(항목별 목록)가 나올 때까지 대기"""
+        request = _PendingRequest(list(items))
+        with self._cond:
+            self._ensure_worker()
+            self._pending.append(request)
+            self._pending_items += len(request.items)
+            self._cond.notify()
+        request.done.wait()
+        self._total_ms.observe((time.perf_counter() - request.submitted_at) * 1000)
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _next_batch(self):
+        """첫 요청 도착 후 max_wait 또는 max_batch_size까지 요청 수집"""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = self._pending[0].submitted_at + self.max_wait
+            while self._pending_items < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = [self._pending.popleft()]
+            size = len(batch[0].items)
+            while self._pending and size + len(self._pending[0].items) <= self.max_batch_size:
+                request = self._pending.popleft()
+                batch.append(request)
+                size += len(request.items)
+            self._pending_items -= size
+            return batch, size
+
+    def _run(self):
+        while True:
+            batch, size = self._next_batch()
+            started = time.perf_counter()
+            for request in batch:
+                self._wait_ms.observe((started - request.submitted_at) * 1000)
+
+            try:
+                results = self.predict_batch([item for request in batch for item in request.items])
+                offset = 0
+                for request in batch:
+                    request.result = results[offset:offset + len(request.items)]
+                    offset += len(request.items)
+            except Exception as e:
+                print(f"[ERROR] {self.name} 배치 추론 실패: {e}")
+                self._failed.inc()
+                for request in batch:
+                    request.error = e
+
+            self._batch_ms.observe((time.perf_counter() - started) * 1000)
+            self._batch_size.observe(size)
+            self._batches.inc()
+            self._items.inc(size)
+            for request in batch:
+                request.done.set()
+
+
+class BatchedGazeModel:
+    """GazeModel과 같은 predict_gaze 인터페이스 - 눈 이미지를 세션 간 배치로 추론"""
+
+    def __init__(self, gaze_model, max_batch_size=64, max_wait_ms=2.0, metrics=None):
+        self.gaze_model = gaze_model
+        self.batcher = InferenceBatcher(
+            gaze_model.predict_batch,
+            name='gaze_batcher',
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            metrics=metrics
+        )
+
+    def predict_gaze(self, left_eye, right_eye):
+        """시선 방향 예측 - 두 눈 예측의 평균 (x, y)"""
+        try:
+            left_pred, right_pred = self.batcher.submit([left_eye, right_eye])
+            return (float(left_pred[0] + right_pred[0]) / 2, float(left_pred[1] + right_pred[1]) / 2)
+        except Exception as e:
+            print(f"Error in prediction: {e}")
+            return None
@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.metrics import metrics as default_metrics
+
+
+class JobQueueFull(Exception):
+    """대기 작업이 너무 많을 때"""
+
+
+class Job:
+    """비동기 작업 상태"""
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = 'queued'  # queued, running, done, failed
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'job_status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'queued_ms': round(((self.started_at or time.time()) - self.submitted_at) * 1000, 1),
+            'run_ms': round(((self.finished_at or time.time()) - self.started_at) * 1000, 1)
+            if self.started_at else None
+        }
+
+
+class JobQueue:
+    """CPU 코어 수만큼의 워커로 제한된 작업 큐 (대기열 길이/지연 지표 포함)"""
+
+    def __init__(self, name, max_workers=None, max_queue=32, result_ttl=600, metrics=None):
+        self.name = name
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+
+        registry = metrics or default_metrics
+        registry.gauge(f"{name}.queue_depth", lambda: self._queued)
+        registry.gauge(f"{name}.running", lambda: self._running)
+        registry.gauge(f"{name}.workers", lambda: self.max_workers)
+        self._submitted = registry.counter(f"{name}.submitted")
+        self._completed = registry.counter(f"{name}.completed")
+        self._failed = registry.counter(f"{name}.failed")
+        self._rejected = registry.counter(f"{name}.rejected")
+        self._wait_ms = registry.histogram(f"{name}.wait_ms")
+        self._run_ms = registry.histogram(f"{name}.run_ms")
+        self._total_ms = registry.histogram(f"{name}.total_ms")
+
+    def submit(self, fn, *args, **kwargs):
+        """작업 등록 - 대기열이 가득 차면 JobQueueFull"""
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected.inc()
+                raise JobQueueFull(f"대기 중인 작업이 너무 많습니다 ({self._queued}개)")
+            self._expire_locked(time.time())
+            job = Job(uuid.uuid4().hex)
+            self._jobs[job.id] = job
+            self._queued += 1
+        self._submitted.inc()
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, fn, args, kwargs):
+        job.started_at = time.time()
+        job.status = 'running'
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        self._wait_ms.observe((job.started_at - job.submitted_at) * 1000)
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = 'done'
+            self._completed.inc()
+        except Exception as e:
+            print(f"[ERROR] {self.name} 작업 실패: {e}")
+            job.error = str(e)
+            job.status = 'failed'
+            self._failed.inc()
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._running -= 1
+            self._run_ms.observe((job.finished_at - job.started_at) * 1000)
+            self._total_ms.observe((job.finished_at - job.submitted_at) * 1000)
+            job.done.set()
+
+    def _expire_locked(self, now):
+        """오래된 완료 작업 결과 정리"""
+        while self._jobs:
+            job = next(iter(self._jobs.values()))
+            if not job.done.is_set() or now - job.finished_at < self.result_ttl:
+                break
+            self._jobs.popitem(last=False)
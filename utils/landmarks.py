@@ -0,0 +1,56 @@
+import numpy as np
+
+# 눈 영역 랜드마크 인덱스 (MediaPipe FaceMesh, 눈마다 16개)
+LEFT_EYE_INDICES = np.array([33, 7, 163, 144, 145, 153, 154, 155, 133, 173, 157, 158, 159, 160, 161, 246], dtype=np.intp)
+RIGHT_EYE_INDICES = np.array([362, 382, 381, 380, 374, 373, 390, 249, 263, 466, 388, 387, 386, 385, 384, 398], dtype=np.intp)
+# 이마, 턱, 양 볼
+FACE_CENTER_INDICES = np.array([10, 152, 234, 454], dtype=np.intp)
+
+EYE_MARGIN = 10
+MIN_EYE_SIZE = 20
+
+
+def landmarks_to_array(face_landmarks, width, height):
+    """MediaPipe 랜드마크를 (N, 2) int32 픽셀 좌표 배열로 변환
+
+    protobuf 필드 읽기만 한 번에 모으고, 스케일링/정수 변환은 배열 연산으로 처리한다.
+    """
+    points = face_landmarks.landmark
+    coords = np.fromiter(
+        (value for landmark in points for value in (landmark.x, landmark.y)),
+        dtype=np.float64,
+        count=2 * len(points)
+    ).reshape(-1, 2)
+    coords *= (width, height)
+    return coords.astype(np.int32)  # int()와 같이 0 방향으로 버림
+
+
+def eye_bbox(landmarks, eye_indices, frame_shape, margin=EYE_MARGIN):
+    """눈 랜드마크의 바운딩 박스 (x0, y0, x1, y1) - 여백 추가 후 프레임 안으로 제한"""
+    eye_points = landmarks[eye_indices]
+    x0, y0 = eye_points.min(axis=0) - margin
+    x1, y1 = eye_points.max(axis=0) + margin
+    h, w = frame_shape[:2]
+    return max(0, int(x0)), max(0, int(y0)), min(w, int(x1)), min(h, int(y1))
+
+
+def crop_view(frame, bbox, min_size=MIN_EYE_SIZE):
+    """바운딩 박스 영역을 복사 없이 잘라낸 뷰 - 너무 작으면 None"""
+    x0, y0, x1, y1 = bbox
+    if y1 - y0 < min_size or x1 - x0 < min_size:
+        return None
+    return frame[y0:y1, x0:x1]
+
+
+def face_center(landmarks):
+    """얼굴 주요 점들의 평균으로 중심점 계산"""
+    center_x, center_y = landmarks[FACE_CENTER_INDICES].sum(axis=0) // len(FACE_CENTER_INDICES)
+    return int(center_x), int(center_y)
+
+
+def face_bbox(landmarks, frame_shape):
+    """전체 랜드마크의 바운딩 박스 (x0, y0, x1, y1) - 프레임 안으로 제한"""
+    x0, y0 = landmarks.min(axis=0)
+    x1, y1 = landmarks.max(axis=0)
+    h, w = frame_shape[:2]
+    return max(0, int(x0)), max(0, int(y0)), min(w, int(x1)), min(h, int(y1))
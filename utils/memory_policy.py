@@ -0,0 +1,137 @@
+import gc
+import os
+import threading
+import time
+
+from utils.metrics import metrics as default_metrics
+
+# 기본 (700, 10, 10)보다 젊은 세대 수집 빈도를 낮춤 - 요청마다 생기는 작은 객체들은
+# 대부분 곧바로 참조 카운트로 해제되므로 세대 수집을 자주 할 필요가 없다
+DEFAULT_GC_THRESHOLDS = (20000, 50, 100)
+
+
+def current_rss_mb():
+    """현재 RSS(MB) - /proc을 읽을 수 없으면 None"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryPolicy:
+    """프로세스 메모리 관리 정책 - 요청 경로에서 gc.collect()를 호출하지 않도록
+
+    - 세대별 GC 임계값 조정 (configure)
+    - 모델 로드 후 gc.freeze()로 오래 사는 객체를 GC 추적 대상에서 제외 (freeze)
+    - 요청 경로는 request_collection()으로 수집이 필요하다는 표시만 하고,
+      실제 전체 수집은 백그라운드 스레드가 최소 간격을 두고 수행하거나
+      RSS가 임계치 이상 늘었을 때 수행
+    """
+
+    def __init__(self, thresholds=DEFAULT_GC_THRESHOLDS, collect_interval=60.0, rss_growth_mb=256,
+                 metrics=None):
+        self.thresholds = tuple(thresholds)
+        self.collect_interval = collect_interval
+        self.rss_growth_mb = rss_growth_mb
+        self._requested = threading.Event()
+        self._worker = None
+        self._worker_pid = None
+        self._lock = threading.Lock()
+        self._last_collect = time.time()
+        self._baseline_rss = current_rss_mb()
+        self._gc_started = {}
+
+        registry = metrics or default_metrics
+        self._pause_ms = registry.histogram('gc.pause_ms')
+        self._collections = [registry.counter(f"gc.collections.gen{generation}") for generation in range(3)]
+        self._background = registry.counter('gc.background_collections')
+        self._requests = registry.counter('gc.collection_requests')
+        registry.gauge('gc.frozen_objects', gc.get_freeze_count)
+        registry.gauge('gc.rss_mb', current_rss_mb)
+
+    def configure(self):
+        """GC 임계값 적용 + 수집 시간 측정 콜백 등록 + 백그라운드 수집 시작"""
+        gc.set_threshold(*self.thresholds)
+        if self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
+        self._ensure_worker()
+        print(f"[INFO] GC 임계값 {self.thresholds}, 백그라운드 수집 간격 {self.collect_interval:.0f}초")
+        return self
+
+    def _on_gc(self, phase, info):
+        # 스레드마다 GC가 돌 수 있으므로 스레드 ID로 시작 시각 기록
+        thread_id = threading.get_ident()
+        if phase == 'start':
+            self._gc_started[thread_id] = time.perf_counter()
+            return
+        started = self._gc_started.pop(thread_id, None)
+        if started is not None:
+            self._pause_ms.observe((time.perf_counter() - started) * 1000)
+            self._collections[info['generation']].inc()
+
+    def freeze(self, label='long-lived objects'):
+        """지금까지 만들어진 객체(로드된 모델 등)를 영구 세대로 이동
+
+        한 번 정리한 뒤 얼리므로 이후 전체 수집은 모델 객체를 다시 훑지 않는다.
+        fork 전에 호출하면 워커 간 copy-on-write 페이지도 덜 깨진다.
+        """
+        gc.collect()
+        gc.freeze()
+        self._baseline_rss = current_rss_mb()
+        print(f"[INFO] GC freeze 완료 ({label}): {gc.get_freeze_count()}개 객체")
+
+    def request_collection(self):
+        """요청 경로용 - 바로 수집하지 않고 백그라운드 수집만 요청"""
+        self._requests.inc()
+        self._requested.set()
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        # gunicorn preload 이후 fork된 워커에서 스레드를 띄우도록 지연 시작
+        if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or self._worker_pid != os.getpid() or not self._worker.is_alive():
+                self._worker_pid = os.getpid()
+                self._worker = threading.Thread(target=self._run, name='gc-collector', daemon=True)
+                self._worker.start()
+
+    def _should_collect(self, now):
+        if self._requested.is_set() and now - self._last_collect >= self.collect_interval:
+            return True
+        rss = current_rss_mb()
+        return (
+            rss is not None and self._baseline_rss is not None
+            and rss - self._baseline_rss >= self.rss_growth_mb
+        )
+
+    def _run(self):
+        while True:
+            self._requested.wait(timeout=self.collect_interval)
+            now = time.time()
+            if not self._should_collect(now):
+                # 요청은 있었지만 최소 간격이 안 됐으면 남은 시간만큼 대기
+                time.sleep(max(0.0, min(self.collect_interval, self._last_collect + self.collect_interval - now)))
+                continue
+            self._requested.clear()
+            gc.collect()
+            self._last_collect = time.time()
+            self._baseline_rss = current_rss_mb()
+            self._background.inc()
+
+
+def _env_thresholds():
+    value = os.environ.get('GC_THRESHOLDS')
+    if not value:
+        return DEFAULT_GC_THRESHOLDS
+    return tuple(int(part) for part in value.split(','))
+
+
+# 프로세스 공용 정책
+memory_policy = MemoryPolicy(
+    thresholds=_env_thresholds(),
+    collect_interval=float(os.environ.get('GC_COLLECT_INTERVAL', 60)),
+    rss_growth_mb=float(os.environ.get('GC_RSS_GROWTH_MB', 256))
+)
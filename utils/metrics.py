@@ -0,0 +1,130 @@
+import bisect
+import threading
+from collections import deque
+
+DEFAULT_LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+
+class Counter:
+    """누적 카운터"""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+    def snapshot(self):
+        return self._value
+
+
+class Gauge:
+    """현재 값 (직접 설정하거나 조회 함수 등록)"""
+
+    def __init__(self, fn=None):
+        self._fn = fn
+        self._value = 0
+
+    def set(self, value):
+        self._value = value
+
+    @property
+    def value(self):
+        return self._fn() if self._fn is not None else self._value
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+    """버킷 히스토그램 + 최근 값 기반 백분위수"""
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS_MS, window=1024):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._recent = deque(maxlen=window)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._recent.append(value)
+            self._count += 1
+            self._sum += value
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def mean(self):
+        return self._sum / self._count if self._count else 0.0
+
+    def percentile(self, q):
+        with self._lock:
+            values = sorted(self._recent)
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+    def snapshot(self):
+        with self._lock:
+            values = sorted(self._recent)
+            counts = list(self._counts)
+            count, total = self._count, self._sum
+
+        def pct(q):
+            return values[min(len(values) - 1, int(q / 100 * len(values)))] if values else 0.0
+
+        # JSON 직렬화 시 키 정렬에 영향받지 않도록 [상한, 개수] 목록으로 표현
+        bounds = list(self.buckets) + ['inf']
+        return {
+            'count': count,
+            'mean': total / count if count else 0.0,
+            'p50': pct(50),
+            'p95': pct(95),
+            'p99': pct(99),
+            'buckets': [[bound, n] for bound, n in zip(bounds, counts)]
+        }
+
+
+class MetricsRegistry:
+    """프로세스 내 지표 모음 - /metrics 에서 JSON으로 노출"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = factory()
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name):
+        return self._get_or_create(name, Counter)
+
+    def gauge(self, name, fn=None):
+        return self._get_or_create(name, lambda: Gauge(fn))
+
+    def histogram(self, name, buckets=DEFAULT_LATENCY_BUCKETS_MS):
+        return self._get_or_create(name, lambda: Histogram(buckets))
+
+    def snapshot(self):
+        with self._lock:
+            items = list(self._metrics.items())
+        return {name: metric.snapshot() for name, metric in sorted(items)}
+
+
+# 프로세스 공용 레지스트리
+metrics = MetricsRegistry()
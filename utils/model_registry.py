@@ -0,0 +1,221 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+# 저장소 루트 기준 ResNet 가중치 경로
+DEFAULT_GAZE_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models', 'best_resnet_model.pth'
+)
+
+
+class ModelRegistry:
+    """워커 프로세스당 한 번만 모델을 로드 - 세션들은 읽기 전용으로 공유
+
+    - Whisper: 음성 인식 (AudioAnalyzer 하나를 모든 요청이 공유, whisper_lock으로 한 번에 하나씩 인식)
+    - MediaPipe FaceMesh: 세션 간 공유되므로 static_image_mode + 락으로 사용
+    - ResNet 시선 모델: GAZE_MODEL=resnet 일 때만 로드
+    """
+
+    def __init__(self, whisper_model_name='base', whisper_backend='openai', whisper_quantize=None,
+                 whisper_threads=None, gaze_model='simulation',
+                 gaze_model_path=DEFAULT_GAZE_MODEL_PATH, gaze_batch_size=64, gaze_batch_wait_ms=2.0,
+                 freeze_after_load=True, audio_min_seconds=1.0):
+        self.whisper_model_name = whisper_model_name
+        self.whisper_backend = whisper_backend
+        self.whisper_quantize = whisper_quantize
+        self.whisper_threads = whisper_threads
+        self.audio_min_seconds = audio_min_seconds
+        self.gaze_model_name = gaze_model
+        self.gaze_model_path = gaze_model_path
+        self.gaze_batch_size = gaze_batch_size
+        self.gaze_batch_wait_ms = gaze_batch_wait_ms
+        self.freeze_after_load = freeze_after_load
+
+        self.whisper_model = None
+        self.whisper_lock = threading.Lock()
+        self.audio_analyzer = None
+        self.face_mesh = None
+        self.face_mesh_lock = threading.Lock()
+        self.gaze_model = None
+        self.batched_gaze_model = None
+
+        self.load_times = {}
+        self.errors = {}
+        self.warmed_up = False
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._loader = None
+        self._loader_pid = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        """fork된 워커에서 한 번 실행 - 부모의 락/로더 상태를 물려받지 않도록 초기화"""
+        self._lock = threading.Lock()
+        if not self._ready.is_set():
+            # 로드 도중 fork됨 - 부모의 로더 스레드는 자식에 없으므로 자식에서 다시 로드
+            self._ready = threading.Event()
+            self._loader = None
+            self._loader_pid = None
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def _timed(self, name, fn):
+        start = time.time()
+        try:
+            result = fn()
+            self.load_times[name] = round((time.time() - start) * 1000, 1)
+            print(f"[INFO] {name} 로드 완료 ({self.load_times[name]:.0f}ms)")
+            return result
+        except Exception as e:
+            self.errors[name] = str(e)
+            print(f"[INFO] {name} 사용 불가: {e}")
+            return None
+
+    def _load_whisper(self):
+        from utils.whisper_backends import create_whisper_backend
+        return create_whisper_backend(
+            self.whisper_backend, self.whisper_model_name, self.whisper_quantize, self.whisper_threads,
+            lock=self.whisper_lock
+        )
+
+    def _load_face_mesh(self):
+        import mediapipe as mp
+        return mp.solutions.face_mesh.FaceMesh(
+            static_image_mode=True,  # 여러 세션이 번갈아 쓰므로 프레임 간 추적 상태를 두지 않음
+            max_num_faces=1,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+        )
+
+    def _load_gaze_model(self):
+        from models.gaze_model import GazeModel
+        return GazeModel(model_path=self.gaze_model_path)
+
+    def load(self, warmup=False):
+        """모든 모델 로드 (이미 로드되었으면 바로 반환)
+
+        어느 단계가 실패해도 errors에 기록하고 준비 완료로 표시한다 (wait_ready 대기가 풀리도록).
+        """
+        with self._lock:
+            if self.ready:
+                return self
+            try:
+                self._load_all(warmup)
+            except Exception as e:
+                self.errors['registry'] = str(e)
+                print(f"[ERROR] 모델 로드 실패: {e}")
+            finally:
+                self._ready.set()
+            return self
+
+    def _load_all(self, warmup):
+        from utils.audio_analyzer import AudioAnalyzer
+        from utils.transcription_cache import create_transcription_cache
+
+        self.whisper_model = self._timed('whisper', self._load_whisper)
+        cache = self._timed('transcription_cache', create_transcription_cache)
+        self.audio_analyzer = self._timed('audio_analyzer', lambda: AudioAnalyzer(
+            model=self.whisper_model, load_model=False, min_duration=self.audio_min_seconds,
+            model_name=getattr(self.whisper_model, 'name', self.whisper_model_name),
+            cache=cache
+        ))
+        self.face_mesh = self._timed('face_mesh', self._load_face_mesh)
+        if self.gaze_model_name == 'resnet':
+            self.gaze_model = self._timed('gaze_resnet', self._load_gaze_model)
+            if self.gaze_model is not None and self.gaze_batch_size > 1:
+                from utils.inference_batcher import BatchedGazeModel
+                # 세션들의 눈 이미지를 모아 한 번의 forward로 처리
+                self.batched_gaze_model = BatchedGazeModel(
+                    self.gaze_model,
+                    max_batch_size=self.gaze_batch_size,
+                    max_wait_ms=self.gaze_batch_wait_ms
+                )
+
+        if warmup:
+            self._timed('warmup', self.warmup)
+            self.warmed_up = True
+
+        # 모델 객체는 프로세스가 끝날 때까지 살아 있으므로 GC 추적 대상에서 제외
+        if self.freeze_after_load:
+            from utils.memory_policy import memory_policy
+            memory_policy.freeze('models')
+
+    def warmup(self):
+        """첫 요청 지연을 없애기 위한 더미 추론"""
+        if self.whisper_model is not None:
+            self.whisper_model.transcribe(np.zeros(16000, dtype=np.float32), language='ko')
+        if self.face_mesh is not None:
+            with self.face_mesh_lock:
+                self.face_mesh.process(np.zeros((480, 640, 3), dtype=np.uint8))
+        if self.gaze_model is not None:
+            eye = np.zeros((36, 60), dtype=np.uint8)
+            self.gaze_model.predict_gaze(eye, eye)
+
+    def start_loading(self, warmup=False):
+        """백그라운드 스레드에서 로드 시작 (서버는 바로 요청을 받음)"""
+        with self._lock:
+            if self.ready or (self._loader is not None and self._loader_pid == os.getpid()):
+                return
+            self._loader_pid = os.getpid()
+            self._loader = threading.Thread(target=self.load, args=(warmup,), name='model-loader', daemon=True)
+            self._loader.start()
+
+    def wait_ready(self, timeout=None):
+        """로드 완료까지 대기 - 이 프로세스에 로더 스레드가 없으면(fork 등) 먼저 시작"""
+        if self.ready:
+            return True
+        if self._loader is None or self._loader_pid != os.getpid():
+            self.start_loading()
+        return self._ready.wait(timeout)
+
+    def tracker_kwargs(self):
+        """세션별 GazeTracker 생성 인자 (공유 모델 전달)"""
+        return {
+            'face_mesh': self.face_mesh,
+            'face_mesh_lock': self.face_mesh_lock,
+            'gaze_model': self.batched_gaze_model or self.gaze_model
+        }
+
+    def status(self):
+        return {
+            'ready': self.ready,
+            'warmed_up': self.warmed_up,
+            'models': {
+                'whisper': self.whisper_model is not None,
+                'whisper_backend': getattr(self.whisper_model, 'name', None),
+                'face_mesh': self.face_mesh is not None,
+                'gaze_resnet': self.gaze_model is not None,
+                'gaze_batching': self.batched_gaze_model is not None
+            },
+            'load_times_ms': dict(self.load_times),
+            'errors': dict(self.errors)
+        }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """프로세스 공용 모델 레지스트리"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry(
+                    whisper_model_name=os.environ.get('WHISPER_MODEL', 'base'),
+                    whisper_backend=os.environ.get('WHISPER_BACKEND', 'openai'),
+                    whisper_quantize=os.environ.get('WHISPER_QUANTIZE') or None,
+                    whisper_threads=int(os.environ.get('WHISPER_THREADS', 0)) or None,
+                    gaze_model=os.environ.get('GAZE_MODEL', 'simulation'),
+                    gaze_batch_size=int(os.environ.get('GAZE_BATCH_MAX_SIZE', 64)),
+                    gaze_batch_wait_ms=float(os.environ.get('GAZE_BATCH_MAX_WAIT_MS', 2)),
+                    freeze_after_load=os.environ.get('GC_FREEZE_MODELS', '1') == '1',
+                    audio_min_seconds=float(os.environ.get('AUDIO_MIN_SECONDS', 1.0))
+                )
+    return _registry
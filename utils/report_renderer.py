@@ -0,0 +1,256 @@
+import io
+import os
+import threading
+import time
+import urllib.request
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+FONT_NAME = 'NanumGothic'
+FONT_FILENAME = 'NanumGothic-Regular.ttf'
+FONT_URL = "https://fonts.gstatic.com/ea/nanumgothic/v5/NanumGothic-Regular.ttf"
+
+# 저장소에 폰트를 함께 배포하는 경우의 위치
+BUNDLED_FONT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'fonts', FONT_FILENAME
+)
+DEFAULT_FONT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'ai-talk', 'fonts')
+# 폰트 등록에 실패하면 이 간격(초)마다 다음 렌더링 때 다시 시도
+FONT_RETRY_SECONDS = 300
+
+RECOMMENDATIONS = [
+    "1. 매일 20분씩 소리내어 읽기 연습하기",
+    "2. 다양한 장르의 책으로 독서 범위 넓히기",
+    "3. 읽은 내용을 요약하여 말해보기",
+    "4. 발음이 어려운 단어는 반복 연습하기",
+    "5. 시선 집중력 향상을 위한 집중 훈련",  # 시선추적 관련 추가
+    "6. 3개월 후 재진단 받기"
+]
+
+
+def _download_font(path):
+    """나눔고딕 웹폰트를 캐시 경로로 다운로드 (최초 1회, 인증서 검증)"""
+    print("[INFO] 나눔고딕 폰트 다운로드 중...")
+
+    font_request = urllib.request.Request(
+        FONT_URL,
+        headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    )
+
+    with urllib.request.urlopen(font_request, timeout=15) as response:
+        font_data = response.read()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(font_data)
+    os.replace(temp_path, path)  # 여러 워커가 동시에 받아도 안전하게 교체
+
+
+def resolve_font_path():
+    """사용할 TTF 경로 결정 - 환경 변수 > 번들 폰트 > 로컬 캐시 (없으면 다운로드)"""
+    configured = os.environ.get('REPORT_FONT_PATH')
+    if configured:
+        return configured
+    if os.path.exists(BUNDLED_FONT_PATH):
+        return BUNDLED_FONT_PATH
+
+    cache_dir = os.environ.get('REPORT_FONT_CACHE_DIR', DEFAULT_FONT_CACHE_DIR)
+    cached_path = os.path.join(cache_dir, FONT_FILENAME)
+    if not os.path.exists(cached_path):
+        _download_font(cached_path)
+    return cached_path
+
+
+def register_report_font():
+    """한글 폰트 등록 (프로세스당 1회) - 실패 시 Helvetica"""
+    if FONT_NAME in pdfmetrics.getRegisteredFontNames():
+        return FONT_NAME
+    try:
+        font_path = resolve_font_path()
+        pdfmetrics.registerFont(TTFont(FONT_NAME, font_path))
+        print(f"[SUCCESS] 나눔고딕 폰트 등록 완료! ({font_path})")
+        return FONT_NAME
+    except Exception as font_error:
+        print(f"[WARNING] 폰트 등록 실패: {font_error}")
+        return 'Helvetica'
+
+
+def _table_style(font_name, background, valign='MIDDLE'):
+    return TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), font_name),
+        ('FONTSIZE', (0, 0), (-1, -1), 11),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor(background)),
+        ('VALIGN', (0, 0), (-1, -1), valign),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ])
+
+
+class ReportRenderer:
+    """PDF 진단 리포트 렌더러 - 폰트/스타일을 한 번만 준비해 재사용"""
+
+    def __init__(self):
+        self.font_name = register_report_font()
+        font_name = self.font_name
+
+        # 스타일 정의
+        self.title_style = ParagraphStyle(
+            'Title',
+            fontName=font_name,
+            fontSize=20,
+            spaceAfter=20,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor('#2c3e50'),
+            leading=24
+        )
+
+        self.header_style = ParagraphStyle(
+            'Header',
+            fontName=font_name,
+            fontSize=14,
+            spaceAfter=10,
+            textColor=colors.HexColor('#34495e'),
+            leading=18
+        )
+
+        self.normal_style = ParagraphStyle(
+            'Normal',
+            fontName=font_name,
+            fontSize=11,
+            leading=16,
+            spaceAfter=8
+        )
+
+        self.footer_style = ParagraphStyle(
+            'Footer',
+            fontName=font_name,
+            fontSize=9,
+            alignment=TA_CENTER,
+            textColor=colors.grey
+        )
+
+        self.basic_table_style = _table_style(font_name, '#ecf0f1')
+        self.eye_table_style = _table_style(font_name, '#e3f2fd')  # 연한 파란색
+        self.speech_table_style = _table_style(font_name, '#e8f5e8', valign='TOP')
+
+    def _table(self, rows, style):
+        table = Table(rows, colWidths=[50*mm, 100*mm])
+        table.setStyle(style)
+        return table
+
+    def build_content(self, child_name, user_id, audio_result, eye_tracking_result):
+        """PDF 내용 구성"""
+        now = datetime.now()
+        content = []
+
+        # 제목
+        content.append(Paragraph("📚 읽기 능력 진단 리포트", self.title_style))
+        content.append(Spacer(1, 10))
+        content.append(Paragraph(f"👦 아동명: {child_name}", self.header_style))
+        content.append(Spacer(1, 20))
+
+        # 기본 정보
+        content.append(Paragraph("📋 기본 정보", self.header_style))
+        content.append(self._table([
+            ['아동 이름', child_name],
+            ['진단 날짜', now.strftime('%Y년 %m월 %d일')],
+            ['사용자 ID', str(user_id)],
+            ['리포트 생성 시간', now.strftime('%H시 %M분')]
+        ], self.basic_table_style))
+        content.append(Spacer(1, 20))
+
+        # ===== 시선추적 분석 결과 =====
+        content.append(Paragraph("👁️ 시선추적 분석 결과", self.header_style))
+        content.append(self._table([
+            ['집중 시간', eye_tracking_result.get('focus_time', '측정되지 않음')],
+            ['시선 상태', eye_tracking_result.get('issues', '정상')],
+            ['집중도', eye_tracking_result.get('concentration', '측정되지 않음')],
+            ['추적 상태', '완료']
+        ], self.eye_table_style))
+        content.append(Spacer(1, 20))
+
+        # 음성 분석 결과
+        content.append(Paragraph("🎤 음성 분석 결과", self.header_style))
+
+        transcription = audio_result.get('transcription', '음성 녹음이 없습니다')
+        content.append(self._table([
+            ['인식된 내용', transcription[:60] + '...' if len(transcription) > 60 else transcription],
+            ['말하기 유창성', audio_result.get('fluency', '측정되지 않음')],
+            ['발음 명확도', audio_result.get('pronunciation_clarity', '측정되지 않음')],
+            ['전체 분석 상태', '완료']
+        ], self.speech_table_style))
+        content.append(Spacer(1, 20))
+
+        # 종합 평가
+        content.append(Paragraph("📊 종합 평가", self.header_style))
+        content.append(Paragraph("이번 진단을 통해 아동의 읽기 능력과 음성 분석이 완료되었습니다.", self.normal_style))
+        content.append(Paragraph("지속적인 읽기 연습과 발음 교정을 통해 더욱 향상된 결과를 기대할 수 있습니다.", self.normal_style))
+        content.append(Spacer(1, 15))
+
+        # 추천사항
+        content.append(Paragraph("💡 맞춤형 추천사항", self.header_style))
+        for rec in RECOMMENDATIONS:
+            content.append(Paragraph(rec, self.normal_style))
+            content.append(Spacer(1, 4))
+
+        # 푸터
+        content.append(Spacer(1, 30))
+        footer = f"📅 생성일시: {now.strftime('%Y년 %m월 %d일 %H시 %M분')} | AI 읽기 진단 시스템"
+        content.append(Paragraph(footer, self.footer_style))
+        return content
+
+    def render(self, output, child_name, user_id, audio_result, eye_tracking_result):
+        """리포트를 output(파일 경로 또는 파일 객체)에 PDF로 기록"""
+        doc = SimpleDocTemplate(
+            output,
+            pagesize=A4,
+            topMargin=25*mm,
+            bottomMargin=20*mm,
+            leftMargin=20*mm,
+            rightMargin=20*mm
+        )
+        doc.build(self.build_content(child_name, user_id, audio_result, eye_tracking_result))
+
+    def render_bytes(self, child_name, user_id, audio_result, eye_tracking_result):
+        """메모리 버퍼에 렌더링 - 임시 파일 없이 PDF 바이트 반환"""
+        buffer = io.BytesIO()
+        self.render(buffer, child_name, user_id, audio_result, eye_tracking_result)
+        # getvalue()는 bytes로 한 번 복사한다 (리포트는 수십 KB라 무시할 만하고,
+        # 응답/DB 저장/base64 인코딩 모두 bytes를 받으므로 memoryview 대신 그대로 사용)
+        return buffer.getvalue()
+
+
+_renderer = None
+_renderer_created_at = 0.0
+_renderer_lock = threading.Lock()
+
+
+def get_report_renderer():
+    """프로세스 공용 렌더러 (최초 호출 시 폰트 등록)
+
+    한글 폰트 등록에 실패해 Helvetica로 만든 렌더러는 FONT_RETRY_SECONDS가 지나면
+    다음 호출 때 폰트 등록을 다시 시도한다 (일시적인 네트워크 오류로 프로세스 내내 글자가 깨지지 않도록).
+    """
+    global _renderer, _renderer_created_at
+    renderer = _renderer
+    if renderer is not None and (
+        renderer.font_name == FONT_NAME or time.time() - _renderer_created_at < FONT_RETRY_SECONDS
+    ):
+        return renderer
+    with _renderer_lock:
+        if _renderer is renderer:
+            _renderer = ReportRenderer()
+            _renderer_created_at = time.time()
+        return _renderer
@@ -0,0 +1,275 @@
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+INSERT_REPORT_SQL = """
+INSERT INTO pdf_reports (member_id, child_name, pdf_data, filename, created_at)
+VALUES (%s, %s, %s, %s, NOW())
+"""
+
+
+class MySQLReportBackend:
+    """MySQL(pymysql) 리포트 저장 백엔드"""
+
+    def __init__(self, config, connect_timeout=10):
+        self.config = config
+        self.connect_timeout = connect_timeout
+
+    def connect(self):
+        import pymysql
+        return pymysql.connect(
+            **self.config,
+            connect_timeout=self.connect_timeout,
+            read_timeout=10,
+            write_timeout=10,
+            autocommit=False
+        )
+
+    def ping(self, connection):
+        connection.ping(reconnect=False)
+
+    def insert(self, cursor, row):
+        cursor.execute(INSERT_REPORT_SQL, row)
+        return cursor.lastrowid
+
+    def describe(self):
+        return f"mysql://{self.config.get('host')}:{self.config.get('port')}/{self.config.get('database')}"
+
+
+class SQLiteReportBackend:
+    """SQLite 리포트 저장 백엔드 (테스트/로컬 개발용 MySQL 대체)"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS pdf_reports (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        member_id INTEGER,
+        child_name TEXT,
+        pdf_data BLOB,
+        filename TEXT,
+        created_at TEXT
+    )
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # ':memory:'는 연결마다 DB가 달라지므로 공유 캐시 메모리 DB 사용
+        if path == ':memory:':
+            self.path = f"file:reports_{uuid.uuid4().hex}?mode=memory&cache=shared"
+            self._keepalive = self.connect()
+        else:
+            self.connect().close()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, uri=self.path.startswith('file:'), check_same_thread=False)
+        connection.execute(self.SCHEMA)
+        connection.commit()
+        return connection
+
+    def ping(self, connection):
+        connection.execute('SELECT 1')
+
+    def insert(self, cursor, row):
+        cursor.execute(
+            "INSERT INTO pdf_reports (member_id, child_name, pdf_data, filename, created_at) "
+            "VALUES (?, ?, ?, ?, datetime('now'))",
+            row
+        )
+        return cursor.lastrowid
+
+    def describe(self):
+        return f"sqlite://{self.path}"
+
+
+def create_report_backend(url, mysql_config):
+    """REPORT_DB_URL로 백엔드 선택 - sqlite:///경로, 없으면 MySQL"""
+    if url and url.startswith('sqlite:///'):
+        return SQLiteReportBackend(url[len('sqlite:///'):] or ':memory:')
+    return MySQLReportBackend(mysql_config)
+
+
+class ConnectionPool:
+    """DB 연결 풀 - 오래 쉬었던 연결은 꺼낼 때 상태 확인"""
+
+    def __init__(self, backend, size=4, health_check_interval=30):
+        self.backend = backend
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def acquire(self):
+        while True:
+            try:
+                connection, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self.backend.connect()
+
+            if time.time() - last_used < self.health_check_interval:
+                return connection
+            try:
+                self.backend.ping(connection)
+                return connection
+            except Exception as e:
+                print(f"[WARN] 끊어진 DB 연결 폐기: {e}")
+                self.discard(connection)
+
+    def release(self, connection):
+        try:
+            self._idle.put_nowait((connection, time.time()))
+        except queue.Full:
+            self.discard(connection)
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self):
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self.discard(connection)
+
+
+class ReportWriteQueue:
+    """pdf_reports 백그라운드 저장 큐 - 배치 INSERT + 실패 시 재시도
+
+    submit()은 바로 대기 ID를 돌려주고, 실제 저장 결과(DB report id)는
+    status()로 조회한다. 저장 스레드는 연결 풀 크기(pool_size)만큼 띄운다.
+    배치 트랜잭션이 실패하면 한 건씩 다시 저장해 문제 있는 행만 실패로 남긴다.
+    """
+
+    def __init__(self, backend, pool_size=4, batch_size=16, batch_wait=0.05,
+                 max_retries=3, retry_delay=0.5, max_pending=256, status_capacity=1024):
+        self.backend = backend
+        self.pool_size = pool_size
+        self.pool = ConnectionPool(backend, size=pool_size)
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.status_capacity = status_capacity
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._statuses = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def _ensure_worker(self):
+        # gunicorn preload 이후 fork된 워커에서 스레드를 띄우도록 지연 시작
+        with self._lock:
+            self._workers = [worker for worker in self._workers if worker.is_alive()]
+            while len(self._workers) < self.pool_size:
+                worker = threading.Thread(
+                    target=self._run, name=f'report-writer-{len(self._workers)}', daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def _set_status(self, pending_id, **status):
+        with self._lock:
+            self._statuses[pending_id] = status
+            self._statuses.move_to_end(pending_id)
+            while len(self._statuses) > self.status_capacity:
+                self._statuses.popitem(last=False)
+
+    def submit(self, member_id, child_name, pdf_data, filename):
+        """저장 요청 등록 - 대기 ID 반환 (큐가 가득 차면 queue.Full)"""
+        self._ensure_worker()
+        pending_id = uuid.uuid4().hex
+        self._set_status(pending_id, status='pending', report_id=None, error=None)
+        try:
+            self._queue.put_nowait((pending_id, (member_id, child_name, pdf_data, filename)))
+        except queue.Full:
+            self._set_status(pending_id, status='failed', report_id=None, error='저장 대기열이 가득 찼습니다')
+            raise
+        return pending_id
+
+    def status(self, pending_id):
+        with self._lock:
+            status = self._statuses.get(pending_id)
+            return dict(status) if status else None
+
+    def pending_count(self):
+        return self._queue.qsize()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.time() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch):
+        """한 트랜잭션으로 배치 저장 - 행마다 report id 반환"""
+        connection = self.pool.acquire()
+        try:
+            cursor = connection.cursor()
+            try:
+                report_ids = [self.backend.insert(cursor, row) for _, row in batch]
+            finally:
+                cursor.close()
+            connection.commit()
+        except Exception:
+            try:
+                connection.rollback()
+            except Exception:
+                pass
+            self.pool.discard(connection)
+            raise
+        self.pool.release(connection)
+        return report_ids
+
+    def _mark_saved(self, batch, report_ids):
+        for (pending_id, _), report_id in zip(batch, report_ids):
+            self._set_status(pending_id, status='saved', report_id=report_id, error=None)
+        print(f"[SUCCESS] 리포트 {len(batch)}건 DB 저장 완료: {report_ids}")
+
+    def _write_with_retry(self, batch):
+        """연결 오류 등 일시적 실패를 대비해 지수 백오프로 재시도"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._mark_saved(batch, self._write_batch(batch))
+                return
+            except Exception as e:
+                print(f"[ERROR] 리포트 DB 저장 실패 ({attempt + 1}/{self.max_retries + 1}): {e}")
+                if attempt == self.max_retries:
+                    for pending_id, _ in batch:
+                        self._set_status(pending_id, status='failed', report_id=None, error=f"DB저장실패: {e}")
+                else:
+                    time.sleep(self.retry_delay * (2 ** attempt))
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if len(batch) == 1:
+                self._write_with_retry(batch)
+            else:
+                try:
+                    self._mark_saved(batch, self._write_batch(batch))
+                except Exception as e:
+                    # 한 행(큰 PDF, 제약 조건 위반 등) 때문에 배치 전체가 실패하지 않도록 한 건씩 저장
+                    print(f"[WARN] 리포트 배치 저장 실패, {len(batch)}건을 한 건씩 다시 저장: {e}")
+                    for item in batch:
+                        self._write_with_retry([item])
+            for _ in batch:
+                self._queue.task_done()
+
+    def flush(self, timeout=None):
+        """대기 중인 저장이 끝날 때까지 대기 (테스트/종료 시)"""
+        deadline = None if timeout is None else time.time() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.time() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
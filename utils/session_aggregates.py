@@ -0,0 +1,160 @@
+import math
+
+from utils.gaze_metrics import MAX_SAMPLE_GAP_SECONDS, NOMINAL_SAMPLE_SECONDS
+from utils.tracking_buffer import DIRECTIONS
+
+# 시선 위치 히트맵 (화면 1920x1080을 16x9 칸으로)
+SCREEN_WIDTH = 1920
+SCREEN_HEIGHT = 1080
+HEATMAP_COLS = 16
+HEATMAP_ROWS = 9
+
+
+class SessionAggregates:
+    """세션 리포트 지표의 누적 집계 - 샘플마다 O(1) 갱신
+
+    compute_gaze_metrics()와 같은 지표를 샘플을 보관하지 않고 유지한다.
+    샘플 시간은 다음 샘플이 올 때 실제 간격(최대 max_gap)으로 확정하고,
+    마지막 샘플은 지금까지 간격의 중앙값으로 계산한다 (간격을 밀리초 단위 개수로 세어 둠).
+    """
+
+    def __init__(self, max_gap=MAX_SAMPLE_GAP_SECONDS):
+        self.max_gap = max_gap
+        self.reset()
+
+    def reset(self):
+        self.samples = 0
+        self.counts = [0] * len(DIRECTIONS)
+        self.dwell_time = [0.0] * len(DIRECTIONS)
+        self.gap_total = 0.0
+        self.gap_counts = {}  # 밀리초 간격 -> 개수 (마지막 샘플 시간의 중앙값용)
+        self.direction_changes = 0
+        # 연속 같은 방향 구간(응시)
+        self.fixation_counts = [0] * len(DIRECTIONS)
+        self.fixation_totals = [0.0] * len(DIRECTIONS)
+        self.longest_fixation = 0.0
+        self.run_time = 0.0
+        # 신뢰도 평균/분산 (Welford)
+        self.confidence_mean = 0.0
+        self.confidence_m2 = 0.0
+        self.heatmap = [[0] * HEATMAP_COLS for _ in range(HEATMAP_ROWS)]
+        self.last_direction = None
+        self.last_timestamp = None
+
+    def _close_run(self, run_time):
+        code = self.last_direction
+        self.fixation_counts[code] += 1
+        self.fixation_totals[code] += run_time
+        self.longest_fixation = max(self.longest_fixation, run_time)
+
+    def add(self, timestamp, direction, confidence, x, y):
+        """샘플 하나 반영 - timestamp는 epoch 초"""
+        code = DIRECTIONS.index(direction) if direction in DIRECTIONS else None
+
+        # 직전 샘플의 시간 확정
+        if self.last_timestamp is not None:
+            gap = min(max(timestamp - self.last_timestamp, 0.0), self.max_gap)
+            self.gap_total += gap
+            gap_ms = int(round(gap * 1000))
+            self.gap_counts[gap_ms] = self.gap_counts.get(gap_ms, 0) + 1
+            if self.last_direction is not None:
+                self.dwell_time[self.last_direction] += gap
+                self.run_time += gap
+        if code != self.last_direction:
+            if self.last_direction is not None and self.samples:
+                self._close_run(self.run_time)
+            if self.samples:
+                self.direction_changes += 1
+            self.run_time = 0.0
+
+        self.samples += 1
+        if code is not None:
+            self.counts[code] += 1
+        self.last_direction = code
+        self.last_timestamp = timestamp
+
+        delta = confidence - self.confidence_mean
+        self.confidence_mean += delta / self.samples
+        self.confidence_m2 += delta * (confidence - self.confidence_mean)
+
+        col = min(HEATMAP_COLS - 1, max(0, int(x / SCREEN_WIDTH * HEATMAP_COLS)))
+        row = min(HEATMAP_ROWS - 1, max(0, int(y / SCREEN_HEIGHT * HEATMAP_ROWS)))
+        self.heatmap[row][col] += 1
+
+    def _last_sample_time(self):
+        if self.samples == 0:
+            return 0.0
+        if self.samples == 1:
+            return NOMINAL_SAMPLE_SECONDS
+        count = self.samples - 1
+        if not self.gap_counts:
+            # 간격 개수를 세지 않던 이전 형식에서 복원된 집계
+            return self.gap_total / count
+        # 간격 개수의 가운데 값 (짝수면 가운데 두 값의 평균, np.median과 같음)
+        lower_rank, upper_rank = (count - 1) // 2, count // 2
+        lower = upper = None
+        seen = 0
+        for gap_ms in sorted(self.gap_counts):
+            seen += self.gap_counts[gap_ms]
+            if lower is None and seen > lower_rank:
+                lower = gap_ms
+            if seen > upper_rank:
+                upper = gap_ms
+                break
+        return (lower + upper) / 2000
+
+    def snapshot(self, include_heatmap=False):
+        """현재까지의 지표 (compute_gaze_metrics와 같은 키) - 샘플 수와 무관하게 O(1)"""
+        last_time = self._last_sample_time()
+        dwell_time = list(self.dwell_time)
+        fixation_counts = list(self.fixation_counts)
+        fixation_totals = list(self.fixation_totals)
+        longest_fixation = self.longest_fixation
+        if self.last_direction is not None:
+            # 진행 중인 마지막 구간 포함
+            dwell_time[self.last_direction] += last_time
+            fixation_counts[self.last_direction] += 1
+            fixation_totals[self.last_direction] += self.run_time + last_time
+            longest_fixation = max(longest_fixation, self.run_time + last_time)
+
+        total_time = self.gap_total + last_time
+        center = DIRECTIONS.index('center')
+        stats = {
+            'samples': self.samples,
+            'total_time': total_time,
+            'counts': dict(zip(DIRECTIONS, self.counts)),
+            'dwell_time': dict(zip(DIRECTIONS, dwell_time)),
+            'direction_changes': self.direction_changes,
+            'mean_fixation': {
+                name: fixation_totals[i] / fixation_counts[i] if fixation_counts[i] else 0.0
+                for i, name in enumerate(DIRECTIONS)
+            },
+            'longest_fixation': longest_fixation,
+            'reading_speed': self.direction_changes / (total_time / 60) if total_time > 0 else 0.0,
+            'concentration': self.counts[center] / self.samples * 100 if self.samples else 0.0,
+            'confidence_mean': self.confidence_mean,
+            'confidence_std': math.sqrt(self.confidence_m2 / self.samples) if self.samples else 0.0
+        }
+        if include_heatmap:
+            stats['heatmap'] = {
+                'cols': HEATMAP_COLS,
+                'rows': HEATMAP_ROWS,
+                'screen': [SCREEN_WIDTH, SCREEN_HEIGHT],
+                'counts': [list(row) for row in self.heatmap]
+            }
+        return stats
+
+    def to_dict(self):
+        data = dict(self.__dict__)
+        data['heatmap'] = [list(row) for row in self.heatmap]
+        data['gap_counts'] = dict(self.gap_counts)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregates = cls()
+        if data:
+            aggregates.__dict__.update(data)
+            # JSON을 거치면 키가 문자열이 됨
+            aggregates.gap_counts = {int(gap_ms): n for gap_ms, n in data.get('gap_counts', {}).items()}
+        return aggregates
@@ -0,0 +1,369 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from utils.session_aggregates import SessionAggregates
+from utils.tracking_buffer import TrackingBuffer
+
+
+class SessionState:
+    """아동(세션)별 추적 상태"""
+
+    def __init__(self, session_id, tracking_capacity=36000):
+        self.session_id = session_id
+        self.tracking_capacity = tracking_capacity
+        self.gaze_tracker = None
+        self.prefilter = None  # 프레임 사전 필터 상태 (직렬화하지 않음)
+        self.calibration_data = []
+        self.tracking_results = TrackingBuffer(tracking_capacity)
+        self.aggregates = SessionAggregates()  # 리포트 지표 누적 집계
+        self.initialized = False
+        self.calibrated = False
+        self.lock = threading.RLock()
+        self.last_access = time.time()
+        # 공유 백엔드 동기화 상태
+        self.revision = None            # 마지막으로 쓰거나 읽은 메타 리비전
+        self.samples_epoch = uuid.uuid4().hex  # 추적 시작마다 바뀌는 샘플 목록 ID
+        self.synced_samples = 0         # 백엔드 샘플 목록 중 로컬에 반영한 개수
+        self.pending_samples = []       # 아직 백엔드에 보내지 않은 샘플
+        self.last_flush = time.time()
+
+    def to_dict(self):
+        """공유 백엔드 저장용 메타 직렬화 - 샘플은 별도 목록에 추가 기록 (트래커 객체는 제외)"""
+        return {
+            'calibration_data': self.calibration_data,
+            'initialized': self.initialized,
+            'calibrated': self.calibrated,
+            'revision': self.revision,
+            'samples_epoch': self.samples_epoch
+        }
+
+    @classmethod
+    def from_dict(cls, session_id, data, tracking_capacity=36000):
+        state = cls(session_id, tracking_capacity)
+        state.calibration_data = data.get('calibration_data', [])
+        state.initialized = data.get('initialized', False)
+        state.calibrated = data.get('calibrated', False)
+        state.revision = data.get('revision')
+        state.samples_epoch = data.get('samples_epoch') or state.samples_epoch
+        if 'tracking_results' in data:
+            # 샘플까지 한 번에 저장하던 이전 형식
+            state.tracking_results = TrackingBuffer.from_dict(data['tracking_results'], tracking_capacity)
+            state.aggregates = SessionAggregates.from_dict(data.get('aggregates'))
+        return state
+
+    def add_sample(self, timestamp, direction, confidence, x, y):
+        self.tracking_results.append(timestamp, direction, confidence, x, y)
+        self.aggregates.add(timestamp, direction, confidence, x, y)
+
+    def clear_samples(self):
+        self.tracking_results.clear()  # 버퍼는 재사용
+        self.aggregates.reset()
+        self.pending_samples = []
+        self.synced_samples = 0
+
+
+class LocalSharedBackend:
+    """공유 백엔드 로컬 대체 구현 (테스트/단일 프로세스용)"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def append(self, key, values, ttl):
+        """목록 끝에 추가하고 만료 시간 갱신"""
+        with self._lock:
+            item = self._data.get(key)
+            items = item[0] if item is not None and item[1] >= time.time() else []
+            items.extend(values)
+            self._data[key] = (items, time.time() + ttl)
+
+    def range(self, key, start=0):
+        """목록의 start번째부터 끝까지"""
+        value = self.get(key)
+        return list(value[start:]) if value is not None else []
+
+    def touch(self, key, ttl):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                self._data[key] = (item[0], time.time() + ttl)
+
+
+class RedisSharedBackend:
+    """Redis 공유 백엔드 (여러 워커 간 세션 공유)"""
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        value = self.client.get(key)
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.set(key, value, ex=int(ttl))
+
+    def delete(self, key):
+        self.client.delete(key)
+
+    def append(self, key, values, ttl):
+        pipe = self.client.pipeline()
+        pipe.rpush(key, *values)
+        pipe.expire(key, int(ttl))
+        pipe.execute()
+
+    def range(self, key, start=0):
+        return [value.decode('utf-8') for value in self.client.lrange(key, start, -1)]
+
+    def touch(self, key, ttl):
+        self.client.expire(key, int(ttl))
+
+
+def create_shared_backend(url):
+    """URL로 공유 백엔드 생성 (없으면 None)"""
+    if not url:
+        return None
+    if url in ('local', 'memory://'):
+        return LocalSharedBackend()
+    try:
+        backend = RedisSharedBackend(url)
+        print(f"[INFO] 공유 세션 백엔드 연결: {url}")
+        return backend
+    except Exception as e:
+        print(f"[WARN] 공유 세션 백엔드 사용 불가, 로컬 저장소만 사용: {e}")
+        return None
+
+
+class SessionStore:
+    """세션 ID 기반 상태 저장소 - LRU + TTL 만료
+
+    공유 백엔드에는 세션마다 세 키를 둔다.
+      - 메타(보정 데이터, 초기화/보정 여부): save()로 상태가 바뀔 때만 통째로 기록
+      - 리비전: 메타를 쓸 때마다 새 값. get()이 매번 읽어 다른 워커의 변경이면 메타를 다시 읽음
+      - 샘플 목록: 추적 시작(epoch)마다 새 목록. 샘플은 모아서 뒤에 추가만 하므로
+        여러 워커가 같은 세션의 프레임을 받아도 서로 덮어쓰지 않는다.
+    """
+
+    KEY_PREFIX = 'ai-talk:session:'
+
+    def __init__(self, max_sessions=256, ttl=1800, backend=None, tracking_capacity=36000,
+                 flush_batch=20, flush_interval=1.0):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.tracking_capacity = tracking_capacity
+        self.backend = backend
+        # 샘플은 flush_batch개가 모이거나 flush_interval초가 지나면 백엔드에 추가
+        self.flush_batch = flush_batch
+        self.flush_interval = flush_interval
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._writer_id = None
+        self._writer_pid = None
+
+    @staticmethod
+    def new_session_id():
+        return uuid.uuid4().hex
+
+    @property
+    def writer_id(self):
+        """샘플 기록 주체 ID - fork된 워커마다 달라야 하므로 프로세스 ID로 구분"""
+        pid = os.getpid()
+        if self._writer_pid != pid:
+            self._writer_id = f"{pid}-{uuid.uuid4().hex[:8]}"
+            self._writer_pid = pid
+        return self._writer_id
+
+    def _meta_key(self, session_id):
+        return self.KEY_PREFIX + session_id
+
+    def _revision_key(self, session_id):
+        return self.KEY_PREFIX + session_id + ':rev'
+
+    def _samples_key(self, session_id, epoch):
+        return self.KEY_PREFIX + session_id + ':samples:' + epoch
+
+    def create(self, session_id=None):
+        """새 세션 생성 (같은 ID가 있으면 초기화)"""
+        state = SessionState(session_id or self.new_session_id(), self.tracking_capacity)
+        with self._lock:
+            self._sessions[state.session_id] = state
+            self._sessions.move_to_end(state.session_id)
+            self._evict_locked(time.time())
+        self.save(state)
+        return state
+
+    def get(self, session_id):
+        """세션 조회 - 로컬 캐시 미스 시 공유 백엔드에서 복원, 있으면 다른 워커의 메타 변경 반영"""
+        if not session_id:
+            return None
+
+        now = time.time()
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is not None:
+                if now - state.last_access > self.ttl:
+                    del self._sessions[session_id]
+                    state = None
+                else:
+                    state.last_access = now
+                    self._sessions.move_to_end(session_id)
+
+        if self.backend is None:
+            return state
+        if state is not None:
+            self._refresh(state)
+            return state
+
+        raw = self.backend.get(self._meta_key(session_id))
+        if raw is None:
+            return None
+
+        state = SessionState.from_dict(session_id, json.loads(raw), self.tracking_capacity)
+        records = self.backend.range(self._samples_key(session_id, state.samples_epoch))
+        if records:
+            self._replay(state, records)
+        with self._lock:
+            # 다른 스레드가 먼저 복원했으면 그 객체를 사용
+            existing = self._sessions.get(session_id)
+            if existing is not None:
+                return existing
+            self._sessions[session_id] = state
+            self._evict_locked(now)
+        return state
+
+    def _refresh(self, state):
+        """리비전이 바뀌었으면(다른 워커가 저장) 메타를 다시 읽어 반영"""
+        revision = self.backend.get(self._revision_key(state.session_id))
+        if revision is None or revision == state.revision:
+            return
+        raw = self.backend.get(self._meta_key(state.session_id))
+        if raw is None:
+            return
+        data = json.loads(raw)
+        with state.lock:
+            calibration = (data.get('calibration_data', []), data.get('calibrated', False))
+            if calibration != (state.calibration_data, state.calibrated):
+                # 보정이 바뀌었으면 트래커를 다시 만들어 새 보정 데이터로 보정
+                state.gaze_tracker = None
+            state.calibration_data, state.calibrated = calibration
+            state.initialized = data.get('initialized', False)
+            state.revision = data.get('revision')
+            epoch = data.get('samples_epoch')
+            if epoch and epoch != state.samples_epoch:
+                # 다른 워커에서 추적을 새로 시작함
+                state.clear_samples()
+                state.samples_epoch = epoch
+                self._replay(state, self.backend.range(self._samples_key(state.session_id, epoch)))
+
+    def save(self, state):
+        """변경된 세션 메타를 공유 백엔드에 기록 (쌓인 샘플도 함께 추가)"""
+        state.last_access = time.time()
+        if self.backend is not None:
+            with state.lock:
+                state.revision = uuid.uuid4().hex
+                self.backend.set(
+                    self._meta_key(state.session_id),
+                    json.dumps(state.to_dict(), ensure_ascii=False),
+                    self.ttl
+                )
+                self.backend.set(self._revision_key(state.session_id), state.revision, self.ttl)
+                self.flush_samples(state)
+
+    def record_sample(self, state, timestamp, direction, confidence, x, y):
+        """시선 샘플 기록 (state.lock 안에서 호출) - 백엔드에는 모아서 추가"""
+        state.add_sample(timestamp, direction, confidence, x, y)
+        if self.backend is None:
+            return
+        state.pending_samples.append(json.dumps(
+            [timestamp, direction, float(confidence), float(x), float(y), self.writer_id]
+        ))
+        if (len(state.pending_samples) >= self.flush_batch
+                or time.time() - state.last_flush >= self.flush_interval):
+            self.flush_samples(state)
+
+    def flush_samples(self, state):
+        """쌓인 샘플을 백엔드 목록 끝에 추가하고 세션 키 만료 시간 갱신"""
+        state.last_flush = time.time()
+        if self.backend is None or not state.pending_samples:
+            return
+        self.backend.append(self._samples_key(state.session_id, state.samples_epoch),
+                            state.pending_samples, self.ttl)
+        state.pending_samples = []
+        self.backend.touch(self._meta_key(state.session_id), self.ttl)
+        self.backend.touch(self._revision_key(state.session_id), self.ttl)
+
+    def sync_samples(self, state):
+        """다른 워커가 추가한 샘플까지 로컬 버퍼/집계에 반영 (리포트/통계 조회 전, state.lock 안에서 호출)"""
+        if self.backend is None:
+            return
+        self.flush_samples(state)
+        records = self.backend.range(self._samples_key(state.session_id, state.samples_epoch),
+                                     state.synced_samples)
+        writer_id = self.writer_id
+        if any(json.loads(record)[5] != writer_id for record in records):
+            # 다른 워커 샘플이 섞였으면 전체 목록을 시간순으로 다시 집계
+            self._replay(state, self.backend.range(self._samples_key(state.session_id, state.samples_epoch)))
+        else:
+            state.synced_samples += len(records)
+
+    def reset_samples(self, state):
+        """추적을 새로 시작 - 새 샘플 목록으로 전환 (이어서 save()로 메타 기록)"""
+        old_key = self._samples_key(state.session_id, state.samples_epoch)
+        state.clear_samples()
+        state.samples_epoch = uuid.uuid4().hex
+        if self.backend is not None:
+            self.backend.delete(old_key)
+
+    @staticmethod
+    def _replay(state, records):
+        """백엔드 샘플 목록으로 로컬 버퍼/집계를 다시 구성"""
+        samples = sorted(json.loads(record)[:5] for record in records)
+        state.tracking_results.clear()
+        state.aggregates.reset()
+        for sample in samples:
+            state.add_sample(*sample)
+        state.synced_samples = len(records)
+
+    def delete(self, session_id):
+        with self._lock:
+            state = self._sessions.pop(session_id, None)
+        if self.backend is not None:
+            if state is not None:
+                self.backend.delete(self._samples_key(session_id, state.samples_epoch))
+            self.backend.delete(self._meta_key(session_id))
+            self.backend.delete(self._revision_key(session_id))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def _evict_locked(self, now):
+        """만료 세션 및 용량 초과 세션 제거 (호출 측에서 락 보유)"""
+        expired = [sid for sid, s in self._sessions.items() if now - s.last_access > self.ttl]
+        for sid in expired:
+            del self._sessions[sid]
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
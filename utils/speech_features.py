@@ -0,0 +1,198 @@
+import re
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.audio_decoding import SAMPLE_RATE
+
+# 음향 특징 프레임 (16kHz 기준 32ms 창, 16ms 간격)
+FRAME_SAMPLES = 512
+HOP_SAMPLES = 256
+# 아이 목소리까지 포함하는 기본 주파수 범위
+MIN_PITCH_HZ = 70
+MAX_PITCH_HZ = 500
+# 정규화 자기상관 최댓값이 이보다 커야 유성음(피치 있음)으로 봄
+MIN_PITCH_STRENGTH = 0.4
+
+# 단어 사이 간격이 이보다 길면 쉼, LONG 이상이면 긴 쉼(머뭇거림)
+PAUSE_SECONDS = 0.25
+LONG_PAUSE_SECONDS = 1.0
+# 머뭇거림 간투사
+FILLER_WORDS = frozenset(('음', '어', '아', '에', '으', '엄', '흠', '음음', '어어'))
+WORD_STRIP = re.compile(r"^[\W_]+|[\W_]+$")
+
+
+class EnergyVAD:
+    """프레임 RMS 기반 음성 구간 검출 - 잡음 바닥을 따라가는 적응형 임계값
+
+    임계값 = max(min_rms, 잡음 바닥 x ratio). 잡음 바닥은 청크마다 하위 20% 프레임 RMS로
+    갱신하는데, 내려갈 때는 바로 따라가고 올라갈 때는 천천히(smoothing) 올라가며
+    max_noise_floor를 넘지 않는다 (길게 이어 읽는 동안 음성을 잡음으로 배우지 않도록).
+    """
+
+    def __init__(self, frame_samples=320, min_rms=0.006, ratio=3.0, smoothing=0.05, max_noise_floor=0.02):
+        self.frame_samples = frame_samples
+        self.min_rms = min_rms
+        self.ratio = ratio
+        self.smoothing = smoothing
+        self.max_noise_floor = max_noise_floor
+        self.noise_floor = None
+
+    def frame_rms(self, samples):
+        """프레임별 RMS (끝에 남는 반 프레임은 제외)"""
+        count = len(samples) // self.frame_samples
+        if count == 0:
+            return np.zeros(0, dtype=np.float32)
+        frames = samples[:count * self.frame_samples].reshape(count, self.frame_samples)
+        return np.sqrt(np.einsum('ij,ij->i', frames, frames) / self.frame_samples)
+
+    def update(self, rms):
+        if len(rms) == 0:
+            return
+        floor = min(float(np.percentile(rms, 20)), self.max_noise_floor)
+        if self.noise_floor is None or floor < self.noise_floor:
+            self.noise_floor = floor
+        else:
+            self.noise_floor += self.smoothing * (floor - self.noise_floor)
+
+    @property
+    def threshold(self):
+        return max(self.min_rms, (self.noise_floor or 0.0) * self.ratio)
+
+    def voiced(self, rms):
+        return rms >= self.threshold
+
+
+class SignalFeatures:
+    """파형의 음량/피치 통계 - 프레임 행렬 한 번으로 RMS와 자기상관 피치를 함께 계산
+
+    add()는 여러 번 나눠 호출할 수 있고 (스트리밍 청크), 프레임 경계에 걸친 샘플은
+    다음 호출로 넘긴다. 통계는 합/제곱합만 누적하므로 녹음 길이와 무관하게 메모리 일정.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, frame_samples=FRAME_SAMPLES, hop_samples=HOP_SAMPLES):
+        self.sample_rate = sample_rate
+        self.frame_samples = frame_samples
+        self.hop_samples = hop_samples
+        self.window = np.hanning(frame_samples).astype(np.float32)
+        self.min_lag = int(sample_rate / MAX_PITCH_HZ)
+        self.max_lag = min(int(sample_rate / MIN_PITCH_HZ), frame_samples - 1)
+        self._carry = np.zeros(0, dtype=np.float32)
+        self.frames = 0
+        self.speech_frames = 0
+        self._rms = np.zeros(2)      # 음성 프레임 RMS 합, 제곱합
+        self._pitch = np.zeros(3)    # 피치 프레임 수, 합, 제곱합
+
+    def add(self, samples, vad=None):
+        """샘플 추가 - vad(EnergyVAD)가 있으면 그 임계값으로, 없으면 이 샘플로 배운 임계값으로 음성 프레임 판정"""
+        data = np.concatenate((self._carry, samples)) if len(self._carry) else np.asarray(samples, np.float32)
+        if len(data) < self.frame_samples:
+            self._carry = data
+            return self
+        frames = sliding_window_view(data, self.frame_samples)[::self.hop_samples]
+        self._carry = data[len(frames) * self.hop_samples:]
+
+        rms = np.sqrt(np.einsum('ij,ij->i', frames, frames) / self.frame_samples)
+        if vad is None:
+            vad = EnergyVAD()
+            vad.update(rms)
+        speech = vad.voiced(rms)
+        self.frames += len(frames)
+        self.speech_frames += int(np.count_nonzero(speech))
+        speech_rms = rms[speech]
+        self._rms += (speech_rms.sum(), np.square(speech_rms).sum())
+
+        if len(speech_rms):
+            pitch = self._frame_pitch(frames[speech])
+            pitch = pitch[pitch > 0]
+            self._pitch += (len(pitch), pitch.sum(), np.square(pitch).sum())
+        return self
+
+    def _frame_pitch(self, frames):
+        """프레임별 기본 주파수(Hz) - FFT 자기상관 최댓값 위치, 주기성이 약하면 0"""
+        windowed = frames * self.window
+        spectrum = np.fft.rfft(windowed, n=2 * self.frame_samples, axis=1)
+        autocorr = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, axis=1)
+        region = autocorr[:, self.min_lag:self.max_lag + 1]
+        best = np.argmax(region, axis=1)
+        strength = region[np.arange(len(region)), best] / np.maximum(autocorr[:, 0], 1e-12)
+        pitch = self.sample_rate / (best + self.min_lag)
+        return np.where(strength >= MIN_PITCH_STRENGTH, pitch, 0.0)
+
+    @staticmethod
+    def _mean_std(count, total, squares):
+        if count == 0:
+            return 0.0, 0.0
+        mean = total / count
+        return float(mean), float(np.sqrt(max(squares / count - mean * mean, 0.0)))
+
+    def summary(self):
+        """기존 speech_features 형식 (평균/변동 피치, 평균/변동 음량, 음성 비율)"""
+        avg_volume, volume_variation = self._mean_std(self.speech_frames, *self._rms)
+        avg_pitch, pitch_variation = self._mean_std(*self._pitch)
+        return {
+            'avg_pitch': round(avg_pitch, 1),
+            'pitch_variation': round(pitch_variation, 1),
+            'avg_volume': round(avg_volume, 4),
+            'volume_variation': round(volume_variation, 4),
+            'speech_ratio': round(self.speech_frames / self.frames, 3) if self.frames else 0.0
+        }
+
+
+def segment_words(segments):
+    """(단어, 시작, 끝) 목록 - Whisper 단어 타임스탬프가 없으면 구간 길이를 단어 수로 나눠 추정"""
+    words = []
+    for segment in segments:
+        if segment.get('words'):
+            words.extend((w['word'].strip(), w['start'], w['end']) for w in segment['words'])
+            continue
+        tokens = segment.get('text', '').split()
+        if not tokens:
+            continue
+        start, end = segment.get('start', 0.0), segment.get('end', 0.0)
+        step = (end - start) / len(tokens)
+        words.extend((token, start + i * step, start + (i + 1) * step) for i, token in enumerate(tokens))
+    return words
+
+
+def normalize_word(word):
+    return WORD_STRIP.sub('', word)
+
+
+def timing_features(segments):
+    """단어 타이밍에서 쉼 분포, 구간당 단어 수, 반복/머뭇거림 횟수"""
+    words = segment_words(segments)
+    tokens = [normalize_word(word) for word, _, _ in words]
+    fillers = sum(1 for token in tokens if token in FILLER_WORDS)
+    # 바로 앞 단어(또는 두 단어 묶음)를 다시 읽은 횟수
+    repetitions = sum(1 for i in range(1, len(tokens)) if tokens[i] and tokens[i] == tokens[i - 1])
+    repetitions += sum(
+        1 for i in range(3, len(tokens))
+        if tokens[i - 1] and tokens[i - 1:i + 1] == tokens[i - 3:i - 1] and tokens[i] != tokens[i - 1]
+    )
+
+    if words:
+        times = np.array([(start, end) for _, start, end in words], dtype=np.float64)
+        gaps = times[1:, 0] - times[:-1, 1]
+        pauses = gaps[gaps >= PAUSE_SECONDS]
+        span = float(times[-1, 1] - times[0, 0])
+    else:
+        pauses = np.zeros(0)
+        span = 0.0
+    long_pauses = int(np.count_nonzero(pauses >= LONG_PAUSE_SECONDS))
+    speaking_time = span - float(pauses.sum())
+    segment_counts = [len(segment_words([segment])) for segment in segments]
+
+    return {
+        'pause_count': int(len(pauses)),
+        'mean_pause': round(float(pauses.mean()), 2) if len(pauses) else 0.0,
+        'max_pause': round(float(pauses.max()), 2) if len(pauses) else 0.0,
+        'pause_p90': round(float(np.percentile(pauses, 90)), 2) if len(pauses) else 0.0,
+        'long_pauses': long_pauses,
+        'pause_ratio': round(float(pauses.sum()) / span, 3) if span > 0 else 0.0,
+        'words_per_segment': round(float(np.mean(segment_counts)), 1) if segment_counts else 0.0,
+        'articulation_rate': round(len(words) / (speaking_time / 60), 1) if speaking_time > 0 else 0.0,
+        'repetitions': repetitions,
+        'fillers': fillers,
+        'hesitations': fillers + long_pauses
+    }
@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+from collections import deque
+
+import numpy as np
+
+# 기본 독서 어휘 (가중치는 keyword_weight)
+DEFAULT_KEYWORDS = (
+    '독서', '책', '읽', '이야기', '내용', '생각', '느낌',
+    '재미', '흥미', '배우', '알', '좋', '재밌', '신기',
+    '등장인물', '주인공', '줄거리', '문장', '단어', '의미'
+)
+DEFAULT_CONNECTIVES = ('그래서', '왜냐하면', '하지만')
+
+HANGUL_FIRST = 0xAC00
+HANGUL_LAST = 0xD7A3
+SENTENCE_MARKS = np.array([ord(c) for c in '.!?'], dtype=np.uint32)
+# str.split()이 구분하는 공백 중 자주 나오는 것들
+WHITESPACE = np.array([ord(c) for c in ' \t\n\r\x0b\x0c\xa0　'], dtype=np.uint32)
+SPACE = ord(' ')
+
+
+class KeywordAutomaton:
+    """Aho–Corasick 키워드 자동자 - 어휘 수와 무관하게 텍스트를 한 번만 훑음
+
+    match_ids()는 텍스트에 (부분 문자열로) 나타난 키워드 ID 집합을 돌려준다.
+    공백 없는 키워드만 있으면 텍스트 전체 대신 중복을 뺀 단어들만 훑는다
+    (긴 낭독은 같은 단어가 반복되므로 훑을 글자 수가 크게 준다).
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        for keyword_id, keyword in enumerate(self.keywords):
+            if keyword:
+                self._add(keyword, keyword_id)
+        self._build_failure_links()
+        self._word_level = not any(char.isspace() for keyword in self.keywords for char in keyword)
+
+    def _add(self, keyword, keyword_id):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] = self._output[state] + (keyword_id,)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                # 루트 바로 아래 상태는 자기 자신이 아니라 루트로
+                self._fail[next_state] = target if target != next_state else 0
+                # 접미사 상태의 출력도 함께 (예: '재밌' 안의 '재')
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def match_ids(self, text):
+        if self._word_level:
+            # 단어 경계마다 루트로 돌아가도록 공백으로 이어 붙임
+            text = ' '.join(set(text.split()))
+        goto, fail, output = self._goto, self._fail, self._output
+        root = goto[0]
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0) if state else root.get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def matches(self, text):
+        return [self.keywords[i] for i in sorted(self.match_ids(text))]
+
+
+def text_stats(text):
+    """문자 분류를 한 번에 - 한글 음절 수, 공백 제외 문자 수, 단어 수, 문장부호 여부
+
+    기존 계산과 같은 정의: non_space는 ' '만 뺀 길이, words는 공백 구분 단어 수.
+    """
+    if not text:
+        return {'length': 0, 'hangul': 0, 'non_space': 0, 'words': 0, 'sentence_marks': 0}
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    hangul = np.count_nonzero((codes >= HANGUL_FIRST) & (codes <= HANGUL_LAST))
+    whitespace = np.isin(codes, WHITESPACE)
+    # 단어 시작 = 공백이 아닌데 앞 글자가 공백(또는 맨 앞)
+    word_starts = ~whitespace
+    word_starts[1:] &= whitespace[:-1]
+    return {
+        'length': len(codes),
+        'hangul': int(hangul),
+        'non_space': int(len(codes) - np.count_nonzero(codes == SPACE)),
+        'words': int(np.count_nonzero(word_starts)),
+        'sentence_marks': int(np.count_nonzero(np.isin(codes, SENTENCE_MARKS)))
+    }
+
+
+class SpeechScorer:
+    """인식 텍스트 채점 엔진 - 시작 시 한 번 만들어 모든 요청이 공유 (읽기 전용)
+
+    keywords: 독서 어휘 (list 또는 {단어: 가중치}), 나타난 어휘 가중치 합이 내용 보너스 (상한 max_content_bonus)
+    connectives: 연결어, 하나라도 있으면 connective_bonus
+    """
+
+    def __init__(self, keywords=DEFAULT_KEYWORDS, connectives=DEFAULT_CONNECTIVES, keyword_weight=3.0,
+                 max_content_bonus=20.0, connective_bonus=5.0):
+        if isinstance(keywords, dict):
+            weights = {word: float(weight) for word, weight in keywords.items()}
+        else:
+            weights = {word: float(keyword_weight) for word in keywords}
+        self.keyword_weights = weights
+        self.connectives = tuple(connectives)
+        self.max_content_bonus = max_content_bonus
+        self.connective_bonus = connective_bonus
+        self._keywords = KeywordAutomaton(weights.keys())
+        self._weights = np.array(list(weights.values()), dtype=np.float64)
+        self._connectives = KeywordAutomaton(self.connectives)
+
+    @classmethod
+    def from_file(cls, path):
+        """JSON 어휘 파일: {"keywords": [...] 또는 {...}, "connectives": [...], "keyword_weight": 3, ...}"""
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(
+            keywords=config.get('keywords', DEFAULT_KEYWORDS),
+            connectives=config.get('connectives', DEFAULT_CONNECTIVES),
+            keyword_weight=config.get('keyword_weight', 3.0),
+            max_content_bonus=config.get('max_content_bonus', 20.0),
+            connective_bonus=config.get('connective_bonus', 5.0)
+        )
+
+    def text_stats(self, text):
+        return text_stats(text)
+
+    def keyword_matches(self, text):
+        return self._keywords.matches(text)
+
+    def content_bonus(self, text):
+        ids = self._keywords.match_ids(text)
+        if not ids:
+            return 0.0
+        return min(self.max_content_bonus, float(self._weights[list(ids)].sum()))
+
+    def comprehension(self, text, stats, clarity, fluency):
+        """이해도 = (명확도 + 유창성)/2 + 어휘 보너스 + 문장 구조 보너스 (30~95)"""
+        base_score = (clarity + fluency) / 2
+        structure_bonus = 0
+        if stats['length'] > 20:
+            structure_bonus += 5
+        if stats['sentence_marks']:
+            structure_bonus += 5
+        if self._connectives.match_ids(text):
+            structure_bonus += self.connective_bonus  # 연결어 사용
+        comprehension = base_score + self.content_bonus(text) + structure_bonus
+        return max(30, min(95, comprehension))
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def get_speech_scorer():
+    """프로세스 공용 채점 엔진 - SPEECH_LEXICON_PATH가 있으면 그 어휘 사용"""
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                path = os.environ.get('SPEECH_LEXICON_PATH')
+                _scorer = SpeechScorer.from_file(path) if path else SpeechScorer()
+                if path:
+                    print(f"[INFO] 음성 채점 어휘 로드: {path} ({len(_scorer.keyword_weights)}개)")
+    return _scorer
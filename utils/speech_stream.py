@@ -0,0 +1,329 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.audio_decoding import SAMPLE_RATE
+from utils.job_queue import JobQueueFull
+from utils.metrics import metrics as default_metrics
+from utils.speech_features import EnergyVAD, SignalFeatures
+
+# 중복 제거 시 비교할 겹침 구간 최대 단어 수
+MAX_OVERLAP_WORDS = 12
+
+
+def merge_overlap(previous_words, text, max_words=MAX_OVERLAP_WORDS):
+    """겹침 구간에서 두 번 인식된 단어 제거 - 직전 끝 단어들과 새 텍스트 앞 단어들이 같으면 삭제"""
+    words = text.split()
+    limit = min(max_words, len(previous_words), len(words))
+    for size in range(limit, 0, -1):
+        if previous_words[-size:] == words[:size]:
+            return ' '.join(words[size:])
+    return text
+
+
+def _shift_segment(segment, seconds, covered=None):
+    """구간/단어 시각을 스트림 기준으로 이동 - covered 이전(겹침)에 끝나는 부분은 제외"""
+    shifted = dict(segment)
+    shifted['start'] = segment.get('start', 0.0) + seconds
+    shifted['end'] = segment.get('end', 0.0) + seconds
+    if segment.get('words'):
+        words = [dict(word, start=word['start'] + seconds, end=word['end'] + seconds) for word in segment['words']]
+        if covered is not None:
+            words = [word for word in words if (word['start'] + word['end']) / 2 >= covered]
+            if not words:
+                return None
+        shifted['words'] = words
+    elif covered is not None and shifted['end'] <= covered:
+        return None
+    return shifted
+
+
+def _find_silence_cut(voiced, start_frame, min_silence_frames):
+    """start_frame 이후 처음으로 min_silence_frames 이상 이어지는 무음 구간의 가운데 프레임"""
+    silent = ~voiced[start_frame:]
+    if len(silent) < min_silence_frames:
+        return None
+    # 길이 min_silence_frames 창의 무음 프레임 수 (누적합)
+    window = np.convolve(silent.astype(np.int32), np.ones(min_silence_frames, dtype=np.int32), 'valid')
+    hits = np.flatnonzero(window == min_silence_frames)
+    if len(hits) == 0:
+        return None
+    return start_frame + int(hits[0]) + min_silence_frames // 2
+
+
+class SpeechStream:
+    """녹음 중 올라오는 PCM 청크를 구간별로 나눠 순서대로 인식하는 스트림
+
+    - 무음(VAD)이 min_silence 이상 이어지는 곳에서 구간을 자르고,
+      max_segment까지 무음이 없으면 강제로 자르되 overlap만큼 다음 구간과 겹친다
+      (겹친 부분에서 두 번 나온 단어는 merge_overlap으로 제거)
+    - 음성 프레임이 거의 없는 구간은 인식하지 않는다 (Whisper가 무음에서 문장을 지어내는 것 방지)
+    - 인식은 스트림당 한 번에 하나씩 작업 큐에서 수행하고 직전 문장을 프롬프트로 넘긴다
+    """
+
+    def __init__(self, stream_id, analyzer, session_id=None, sample_rate=SAMPLE_RATE,
+                 min_segment_seconds=3.0, max_segment_seconds=20.0, overlap_seconds=1.0,
+                 min_silence_ms=400, min_voiced_ratio=0.1, metrics=None):
+        self.id = stream_id
+        self.session_id = session_id
+        self.analyzer = analyzer
+        self.sample_rate = sample_rate
+        self.min_segment_samples = int(min_segment_seconds * sample_rate)
+        self.max_segment_samples = int(max_segment_seconds * sample_rate)
+        self.overlap_samples = int(overlap_seconds * sample_rate)
+        self.min_voiced_ratio = min_voiced_ratio
+        self.vad = EnergyVAD()
+        self.signal = SignalFeatures(sample_rate)  # 음량/피치 통계 (청크마다 누적)
+        self.min_silence_frames = max(1, int(min_silence_ms / 1000 * sample_rate / self.vad.frame_samples))
+
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.finished = False
+        self.error = None
+
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._pending_offset = 0       # 스트림 시작 기준 _pending[0]의 샘플 위치
+        self._overlap_next = False     # 다음 구간 앞부분이 직전 구간과 겹침
+        self._segments = []            # 인식 대기 구간 (offset, 길이, samples 또는 무음이면 None, overlapped)
+        self._scheduled = False
+        self.received_samples = 0
+        self.voiced_frames = 0
+        self.total_frames = 0
+
+        # 인식 결과 누적
+        self.words = []
+        self.whisper_segments = []
+        self.transcribed_samples = 0
+        self.segment_count = 0
+
+        registry = metrics or default_metrics
+        self._segment_ms = registry.histogram('speech_stream.segment_ms')
+        self._segments_total = registry.counter('speech_stream.segments')
+        self._skipped_silent = registry.counter('speech_stream.silent_segments')
+        self._finish_ms = registry.histogram('speech_stream.finish_ms')
+
+    # ---- 수신 / 구간 나누기 ----
+
+    def append_pcm16(self, data):
+        """16비트 little-endian 모노 PCM 청크 추가 - 새로 인식할 구간이 생기면 True"""
+        samples = np.frombuffer(data, dtype='<i2').astype(np.float32) * (1.0 / 32768.0)
+        with self._lock:
+            if self.finished:
+                raise ValueError("이미 종료된 스트림입니다")
+            self.updated_at = time.time()
+            self.received_samples += len(samples)
+            self._pending = np.concatenate((self._pending, samples))
+            self.vad.update(self.vad.frame_rms(samples))
+            self.signal.add(samples, self.vad)
+            self._cut_segments(final=False)
+            return bool(self._segments)
+
+    def _cut_segments(self, final):
+        frame = self.vad.frame_samples
+        while True:
+            pending = self._pending
+            if len(pending) < self.min_segment_samples and not final:
+                return
+            voiced = self.vad.voiced(self.vad.frame_rms(pending))
+            cut_frame = _find_silence_cut(voiced, self.min_segment_samples // frame, self.min_silence_frames)
+            cut = cut_frame * frame if cut_frame is not None else None
+
+            if cut is not None and cut <= self.max_segment_samples:
+                self._queue_segment(pending[:cut], voiced[:cut_frame], overlap_after=False)
+                self._advance(cut)
+            elif len(pending) >= self.max_segment_samples:
+                # 무음 없이 너무 길어짐 - 강제로 자르고 끝부분을 다음 구간과 겹침
+                cut = self.max_segment_samples
+                self._queue_segment(pending[:cut], voiced[:cut // frame], overlap_after=True)
+                self._advance(cut - self.overlap_samples)
+            elif final:
+                if len(pending):
+                    self._queue_segment(pending, voiced, overlap_after=False)
+                    self._advance(len(pending))
+                return
+            else:
+                return
+
+    def _queue_segment(self, samples, voiced, overlap_after):
+        self.total_frames += len(voiced)
+        voiced_count = int(np.count_nonzero(voiced))
+        self.voiced_frames += voiced_count
+        overlapped = self._overlap_next
+        self._overlap_next = overlap_after
+        if len(voiced) == 0 or voiced_count / len(voiced) < self.min_voiced_ratio:
+            # 인식하지 않고 진행 위치만 순서대로 반영
+            self._skipped_silent.inc()
+            self._segments.append((self._pending_offset, len(samples), None, overlapped))
+            return
+        self._segments.append((self._pending_offset, len(samples), samples, overlapped))
+
+    def _advance(self, count):
+        self._pending = self._pending[count:]
+        self._pending_offset += count
+
+    # ---- 인식 ----
+
+    def schedule(self, job_queue):
+        """대기 구간 인식 작업 등록 (스트림당 하나만 실행) - 큐가 가득 차면 JobQueueFull"""
+        with self._lock:
+            if self._scheduled or not self._segments:
+                return False
+            self._scheduled = True
+        try:
+            job_queue.submit(self.drain)
+        except JobQueueFull:
+            with self._lock:
+                self._scheduled = False
+                self._idle.notify_all()
+            raise
+        return True
+
+    def drain(self):
+        """대기 구간을 순서대로 인식 (작업 큐 워커에서 실행)"""
+        while True:
+            with self._lock:
+                if not self._segments:
+                    self._scheduled = False
+                    self._idle.notify_all()
+                    return self.segment_count
+                offset, length, samples, overlapped = self._segments.pop(0)
+                prompt = ' '.join(self.words[-MAX_OVERLAP_WORDS:]) or None
+                if samples is None:
+                    self.transcribed_samples = max(self.transcribed_samples, offset + length)
+                    continue
+            try:
+                start = time.perf_counter()
+                result = self.analyzer.transcribe(samples, initial_prompt=prompt)
+                self._segment_ms.observe((time.perf_counter() - start) * 1000)
+                self._segments_total.inc()
+            except Exception as e:
+                print(f"[ERROR] 스트리밍 구간 인식 실패: {e}")
+                with self._lock:
+                    self.error = str(e)
+                    self.transcribed_samples = max(self.transcribed_samples, offset + length)
+                continue
+            self._add_result(offset, length, result, overlapped)
+
+    def _add_result(self, offset, length, result, overlapped):
+        text = result.get('text', '').strip()
+        start_seconds = offset / self.sample_rate
+        with self._lock:
+            # 겹침 구간(직전 구간 끝 이전)에서 나온 단어/구간은 타이밍에서도 제외
+            covered = self.transcribed_samples / self.sample_rate if overlapped else None
+            if overlapped:
+                text = merge_overlap(self.words, text)
+            self.words.extend(text.split())
+            for segment in result.get('segments', []):
+                shifted = _shift_segment(segment, start_seconds, covered)
+                if shifted is not None:
+                    self.whisper_segments.append(shifted)
+            self.transcribed_samples = max(self.transcribed_samples, offset + length)
+            self.segment_count += 1
+
+    def wait_idle(self, timeout=None):
+        """대기/진행 중인 인식이 모두 끝날 때까지 대기 - 시간 초과면 False"""
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._scheduled and not self._segments, timeout)
+
+    def finish(self, job_queue, timeout=60.0):
+        """녹음 종료 - 남은 오디오를 마지막 구간으로 인식하고 최종 결과 반환"""
+        start = time.perf_counter()
+        with self._lock:
+            if not self.finished:
+                self.finished = True
+                self._cut_segments(final=True)
+        try:
+            self.schedule(job_queue)
+        except JobQueueFull:
+            # 작업 큐가 가득 차면 요청 스레드에서 직접 마무리
+            self.drain()
+        if not self.wait_idle(timeout):
+            raise TimeoutError("음성 인식이 아직 끝나지 않았습니다")
+        result = self.result()
+        self._finish_ms.observe((time.perf_counter() - start) * 1000)
+        return result
+
+    # ---- 결과 ----
+
+    @property
+    def transcript(self):
+        return ' '.join(self.words)
+
+    def result(self):
+        """최종/중간 분석 결과 - /analyze_audio와 같은 형식"""
+        with self._lock:
+            text = self.transcript
+            segments = list(self.whisper_segments)
+            duration = self.received_samples / self.sample_rate
+            signal = self.signal.summary()
+        return self.analyzer.build_result(text, {'text': text, 'segments': segments}, duration, signal)
+
+    def snapshot(self):
+        """녹음 중 중간 상태 - 부분 인식 결과와 말하기 속도/유창성"""
+        with self._lock:
+            received = self.received_samples / self.sample_rate
+            transcribed = self.transcribed_samples / self.sample_rate
+            word_count = len(self.words)
+            state = {
+                'stream_id': self.id,
+                'finished': self.finished,
+                'transcript': self.transcript,
+                'word_count': word_count,
+                'segments': self.segment_count,
+                'pending_segments': len(self._segments) + (1 if self._scheduled else 0),
+                'received_seconds': round(received, 2),
+                'transcribed_seconds': round(transcribed, 2),
+                'lag_seconds': round(received - transcribed, 2),
+                'speech_ratio': round(self.voiced_frames / self.total_frames, 3) if self.total_frames else 0.0,
+                'speaking_rate': round(word_count / (transcribed / 60), 1) if transcribed > 0 else 0.0,
+                'error': self.error
+            }
+        partial = self.result() if word_count else None
+        state['fluency'] = partial['fluency'] if partial else None
+        return state
+
+
+class SpeechStreamStore:
+    """워커 프로세스 메모리의 진행 중 스트림 (TTL 만료, 최대 개수 제한)"""
+
+    def __init__(self, max_streams=64, ttl=600, metrics=None, **stream_options):
+        self.max_streams = max_streams
+        self.ttl = ttl
+        self.stream_options = stream_options
+        self._streams = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = metrics or default_metrics
+        self._metrics.gauge('speech_stream.active', lambda: len(self._streams))
+        self._started = self._metrics.counter('speech_stream.started')
+
+    def create(self, analyzer, session_id=None):
+        stream = SpeechStream(uuid.uuid4().hex, analyzer, session_id=session_id,
+                              metrics=self._metrics, **self.stream_options)
+        with self._lock:
+            self._expire_locked(time.time())
+            while len(self._streams) >= self.max_streams:
+                self._streams.popitem(last=False)
+            self._streams[stream.id] = stream
+        self._started.inc()
+        return stream
+
+    def get(self, stream_id, session_id=None):
+        with self._lock:
+            stream = self._streams.get(stream_id)
+            if stream is None or (stream.session_id and session_id and stream.session_id != session_id):
+                return None
+            return stream
+
+    def remove(self, stream_id):
+        with self._lock:
+            self._streams.pop(stream_id, None)
+
+    def _expire_locked(self, now):
+        expired = [sid for sid, stream in self._streams.items() if now - stream.updated_at > self.ttl]
+        for sid in expired:
+            del self._streams[sid]
@@ -0,0 +1,127 @@
+import base64
+from datetime import datetime
+
+import numpy as np
+
+# 방향 문자열 <-> uint8 코드
+DIRECTIONS = ('center', 'left', 'right')
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+UNKNOWN_DIRECTION = 255
+
+# 열 이름과 dtype (샘플당 21바이트)
+COLUMNS = (
+    ('timestamps', np.int64),     # epoch 밀리초
+    ('directions', np.uint8),
+    ('confidence', np.float32),
+    ('x', np.float32),
+    ('y', np.float32),
+)
+
+
+class TrackingBuffer:
+    """세션별 시선 추적 샘플 링 버퍼 - 열마다 미리 할당한 NumPy 배열
+
+    샘플마다 dict를 만들지 않고 배열 칸에 바로 기록한다 (O(1) append).
+    배열은 initial_size에서 시작해 capacity까지 두 배씩 늘어나고,
+    가득 차면 가장 오래된 샘플을 덮어쓰며 overwritten 수를 센다.
+    """
+
+    def __init__(self, capacity=36000, initial_size=1024):
+        self.capacity = capacity
+        self._allocate(min(initial_size, capacity))
+        self._start = 0
+        self._size = 0
+        self.overwritten = 0
+
+    def _allocate(self, size):
+        self._columns = {name: np.zeros(size, dtype=dtype) for name, dtype in COLUMNS}
+
+    def _grow(self):
+        """아직 감기지 않은 상태에서 배열을 두 배로 확장 (capacity 이하)"""
+        size = min(self.capacity, 2 * len(self._columns['timestamps']))
+        for name, column in self._columns.items():
+            grown = np.zeros(size, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def __len__(self):
+        return self._size
+
+    def append(self, timestamp, direction, confidence, x, y):
+        """샘플 추가 - timestamp는 epoch 초(float)"""
+        allocated = len(self._columns['timestamps'])
+        if self._size == allocated and allocated < self.capacity:
+            self._grow()
+            allocated = len(self._columns['timestamps'])
+
+        if self._size < allocated:
+            index = (self._start + self._size) % allocated
+            self._size += 1
+        else:
+            # 가득 참 - 가장 오래된 샘플 자리에 기록
+            index = self._start
+            self._start = (self._start + 1) % allocated
+            self.overwritten += 1
+
+        columns = self._columns
+        columns['timestamps'][index] = int(timestamp * 1000)
+        columns['directions'][index] = DIRECTION_CODES.get(direction, UNKNOWN_DIRECTION)
+        columns['confidence'][index] = confidence
+        columns['x'][index] = x
+        columns['y'][index] = y
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+        self.overwritten = 0
+
+    def column(self, name):
+        """시간순 열 배열 - 감기지 않았으면 복사 없는 뷰"""
+        data = self._columns[name]
+        end = self._start + self._size
+        if end <= len(data):
+            return data[self._start:end]
+        return np.concatenate((data[self._start:], data[:end - len(data)]))
+
+    def columns(self):
+        return {name: self.column(name) for name, _ in COLUMNS}
+
+    def to_dict(self):
+        """공유 백엔드 저장용 압축 직렬화 - 열마다 원시 바이트를 base64로"""
+        return {
+            'capacity': self.capacity,
+            'overwritten': self.overwritten,
+            'size': self._size,
+            'columns': {
+                name: base64.b64encode(np.ascontiguousarray(self.column(name)).tobytes()).decode('ascii')
+                for name, _ in COLUMNS
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data, capacity=None):
+        """to_dict() 결과 또는 기존 dict 목록 형식에서 복원"""
+        if isinstance(data, list):
+            buffer = cls(capacity=capacity or 36000)
+            for record in data:
+                x, y = record.get('position', (0, 0))
+                timestamp = datetime.fromisoformat(record['timestamp']).timestamp()
+                buffer.append(timestamp, record.get('gaze_direction'), record.get('confidence', 0), x, y)
+            return buffer
+
+        size = data['size']
+        buffer = cls(capacity=capacity or data['capacity'], initial_size=max(1024, size))
+        if size:
+            restored = {
+                name: np.frombuffer(base64.b64decode(data['columns'][name]), dtype=dtype)
+                for name, dtype in COLUMNS
+            }
+            keep = min(size, buffer.capacity)
+            if len(buffer._columns['timestamps']) < keep:
+                buffer._allocate(keep)
+            for name, values in restored.items():
+                buffer._columns[name][:keep] = values[size - keep:]
+            buffer._size = keep
+            buffer.overwritten = size - keep
+        buffer.overwritten += data.get('overwritten', 0)
+        return buffer
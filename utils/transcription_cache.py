@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+from utils.metrics import metrics as default_metrics
+
+# 캐시에 남기지 않는 Whisper 세그먼트 필드 (토큰 ID 목록은 크고 분석에 쓰지 않음)
+DROPPED_SEGMENT_FIELDS = ('tokens',)
+
+
+def transcription_key(samples, model_name, options):
+    """디코딩된 PCM + 모델 + 인식 옵션의 sha256 - 같은 녹음을 다시 올리면 같은 키"""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode('utf-8'))
+    digest.update(json.dumps(options, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    digest.update(str(samples.dtype).encode('ascii'))
+    digest.update(memoryview(samples).cast('B'))
+    return digest.hexdigest()
+
+
+def compact_result(result):
+    """JSON으로 저장할 수 있는 인식 결과만 남김"""
+    return {
+        'text': result.get('text', ''),
+        'language': result.get('language'),
+        'segments': [
+            {name: value for name, value in segment.items() if name not in DROPPED_SEGMENT_FIELDS}
+            for segment in result.get('segments', [])
+        ]
+    }
+
+
+class TranscriptionCache:
+    """음성 인식 결과 캐시 - 메모리 LRU + 선택적 디스크 계층
+
+    메모리에 없으면 디스크(directory/<키 앞 2자>/<키>.json)를 보고, 찾으면 메모리로 올린다.
+    디스크 파일은 max_disk_entries를 넘으면 오래된 것부터 지운다.
+    """
+
+    def __init__(self, max_entries=128, directory=None, max_disk_entries=2000, metrics=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        registry = metrics or default_metrics
+        self._hits = registry.counter('transcription_cache.hits')
+        self._disk_hits = registry.counter('transcription_cache.disk_hits')
+        self._misses = registry.counter('transcription_cache.misses')
+        registry.gauge('transcription_cache.entries', lambda: len(self._entries))
+        registry.gauge('transcription_cache.hit_ratio', self.hit_ratio)
+
+    def hit_ratio(self):
+        hits = self._hits.value + self._disk_hits.value
+        total = hits + self._misses.value
+        return hits / total if total else 0.0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._hits.inc()
+                return value
+
+        value = self._read_disk(key)
+        if value is None:
+            self._misses.inc()
+            return None
+        self._disk_hits.inc()
+        self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self.directory:
+            self._write_disk(key, value)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"[WARN] 인식 캐시 읽기 실패: {e}")
+            return None
+
+    def _write_disk(self, key, value):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 다른 워커가 읽는 중에도 완전한 파일만 보이도록 임시 파일 후 교체
+            temp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"[WARN] 인식 캐시 저장 실패: {e}")
+            return
+
+        self._disk_writes += 1
+        if self._disk_writes % 50 == 0:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """디스크 항목이 max_disk_entries를 넘으면 오래된 파일부터 삭제"""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            files.extend(os.path.join(root, name) for name in names if name.endswith('.json'))
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=lambda path: os.path.getmtime(path))
+        for path in files[:len(files) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def create_transcription_cache():
+    """TRANSCRIPTION_CACHE_SIZE=0이면 캐시 사용 안 함, TRANSCRIPTION_CACHE_DIR이 있으면 디스크 계층 사용"""
+    max_entries = int(os.environ.get('TRANSCRIPTION_CACHE_SIZE', 128))
+    if max_entries <= 0:
+        return None
+    return TranscriptionCache(
+        max_entries=max_entries,
+        directory=os.environ.get('TRANSCRIPTION_CACHE_DIR') or None,
+        max_disk_entries=int(os.environ.get('TRANSCRIPTION_CACHE_MAX_FILES', 2000))
+    )
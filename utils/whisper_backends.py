@@ -0,0 +1,156 @@
+import threading
+
+# 백엔드 공통 transcribe() 결과 형식 (openai-whisper와 같은 dict):
+# {'text': str, 'language': str, 'segments': [{'start', 'end', 'text', 'avg_logprob', 'words': [...]}]}
+
+# 양자화하지 않음을 뜻하는 값 (환경 변수/벤치마크 지정용)
+NO_QUANTIZE = ('fp32', 'float32', 'none')
+
+
+def _plain_linear_layers(model, torch):
+    """whisper.model.Linear(nn.Linear 하위 클래스)를 같은 가중치의 nn.Linear로 교체
+
+    quantize_dynamic은 모듈 타입이 정확히 일치해야 양자화하므로 하위 클래스는 그대로 남는다.
+    (whisper의 Linear는 가중치를 입력 dtype으로 맞추는 것뿐이라 CPU fp32에서는 동작이 같음)
+    """
+    targets = [
+        (parent, name, child)
+        for parent in model.modules()
+        for name, child in parent.named_children()
+        if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear
+    ]
+    for parent, name, child in targets:
+        plain = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+        plain.weight = child.weight
+        plain.bias = child.bias
+        setattr(parent, name, plain)
+    return model
+
+
+class OpenAIWhisperBackend:
+    """openai-whisper (PyTorch) - quantize='int8'이면 Linear 층을 동적 int8 양자화
+
+    threads는 torch.set_num_threads로 설정하므로 같은 프로세스의 PyTorch 모델(시선 모델) 전체에 적용된다.
+    디코더가 호출마다 공유 모듈에 kv-cache 훅을 설치하므로 transcribe()는 lock으로 한 번에 하나씩만 실행한다.
+    """
+
+    kind = 'openai'
+
+    def __init__(self, model_size='base', quantize=None, threads=None, lock=None):
+        import torch
+        import whisper
+
+        self.lock = lock or threading.Lock()
+        self.model_size = model_size
+        self.quantize = None if quantize in NO_QUANTIZE else quantize
+        if threads:
+            torch.set_num_threads(threads)
+        self.threads = torch.get_num_threads()
+
+        model = whisper.load_model(model_size, device='cpu')
+        if self.quantize == 'int8':
+            model = torch.quantization.quantize_dynamic(
+                _plain_linear_layers(model, torch), {torch.nn.Linear}, dtype=torch.qint8
+            )
+            quantized = sum(1 for module in model.modules()
+                            if isinstance(module, torch.ao.nn.quantized.dynamic.Linear))
+            if quantized == 0:
+                print("[WARN] int8 양자화된 층이 없음 - fp32 모델로 실행")
+                self.quantize = None
+            else:
+                print(f"[INFO] Whisper Linear 층 {quantized}개 int8 동적 양자화")
+        elif self.quantize:
+            raise ValueError(f"openai 백엔드가 지원하지 않는 양자화: {quantize}")
+        self.model = model
+
+    @property
+    def name(self):
+        return f"{self.kind}:{self.model_size}:{self.quantize or 'fp32'}"
+
+    def transcribe(self, samples, verbose=None, **options):
+        # CPU에서는 fp16을 쓸 수 없음
+        options['fp16'] = False
+        with self.lock:
+            return self.model.transcribe(samples, verbose=verbose, **options)
+
+
+class FasterWhisperBackend:
+    """faster-whisper (CTranslate2) - CPU int8 추론, cpu_threads로 연산 스레드 수 지정
+
+    quantize를 지정하지 않으면 int8, 'fp32'면 float32 (그 밖의 값은 compute_type 그대로).
+    CTranslate2 모델은 동시 호출을 스스로 처리하므로 lock은 받기만 하고 쓰지 않는다.
+    """
+
+    kind = 'faster'
+    default_quantize = 'int8'
+
+    def __init__(self, model_size='base', quantize=None, threads=None, lock=None):
+        from faster_whisper import WhisperModel
+
+        self.model_size = model_size
+        if quantize in NO_QUANTIZE:
+            quantize = 'float32'
+        self.quantize = quantize or self.default_quantize
+        self.threads = threads or 0  # 0이면 CTranslate2 기본값
+        self.model = WhisperModel(model_size, device='cpu', compute_type=self.quantize, cpu_threads=self.threads)
+
+    @property
+    def name(self):
+        return f"{self.kind}:{self.model_size}:{self.quantize}"
+
+    def transcribe(self, samples, verbose=None, language=None, task='transcribe', initial_prompt=None,
+                   temperature=0.0, word_timestamps=False, **_):
+        segments, info = self.model.transcribe(
+            samples,
+            language=language,
+            task=task,
+            initial_prompt=initial_prompt,
+            temperature=temperature,
+            word_timestamps=word_timestamps
+        )
+        converted = []
+        for segment in segments:  # 제너레이터 - 여기서 실제 디코딩
+            item = {
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'avg_logprob': segment.avg_logprob,
+                'no_speech_prob': segment.no_speech_prob
+            }
+            if segment.words:
+                item['words'] = [
+                    {'word': w.word, 'start': w.start, 'end': w.end, 'probability': w.probability}
+                    for w in segment.words
+                ]
+            converted.append(item)
+        return {
+            'text': ''.join(segment['text'] for segment in converted),
+            'language': info.language,
+            'segments': converted
+        }
+
+
+BACKENDS = {
+    OpenAIWhisperBackend.kind: OpenAIWhisperBackend,
+    FasterWhisperBackend.kind: FasterWhisperBackend,
+}
+
+
+def create_whisper_backend(kind='openai', model_size='base', quantize=None, threads=None, lock=None):
+    """이름으로 음성 인식 백엔드 생성 (설치되지 않은 패키지면 ImportError)
+
+    lock: 공유 모델 호출을 직렬화할 락 (없으면 백엔드가 만듦)
+    """
+    if kind not in BACKENDS:
+        raise ValueError(f"알 수 없는 Whisper 백엔드: {kind} (가능: {', '.join(BACKENDS)})")
+    return BACKENDS[kind](model_size=model_size, quantize=quantize, threads=threads, lock=lock)
+
+
+def parse_backend_spec(spec):
+    """'faster:small:int8' 형식 -> (kind, model_size, quantize) - 양자화 생략 시 None(백엔드 기본값)"""
+    parts = spec.split(':')
+    kind = parts[0]
+    model_size = parts[1] if len(parts) > 1 else 'base'
+    quantize = parts[2] if len(parts) > 2 and parts[2] else None
+    return kind, model_size, quantize
+